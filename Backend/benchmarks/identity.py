@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from cryptography.hazmat.primitives.asymmetric import rsa
+from httpx import AsyncClient, MockTransport, Request, Response
+from jwt import encode
+from jwt.algorithms import RSAAlgorithm
+from services.settings import Settings
+from time import time
+from typing import Dict, Iterator
+from unittest.mock import patch
+import json
+
+
+class LocalIdentityProvider:
+    __jwks: Dict
+    __key: rsa.RSAPrivateKey
+    __kid: str
+
+    def __init__(self, kid: str = "benchmark"):
+        self.__key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.__kid = kid
+
+        jwk = json.loads(RSAAlgorithm.to_jwk(self.__key.public_key()))
+        jwk.update(kid=kid, use="sig", alg="RS256")
+        self.__jwks = {"keys": [jwk]}
+
+    def issue_token(self, settings: Settings, subject: str, lifetime: int = 3600):
+        now = int(time())
+        claims = {
+            "aud": settings.jwt_audience,
+            "exp": now + lifetime,
+            "iat": now,
+            "iss": settings.jwt_issuer,
+            "sub": subject,
+        }
+        return encode(
+            claims, self.__key, algorithm="RS256", headers={"kid": self.__kid}
+        )
+
+    def __handle(self, request: Request) -> Response:
+        return Response(200, json=self.__jwks)
+
+    @contextmanager
+    def serve(self) -> Iterator[None]:
+        # The token verifier builds its own HTTP client, so the JWKS endpoint
+        # is answered in-process by swapping in a client on a mock transport
+
+        transport = MockTransport(self.__handle)
+        with patch(
+            "services.security.AsyncClient",
+            lambda **kwargs: AsyncClient(transport=transport, **kwargs),
+        ):
+            yield
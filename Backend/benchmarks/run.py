@@ -0,0 +1,222 @@
+from asyncio import run
+from click import command, echo, option, Path as PathType
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from httpx import ASGITransport, AsyncClient
+from pathlib import Path
+from platform import python_version
+from subprocess import CalledProcessError, run as run_process
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional
+from unittest.mock import patch
+from uuid import uuid4
+import json
+import os
+
+from benchmarks.identity import LocalIdentityProvider
+from benchmarks.stats import change, PERCENTILES, summarise
+from benchmarks.workload import Sample, Workload
+
+RESULTS_PATH = Path(__file__).parent / "results"
+
+# Settings the app needs to boot, used where the environment doesn't
+# already provide them
+
+DEFAULT_ENVIRONMENT = {
+    "JWT_ALGORITHM": "RS256",
+    "JWT_AUDIENCE": "https://alldaydj.benchmark/api",
+    "JWT_CLIENT_ID": "benchmark",
+    "JWT_DOMAIN": "identity.benchmark",
+    "JWT_ISSUER": "https://identity.benchmark/",
+}
+
+# Only databases with this prefix are dropped once a run finishes
+
+BENCHMARK_DATABASE = "alldaydj_benchmark"
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = run_process(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (CalledProcessError, FileNotFoundError):
+        return None
+    return result.stdout.strip()
+
+
+@contextmanager
+def mongodb_stand_in() -> Iterator[None]:
+    from mongomock_motor import AsyncMongoMockClient
+
+    with patch("services.database.AsyncIOMotorClient", AsyncMongoMockClient):
+        yield
+
+
+def summarise_samples(samples: List[Sample], elapsed: float) -> Dict:
+    by_operation: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_operation.setdefault(sample.operation, []).append(sample)
+
+    def summarise_group(group: List[Sample]) -> Dict:
+        return summarise(
+            [sample.latency for sample in group],
+            errors=sum(1 for sample in group if not sample.ok),
+            elapsed=elapsed,
+        )
+
+    return {
+        "overall": summarise_group(samples),
+        "operations": {
+            operation: summarise_group(group)
+            for operation, group in sorted(by_operation.items())
+        },
+    }
+
+
+async def benchmark(
+    concurrency: int, requests: int, warmup: int, seed_size: int, tokens: int
+) -> Dict:
+    # The app's modules read settings as they're imported, so they're only
+    # loaded once the environment has been filled in
+
+    from main import app
+    from services.settings import get_settings
+
+    settings = get_settings()
+    identity = LocalIdentityProvider()
+
+    with identity.serve():
+        async with app.router.lifespan_context(app):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://benchmark"
+            ) as client:
+                workload = Workload(
+                    client,
+                    [
+                        identity.issue_token(settings, f"benchmark-{index}")
+                        for index in range(tokens)
+                    ],
+                    run_id=uuid4().hex[:8],
+                )
+                await workload.seed(seed_size)
+                await workload.run(concurrency, warmup)
+
+                started = datetime.now(timezone.utc)
+                start = perf_counter()
+                samples = await workload.run(concurrency, requests)
+                elapsed = perf_counter() - start
+
+            database = app.state.database.get_collection("genre").database
+            if database.name.startswith(BENCHMARK_DATABASE):
+                await database.client.drop_database(database.name)
+
+    return {
+        "commit": git_commit(),
+        "started": started.isoformat(),
+        "python": python_version(),
+        "config": {
+            "concurrency": concurrency,
+            "requests": requests,
+            "warmup": warmup,
+            "seed_size": seed_size,
+            "tokens": tokens,
+            "reference_cache": settings.reference_cache_enabled,
+        },
+        "elapsed": elapsed,
+        **summarise_samples(samples, elapsed),
+    }
+
+
+def format_row(name: str, summary: Dict, baseline: Optional[Dict]) -> str:
+    columns = [f"{name:<12}", f"{summary['requests']:>7}", f"{summary['errors']:>6}"]
+
+    metrics = [(f"p{rank}", summary["latency_ms"][f"p{rank}"]) for rank in PERCENTILES]
+    metrics.append(("rps", summary["rps"]))
+
+    for metric, value in metrics:
+        column = f"{value:>9.2f}"
+        if baseline:
+            baseline_value = (
+                baseline["rps"] if metric == "rps" else baseline["latency_ms"][metric]
+            )
+            if (delta := change(value, baseline_value)) is not None:
+                column += f" ({delta:+6.1f}%)"
+        columns.append(column)
+
+    return "  ".join(columns)
+
+
+def report(result: Dict, baseline: Optional[Dict]):
+    if baseline and baseline["config"] != result["config"]:
+        echo(f"Baseline {baseline['commit']} was run with a different config")
+
+    header = ["operation   ", "   reqs", "  errs"]
+    header += [f"{f'p{rank} ms':>9}" for rank in PERCENTILES] + [f"{'rps':>9}"]
+    echo("  ".join(header))
+
+    for operation, summary in result["operations"].items():
+        echo(
+            format_row(
+                operation,
+                summary,
+                baseline["operations"].get(operation) if baseline else None,
+            )
+        )
+    echo(format_row("overall", result["overall"], baseline and baseline["overall"]))
+
+
+@command()
+@option("--concurrency", default=32, help="Concurrent clients")
+@option("--requests", default=5000, help="Measured requests across all clients")
+@option("--warmup", default=500, help="Unmeasured requests before measuring")
+@option("--seed-size", default=500, help="Documents seeded per resource")
+@option("--tokens", default=1, help="Distinct bearer tokens to rotate through")
+@option(
+    "--mongodb-url",
+    default=None,
+    help="Run against this MongoDB instead of the in-memory stand-in",
+)
+@option("--database", default=BENCHMARK_DATABASE, help="MongoDB database to use")
+@option("--output", type=PathType(path_type=Path), default=None)
+@option(
+    "--baseline",
+    type=PathType(exists=True, path_type=Path),
+    default=None,
+    help="Earlier result to compare against",
+)
+def main(
+    concurrency: int,
+    requests: int,
+    warmup: int,
+    seed_size: int,
+    tokens: int,
+    mongodb_url: Optional[str],
+    database: str,
+    output: Optional[Path],
+    baseline: Optional[Path],
+):
+    for name, value in DEFAULT_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+    os.environ["MONGODB_DATABASE"] = database
+    os.environ["MONGODB_URL"] = mongodb_url or "mongodb://localhost:27017"
+
+    with nullcontext() if mongodb_url else mongodb_stand_in():
+        result = run(benchmark(concurrency, requests, warmup, seed_size, tokens))
+    result["config"]["mongodb"] = "mongod" if mongodb_url else "mongomock"
+
+    report(result, json.loads(baseline.read_text()) if baseline else None)
+
+    if not output:
+        stamp = result["started"].replace(":", "").split(".")[0]
+        output = RESULTS_PATH / f"{stamp}-{result['commit'] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    echo(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+from math import ceil
+from typing import Dict, List, Optional
+
+PERCENTILES = [50, 95, 99]
+
+
+def percentile(sorted_latencies: List[float], rank: int) -> float:
+    if not sorted_latencies:
+        return 0.0
+
+    index = max(ceil(rank / 100 * len(sorted_latencies)) - 1, 0)
+    return sorted_latencies[index]
+
+
+def summarise(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    sorted_latencies = sorted(latencies)
+    requests = len(sorted_latencies)
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            **{
+                f"p{rank}": percentile(sorted_latencies, rank) * 1000
+                for rank in PERCENTILES
+            },
+            "mean": sum(sorted_latencies) / requests * 1000 if requests else 0.0,
+            "max": sorted_latencies[-1] * 1000 if requests else 0.0,
+        },
+    }
+
+
+def change(current: float, baseline: float) -> Optional[float]:
+    if not baseline:
+        return None
+
+    return (current - baseline) / baseline * 100
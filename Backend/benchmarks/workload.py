@@ -0,0 +1,172 @@
+from asyncio import gather
+from collections import defaultdict
+from httpx import AsyncClient, Response
+from random import Random
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List, NamedTuple
+
+# Each resource is listed with the field its documents are keyed on
+
+RESOURCES: Dict[str, str] = {
+    "genre": "genre",
+    "tag": "tag",
+    "type": "cart_type",
+}
+
+OPERATION_WEIGHTS: Dict[str, int] = {
+    "list": 30,
+    "list_cursor": 20,
+    "get": 25,
+    "create": 10,
+    "update": 10,
+    "delete": 5,
+}
+
+PAGE_SIZE = 50
+
+
+class Sample(NamedTuple):
+    operation: str
+    resource: str
+    latency: float
+    ok: bool
+
+
+class Workload:
+    __client: AsyncClient
+    __counter: int
+    __ids: Dict[str, List[str]]
+    __random: Random
+    __run_id: str
+    __tokens: List[str]
+
+    def __init__(
+        self, client: AsyncClient, tokens: List[str], run_id: str, seed: int = 0
+    ):
+        self.__client = client
+        self.__counter = 0
+        self.__ids = defaultdict(list)
+        self.__random = Random(seed)
+        self.__run_id = run_id
+        self.__tokens = tokens
+
+    def __headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.__random.choice(self.__tokens)}"}
+
+    def __next_value(self, resource: str) -> str:
+        self.__counter += 1
+        return f"{resource}-{self.__run_id}-{self.__counter}"
+
+    async def seed(self, size: int):
+        for resource, field in RESOURCES.items():
+            for start in range(0, size, 500):
+                operations = [
+                    {"op": "create", "data": {field: self.__next_value(resource)}}
+                    for _ in range(min(500, size - start))
+                ]
+                response = await self.__client.post(
+                    f"/api/{resource}/bulk",
+                    json={"operations": operations},
+                    headers=self.__headers(),
+                )
+                response.raise_for_status()
+                self.__ids[resource].extend(
+                    result["id"] for result in response.json()["results"]
+                )
+
+    async def run(self, concurrency: int, requests: int) -> List[Sample]:
+        samples: List[Sample] = []
+        remaining = [requests]
+
+        async def worker():
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                samples.append(await self.__step())
+
+        await gather(*[worker() for _ in range(concurrency)])
+        return samples
+
+    async def __step(self) -> Sample:
+        operation = self.__random.choices(
+            list(OPERATION_WEIGHTS), weights=list(OPERATION_WEIGHTS.values())
+        )[0]
+        resource = self.__random.choice(list(RESOURCES))
+
+        # Operations needing an existing document fall back to a create when
+        # the resource has been emptied by earlier deletes
+
+        ids = self.__ids[resource]
+        if operation in ("get", "update", "delete") and not ids:
+            operation = "create"
+
+        handlers: Dict[str, Callable[[str], Awaitable[bool]]] = {
+            "list": self.__list,
+            "list_cursor": self.__list_cursor,
+            "get": self.__get,
+            "create": self.__create,
+            "update": self.__update,
+            "delete": self.__delete,
+        }
+
+        start = perf_counter()
+        ok = await handlers[operation](resource)
+        return Sample(operation, resource, perf_counter() - start, ok)
+
+    async def __list(self, resource: str) -> bool:
+        pages = max(len(self.__ids[resource]) // PAGE_SIZE, 1)
+        response = await self.__client.get(
+            f"/api/{resource}/",
+            params={"page": self.__random.randint(1, pages), "size": PAGE_SIZE},
+            headers=self.__headers(),
+        )
+        return response.is_success
+
+    async def __list_cursor(self, resource: str) -> bool:
+        response = await self.__client.get(
+            f"/api/{resource}/cursor",
+            params={"size": PAGE_SIZE},
+            headers=self.__headers(),
+        )
+        return response.is_success
+
+    def __found(self, resource: str, id: str, response: Response) -> bool:
+        # Another worker may delete the document while this request is in
+        # flight, which is a 404 by design rather than an error
+
+        return response.is_success or (
+            response.status_code == 404 and id not in self.__ids[resource]
+        )
+
+    async def __get(self, resource: str) -> bool:
+        id = self.__random.choice(self.__ids[resource])
+        response = await self.__client.get(
+            f"/api/{resource}/{id}", headers=self.__headers()
+        )
+        return self.__found(resource, id, response)
+
+    async def __create(self, resource: str) -> bool:
+        response = await self.__client.post(
+            f"/api/{resource}/",
+            json={RESOURCES[resource]: self.__next_value(resource)},
+            headers=self.__headers(),
+        )
+        if response.is_success:
+            self.__ids[resource].append(response.json()["id"])
+        return response.is_success
+
+    async def __update(self, resource: str) -> bool:
+        id = self.__random.choice(self.__ids[resource])
+        response = await self.__client.put(
+            f"/api/{resource}/{id}",
+            json={RESOURCES[resource]: self.__next_value(resource)},
+            headers=self.__headers(),
+        )
+        return self.__found(resource, id, response)
+
+    async def __delete(self, resource: str) -> bool:
+        ids = self.__ids[resource]
+        id = ids.pop(self.__random.randrange(len(ids)))
+        response = await self.__client.delete(
+            f"/api/{resource}/{id}", headers=self.__headers()
+        )
+        return response.is_success
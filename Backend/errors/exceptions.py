@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status
+from typing import Dict, Optional
 
 
 class UnauthenticatedException(HTTPException):
@@ -12,3 +13,41 @@ class UnauthenticatedException(HTTPException):
 class UnauthorizedException(HTTPException):
     def __init__(self, detail: str):
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+class NotFoundException(HTTPException):
+    def __init__(self, entity: str, id: str):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"{entity} {id} not found"
+        )
+
+
+class NotModifiedException(HTTPException):
+    def __init__(self, etag: str):
+        super().__init__(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+
+class ConflictException(HTTPException):
+    def __init__(self, detail: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT, detail=detail, headers=headers
+        )
+
+
+class PayloadTooLargeException(HTTPException):
+    def __init__(self, limit: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Payload exceeds {limit} bytes",
+        )
+
+
+class RangeNotSatisfiableException(HTTPException):
+    def __init__(self, size: int):
+        super().__init__(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
@@ -0,0 +1,24 @@
+from pathlib import Path
+from typing import Iterable, Set
+import os
+
+
+class Checkpoint:
+    __path: Path
+
+    def __init__(self, path: Path):
+        self.__path = path
+
+    def load(self) -> Set[str]:
+        if not self.__path.exists():
+            return set()
+        return {line for line in self.__path.read_text().splitlines() if line.strip()}
+
+    def record(self, sources: Iterable[str]):
+        # Appended and synced after every batch, so a crash loses at most the
+        # batch in flight, which the importer recognises and skips on resume
+
+        with open(self.__path, "a") as file:
+            file.writelines(f"{source}\n" for source in sources)
+            file.flush()
+            os.fsync(file.fileno())
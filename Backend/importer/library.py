@@ -0,0 +1,274 @@
+from asyncio import gather, Semaphore
+from bson import ObjectId
+from datetime import datetime, timezone
+from models.audio import AnalysisStatus
+from models.cart import CartUpdate
+from models.genre import GenreUpdate
+from models.tag import TagUpdate
+from models.type import CartTypeUpdate
+from pathlib import Path
+from pydantic import BaseModel, ValidationError
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from services.analysis import is_analysable, store_waveform, unsupported_analysis
+from services.bulk import DUPLICATE_KEY_ERROR
+from services.database import Database
+from services.storage import AudioStorage
+from services.versions import bump_version
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+CONTENT_TYPES = {".mp3": "audio/mpeg", ".wav": "audio/wav"}
+
+# Files are copied a few at a time so storage isn't flooded with writes
+
+COPY_CONCURRENCY = 4
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def content_type(path: Path) -> str:
+    return CONTENT_TYPES.get(path.suffix.lower(), "audio/wav")
+
+
+class BatchOutcome(NamedTuple):
+    imported: List[str]
+    skipped: List[str]
+    failed: List[Tuple[str, str]]
+
+
+class CartDefaults(NamedTuple):
+    cart_type: str
+    genre: str
+    tags: List[str]
+    valid_from: datetime
+    valid_to: datetime
+
+
+class LibraryImporter:
+    __copy: Semaphore
+    __database: Database
+    __defaults: CartDefaults
+    __references: Dict[str, Dict[str, ObjectId]]
+    __storage: Optional[AudioStorage]
+
+    def __init__(
+        self,
+        database: Database,
+        defaults: CartDefaults,
+        storage: Optional[AudioStorage] = None,
+    ):
+        self.__copy = Semaphore(COPY_CONCURRENCY)
+        self.__database = database
+        self.__defaults = defaults
+        self.__references = {"genre": {}, "tag": {}, "type": {}}
+        self.__storage = storage
+
+    async def __reference_ids(
+        self,
+        collection_name: str,
+        field: str,
+        model: Type[BaseModel],
+        names: Iterable[str],
+    ) -> Dict[str, ObjectId]:
+        # Missing genres, tags and types are upserted on their unique field,
+        # so a server creating the same one concurrently isn't duplicated
+
+        known = self.__references[collection_name]
+        missing = {name for name in names if name not in known}
+        if not missing:
+            return known
+
+        collection = self.__database.get_collection(collection_name)
+        writes = [
+            UpdateOne(
+                {field: name},
+                {"$setOnInsert": model(**{field: name}).model_dump()},
+                upsert=True,
+            )
+            for name in sorted(missing)
+        ]
+        try:
+            result = await collection.bulk_write(writes, ordered=False)
+            created = result.upserted_count
+        except BulkWriteError as error:
+            if any(
+                write_error.get("code") != DUPLICATE_KEY_ERROR
+                for write_error in error.details.get("writeErrors", [])
+            ):
+                raise
+            created = error.details.get("nUpserted", 0)
+
+        cursor = collection.find({field: {"$in": list(missing)}}, {field: 1})
+        known.update({document[field]: document["_id"] async for document in cursor})
+
+        if created:
+            await bump_version(collection)
+        return known
+
+    async def __copy_audio(self, path: Path, analysis: Optional[Dict]) -> ObjectId:
+        object_id = ObjectId()
+        size = path.stat().st_size
+
+        async with self.__copy:
+            writer = await self.__storage.writer(str(object_id), 0)
+            file = await run_in_threadpool(open, path, "rb")
+            try:
+                while chunk := await run_in_threadpool(file.read, COPY_CHUNK_SIZE):
+                    await writer.write(chunk)
+            finally:
+                await run_in_threadpool(file.close)
+                await writer.close()
+
+        await self.__database.get_collection("audio").insert_one(
+            {
+                "_id": object_id,
+                "filename": path.name,
+                "content_type": content_type(path),
+                "size": size,
+                "offset": size,
+                "complete": True,
+                "created": datetime.now(timezone.utc),
+                "analysis": analysis,
+            }
+        )
+        return object_id
+
+    @staticmethod
+    def __analysis(entry: Dict) -> Optional[Dict]:
+        if "analysis" in entry:
+            return {"status": AnalysisStatus.Complete, **entry["analysis"].summary}
+        if "analysis_error" in entry:
+            return {"status": AnalysisStatus.Failed, "error": entry["analysis_error"]}
+
+        path = Path(entry["path"])
+        if not is_analysable(content_type(path), path.name):
+            return unsupported_analysis(content_type(path))
+        return None
+
+    async def __prepare(self, entry: Dict, ids: Dict[str, Dict]) -> Dict:
+        defaults = self.__defaults
+        cart = CartUpdate(
+            label=entry["label"],
+            artist=entry["artist"],
+            title=entry["title"],
+            album=entry["album"],
+            year=entry["year"],
+            sweeper=False,
+            override_fade=False,
+            valid_from=defaults.valid_from,
+            valid_to=defaults.valid_to,
+            isrc=entry["isrc"],
+            record_label=entry["record_label"],
+            type=ids["type"][defaults.cart_type],
+            genre=ids["genre"][entry["genre"] or defaults.genre],
+            tags=[
+                ids["tag"][tag]
+                for tag in dict.fromkeys([*entry["tags"], *defaults.tags])
+            ],
+        )
+
+        analysis = self.__analysis(entry)
+        if self.__storage:
+            cart.audio = await self.__copy_audio(Path(entry["path"]), analysis)
+            if "analysis" in entry:
+                await store_waveform(
+                    self.__database.get_collection("waveform"),
+                    cart.audio,
+                    entry["analysis"].summary,
+                    entry["analysis"].waveform,
+                )
+
+        return {
+            **cart.model_dump(by_alias=True),
+            "analysis": analysis if self.__storage else None,
+            "import_source": entry["path"],
+        }
+
+    async def __remove_unwritten_audio(self, documents: List[Dict]):
+        carts = self.__database.get_collection("cart")
+        copied = [document["audio"] for document in documents if document["audio"]]
+        cursor = carts.find({"audio": {"$in": copied}}, {"audio": 1})
+        written = {document["audio"] async for document in cursor}
+        unwritten = [object_id for object_id in copied if object_id not in written]
+        if not unwritten:
+            return
+
+        await gather(
+            *[self.__storage.delete(str(object_id)) for object_id in unwritten]
+        )
+        await self.__database.get_collection("waveform").delete_many(
+            {"audio": {"$in": unwritten}}
+        )
+        await self.__database.get_collection("audio").delete_many(
+            {"_id": {"$in": unwritten}}
+        )
+
+    async def import_batch(self, entries: List[Dict]) -> BatchOutcome:
+        failed = [
+            (entry["path"], entry["error"]) for entry in entries if "error" in entry
+        ]
+        entries = [entry for entry in entries if "error" not in entry]
+
+        # Sources already in the collection were written by a run that died
+        # before it could checkpoint them
+
+        carts = self.__database.get_collection("cart")
+        cursor = carts.find(
+            {"import_source": {"$in": [entry["path"] for entry in entries]}},
+            {"import_source": 1},
+        )
+        existing = {document["import_source"] async for document in cursor}
+        entries = [entry for entry in entries if entry["path"] not in existing]
+
+        ids = {
+            "type": await self.__reference_ids(
+                "type", "cart_type", CartTypeUpdate, [self.__defaults.cart_type]
+            ),
+            "genre": await self.__reference_ids(
+                "genre",
+                "genre",
+                GenreUpdate,
+                {entry["genre"] or self.__defaults.genre for entry in entries},
+            ),
+            "tag": await self.__reference_ids(
+                "tag",
+                "tag",
+                TagUpdate,
+                {tag for entry in entries for tag in entry["tags"]}
+                | set(self.__defaults.tags),
+            ),
+        }
+
+        prepared = await gather(
+            *[self.__prepare(entry, ids) for entry in entries], return_exceptions=True
+        )
+
+        documents = []
+        for entry, document in zip(entries, prepared):
+            if isinstance(document, ValidationError):
+                failed.append((entry["path"], str(document)))
+            elif isinstance(document, Exception):
+                failed.append((entry["path"], repr(document)))
+            else:
+                documents.append(document)
+
+        # Audio is copied before its cart is written, so if the carts don't
+        # all make it in, the copies nothing refers to are removed before
+        # the error stops the run; a resumed run copies them again
+
+        if documents:
+            try:
+                await carts.bulk_write(
+                    [InsertOne(document) for document in documents], ordered=False
+                )
+            except Exception:
+                if self.__storage:
+                    await self.__remove_unwritten_audio(documents)
+                raise
+            await bump_version(carts)
+
+        return BatchOutcome(
+            imported=[document["import_source"] for document in documents],
+            skipped=sorted(existing),
+            failed=failed,
+        )
@@ -0,0 +1,76 @@
+from mutagen import File, MutagenError
+from pathlib import Path
+from services.loudness import analyse
+from typing import Dict, Iterator, List, Optional
+import re
+
+AUDIO_EXTENSIONS = {".mp3", ".wav"}
+
+
+def find_audio_files(root: Path) -> Iterator[Path]:
+    # Sorted so every run walks the library in the same order
+
+    for path in sorted(root.rglob("*")):
+        if path.suffix.lower() in AUDIO_EXTENSIONS and path.is_file():
+            yield path
+
+
+def _text(tags, frame: str) -> List[str]:
+    if not tags or frame not in tags:
+        return []
+    return [str(value).strip() for value in tags[frame].text if str(value).strip()]
+
+
+def _first(tags, frame: str) -> Optional[str]:
+    values = _text(tags, frame)
+    return values[0] if values else None
+
+
+def _year(tags) -> int:
+    match = re.match(r"\d{4}", _first(tags, "TDRC") or _first(tags, "TYER") or "")
+    return int(match.group()) if match else 0
+
+
+def extract(
+    path: str, analyse_audio: bool, silence_threshold: float, cue_threshold: float
+) -> Dict:
+    try:
+        audio = File(path)
+    except MutagenError as error:
+        return {"path": path, "error": str(error)}
+    if audio is None:
+        return {"path": path, "error": "Unrecognised audio format"}
+
+    # MP3s and WAVs both carry ID3 frames; files without a title fall back to
+    # the common "Artist - Title" file naming
+
+    tags = audio.tags
+    stem = Path(path).stem
+    artist, _, title = stem.partition(" - ") if " - " in stem else ("", "", stem)
+    genres = tags["TCON"].genres if tags and "TCON" in tags else []
+
+    metadata = {
+        "path": path,
+        "label": stem,
+        "artist": _first(tags, "TPE1") or artist,
+        "title": _first(tags, "TIT2") or title,
+        "album": _first(tags, "TALB") or "",
+        "isrc": _first(tags, "TSRC") or "",
+        "record_label": _first(tags, "TPUB") or "",
+        "year": _year(tags),
+        "genre": genres[0].strip() if genres and genres[0].strip() else None,
+        "tags": [
+            tag.strip()
+            for mood in _text(tags, "TMOO")
+            for tag in mood.split(";")
+            if tag.strip()
+        ],
+    }
+
+    if analyse_audio:
+        try:
+            metadata["analysis"] = analyse(path, silence_threshold, cue_threshold)
+        except Exception as error:
+            metadata["analysis_error"] = str(error)
+
+    return metadata
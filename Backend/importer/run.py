@@ -0,0 +1,190 @@
+from asyncio import gather, get_running_loop, run
+from click import argument, command, DateTime, echo, option, Path as PathType
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from importer.checkpoint import Checkpoint
+from importer.library import (
+    BatchOutcome,
+    CartDefaults,
+    content_type,
+    LibraryImporter,
+)
+from importer.metadata import extract, find_audio_files
+from multiprocessing import get_context
+from pathlib import Path
+from services.analysis import is_analysable
+from services.database import Database
+from services.settings import get_settings
+from services.storage import create_audio_storage
+from time import perf_counter
+from typing import List, Optional, Tuple
+import os
+
+
+class Progress:
+    __bytes: int
+    __failed: List[Tuple[str, str]]
+    __imported: int
+    __skipped: int
+    __start: float
+    __total: int
+
+    def __init__(self, total: int):
+        self.__bytes = 0
+        self.__failed = []
+        self.__imported = 0
+        self.__skipped = 0
+        self.__start = perf_counter()
+        self.__total = total
+
+    @property
+    def failed(self) -> List[Tuple[str, str]]:
+        return self.__failed
+
+    def update(self, outcome: BatchOutcome, size: int):
+        self.__bytes += size
+        self.__failed.extend(outcome.failed)
+        self.__imported += len(outcome.imported)
+        self.__skipped += len(outcome.skipped)
+
+    def report(self) -> str:
+        elapsed = perf_counter() - self.__start
+        processed = self.__imported + self.__skipped + len(self.__failed)
+        rate = processed / elapsed if elapsed else 0.0
+        remaining = (self.__total - processed) / rate if rate else 0.0
+        return (
+            f"{processed}/{self.__total} files"
+            f"  {rate:.1f} files/s"
+            f"  {self.__bytes / elapsed / 1024 / 1024 if elapsed else 0.0:.1f} MB/s"
+            f"  imported {self.__imported}"
+            f"  skipped {self.__skipped}"
+            f"  failed {len(self.__failed)}"
+            f"  elapsed {elapsed:.0f}s  eta {remaining:.0f}s"
+        )
+
+
+async def import_library(
+    library: Path,
+    defaults: CartDefaults,
+    checkpoint: Checkpoint,
+    copy_audio: bool,
+    analyse_audio: bool,
+    workers: int,
+    batch_size: int,
+):
+    settings = get_settings()
+    database = Database(settings)
+    await database.create_indexes()
+
+    done = checkpoint.load()
+    files = [path for path in find_audio_files(library) if str(path) not in done]
+    echo(f"{len(files)} files to import, {len(done)} already imported")
+
+    importer = LibraryImporter(
+        database, defaults, create_audio_storage(settings) if copy_audio else None
+    )
+    progress = Progress(len(files))
+    batches = [
+        files[start : start + batch_size] for start in range(0, len(files), batch_size)
+    ]
+    loop = get_running_loop()
+
+    with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as executor:
+
+        def submit(batch: List[Path]):
+            return [
+                loop.run_in_executor(
+                    executor,
+                    extract,
+                    str(path),
+                    copy_audio
+                    and analyse_audio
+                    and is_analysable(content_type(path), path.name),
+                    settings.audio_analysis_silence_threshold,
+                    settings.audio_analysis_cue_threshold,
+                )
+                for path in batch
+            ]
+
+        # The next batch is read by the pool while the current one is written,
+        # keeping the workers busy through the database round trips
+
+        pending = submit(batches[0]) if batches else []
+        for index, batch in enumerate(batches):
+            entries = await gather(*pending)
+            pending = submit(batches[index + 1]) if index + 1 < len(batches) else []
+
+            outcome = await importer.import_batch(entries)
+            checkpoint.record(outcome.imported + outcome.skipped)
+            progress.update(outcome, sum(path.stat().st_size for path in batch))
+            echo(progress.report())
+
+    database.close()
+
+    for path, error in progress.failed:
+        echo(f"Failed {path}: {error}", err=True)
+
+
+def as_utc(value: datetime) -> datetime:
+    # Dates given on the command line have no zone and are taken as UTC
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@command()
+@argument(
+    "library",
+    type=PathType(exists=True, file_okay=False, resolve_path=True, path_type=Path),
+)
+@option("--cart-type", default="Song", help="Cart type given to every imported cart")
+@option("--default-genre", default="Unknown", help="Genre for files without one")
+@option("--tag", "tags", multiple=True, help="Tag added to every imported cart")
+@option("--valid-from", type=DateTime(), default=None, help="Defaults to now")
+@option("--valid-to", type=DateTime(), default="2099-12-31")
+@option("--copy-audio/--no-copy-audio", default=True, help="Copy files into storage")
+@option("--analyse/--no-analyse", default=True, help="Analyse WAVs while importing")
+@option("--workers", type=int, default=None, help="Defaults to one per CPU")
+@option("--batch-size", default=200, help="Carts written per bulk_write")
+@option(
+    "--checkpoint",
+    type=PathType(path_type=Path),
+    default=Path("import.checkpoint"),
+    help="Records imported files so an interrupted import can resume",
+)
+def main(
+    library: Path,
+    cart_type: str,
+    default_genre: str,
+    tags: Tuple[str, ...],
+    valid_from: Optional[datetime],
+    valid_to: datetime,
+    copy_audio: bool,
+    analyse: bool,
+    workers: Optional[int],
+    batch_size: int,
+    checkpoint: Path,
+):
+    defaults = CartDefaults(
+        cart_type=cart_type,
+        genre=default_genre,
+        tags=list(tags),
+        valid_from=as_utc(valid_from) if valid_from else datetime.now(timezone.utc),
+        valid_to=as_utc(valid_to),
+    )
+    run(
+        import_library(
+            library,
+            defaults,
+            Checkpoint(checkpoint),
+            copy_audio,
+            analyse,
+            workers or os.cpu_count() or 1,
+            batch_size,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,92 @@
+from contextlib import asynccontextmanager
 from fastapi import APIRouter, FastAPI
 from fastapi_pagination import add_pagination
+from routers.audio import router as audio_router
+from routers.cart import router as cart_router
+from routers.metrics import router as metrics_router
 from routers.settings import router as settings_router
 from routers.genre import router as genre_router
 from routers.tag import router as tag_router
 from routers.type import router as type_router
+from services.analysis import AnalysisPipeline
+from services.cache import CollectionCache
+from services.cache_control import CacheControlMiddleware
+from services.compression import CompressionMiddleware
+from services.database import Database, REFERENCE_COLLECTIONS
+from services.metrics import MetricsMiddleware
+from services.security import TokenVerifier
+from services.settings import get_settings
+from services.storage import create_audio_storage
 
-app = FastAPI(title="AllDay DJ")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+
+    app.state.database = Database(settings)
+    await app.state.database.create_indexes()
+    await app.state.database.warm()
+
+    app.state.audio_storage = create_audio_storage(settings)
+    app.state.analysis_pipeline = AnalysisPipeline(
+        app.state.database, app.state.audio_storage, settings
+    )
+    await app.state.analysis_pipeline.resume()
+
+    app.state.caches = {}
+    if settings.reference_cache_enabled:
+        app.state.caches = {
+            name: CollectionCache(
+                app.state.database.get_collection(name),
+                poll_interval=settings.reference_cache_poll_interval,
+            )
+            for name in REFERENCE_COLLECTIONS
+        }
+        for cache in app.state.caches.values():
+            cache.start()
+
+    app.state.token_verifier = TokenVerifier()
+    await app.state.token_verifier.warm()
+
+    yield
+
+    await app.state.token_verifier.close()
+    await app.state.analysis_pipeline.close()
+    for cache in app.state.caches.values():
+        await cache.stop()
+    app.state.database.close()
+
+
+app = FastAPI(title="AllDay DJ", lifespan=lifespan)
 base_router = APIRouter(prefix="/api")
 
+base_router.include_router(audio_router)
+base_router.include_router(cart_router)
 base_router.include_router(genre_router)
 base_router.include_router(settings_router)
 base_router.include_router(tag_router)
 base_router.include_router(type_router)
 
 app.include_router(base_router)
+app.include_router(metrics_router)
 
 add_pagination(app)
+
+# Middleware added last runs outermost, so request timings include the time
+# spent compressing
+
+settings = get_settings()
+app.add_middleware(
+    CacheControlMiddleware,
+    policies={
+        base_router.prefix: settings.cache_control_api,
+        f"{base_router.prefix}{settings_router.prefix}": settings.cache_control_settings,
+    },
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,41 @@
+from datetime import datetime
+from enum import StrEnum
+from models.mongodb import PyObjectId
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class AnalysisStatus(StrEnum):
+    Pending = "pending"
+    Running = "running"
+    Complete = "complete"
+    Failed = "failed"
+    Unsupported = "unsupported"
+
+
+class AudioAnalysis(BaseModel):
+    status: AnalysisStatus
+    error: Optional[str] = None
+    duration: Optional[float] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    loudness: Optional[float] = None
+    peak: Optional[float] = None
+    trim_start: Optional[float] = None
+    trim_end: Optional[float] = None
+    intro: Optional[float] = None
+    outro: Optional[float] = None
+
+
+class AudioUploadCreate(BaseModel):
+    filename: str = Field(min_length=1, max_length=255)
+    content_type: str = Field(default="audio/wav", pattern=r"^audio/[\w.+-]+$")
+    size: int = Field(gt=0)
+
+
+class AudioFile(AudioUploadCreate):
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    offset: int = 0
+    complete: bool = False
+    created: datetime
+    analysis: Optional[AudioAnalysis] = None
@@ -0,0 +1,59 @@
+from enum import StrEnum
+from pydantic import BaseModel, model_validator
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+class BulkOperationType(StrEnum):
+    Create = "create"
+    Update = "update"
+    Delete = "delete"
+
+
+class BulkItemStatus(StrEnum):
+    Created = "created"
+    Updated = "updated"
+    Deleted = "deleted"
+    NotFound = "not_found"
+    Conflict = "conflict"
+    Invalid = "invalid"
+    Failed = "failed"
+    Skipped = "skipped"
+
+
+class BulkOperation(BaseModel, Generic[U]):
+    op: BulkOperationType
+    id: Optional[str] = None
+    data: Optional[U] = None
+
+    @model_validator(mode="after")
+    def check_fields(self):
+        if self.op is not BulkOperationType.Create and not self.id:
+            raise ValueError(f"{self.op} operations require an id")
+        if self.op is not BulkOperationType.Delete and self.data is None:
+            raise ValueError(f"{self.op} operations require data")
+        return self
+
+
+class BulkRequest(BaseModel, Generic[U]):
+    ordered: bool = True
+    operations: List[BulkOperation[U]]
+
+
+class BulkItemResult(BaseModel, Generic[T]):
+    index: int
+    op: BulkOperationType
+    status: BulkItemStatus
+    id: Optional[str] = None
+    item: Optional[T] = None
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel, Generic[T]):
+    created: int
+    updated: int
+    deleted: int
+    failed: int
+    results: List[BulkItemResult[T]]
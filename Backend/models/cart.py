@@ -0,0 +1,41 @@
+from datetime import datetime
+from models.audio import AudioAnalysis
+from models.genre import Genre
+from models.mongodb import PyObjectId, PyObjectIdReference
+from models.tag import Tag
+from models.type import CartType
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class CartBase(BaseModel):
+    label: str
+    artist: str
+    title: str
+    album: str
+    year: int
+    sweeper: bool
+    override_fade: bool
+    valid_from: datetime
+    valid_to: datetime
+    isrc: str
+    record_label: str
+    audio: Optional[PyObjectIdReference] = None
+
+
+class CartUpdate(CartBase):
+    type: PyObjectIdReference
+    genre: PyObjectIdReference
+    tags: List[PyObjectIdReference]
+
+
+class Cart(CartBase):
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    type: Optional[CartType] = None
+    genre: Optional[Genre] = None
+    tags: List[Tag] = []
+    analysis: Optional[AudioAnalysis] = None
+
+
+class CartSearchResult(Cart):
+    score: float
@@ -1,4 +1,27 @@
+from bson import ObjectId
+from bson.errors import InvalidId
 from typing_extensions import Annotated
-from pydantic import BeforeValidator
+from pydantic import BeforeValidator, PlainSerializer, PlainValidator, WithJsonSchema
 
 PyObjectId = Annotated[str, BeforeValidator(str)]
+
+
+def _parse_object_id(value) -> ObjectId:
+    if isinstance(value, ObjectId):
+        return value
+
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise ValueError(f"{value!r} is not a valid ObjectId")
+
+
+# References to other documents are validated and stored as ObjectIds so they
+# can be indexed and joined on, and rendered as strings in JSON
+
+PyObjectIdReference = Annotated[
+    ObjectId,
+    PlainValidator(_parse_object_id),
+    PlainSerializer(str, when_used="json"),
+    WithJsonSchema({"type": "string"}),
+]
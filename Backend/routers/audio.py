@@ -0,0 +1,237 @@
+from errors.exceptions import ConflictException, PayloadTooLargeException
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    Request,
+    Response,
+    Security,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from models.audio import AudioFile, AudioUploadCreate
+from services.analysis import AnalysisPipelineDep
+from services.audio import AudioUploadsDep
+from services.database import CartCollectionDep, WaveformCollectionDep
+from services.ranges import parse_range
+from services.security import verify_token
+from services.settings import get_settings, Settings
+from services.storage import AudioStorageDep, AudioWriter
+from starlette.requests import ClientDisconnect
+from time import monotonic
+from typing import Annotated, Optional
+
+router = APIRouter(prefix="/audio", tags=["audio"])
+
+
+@router.post(
+    "/",
+    response_description="Start an audio upload",
+    name="create_audio_upload",
+    response_model=AudioFile,
+    status_code=status.HTTP_201_CREATED,
+    response_model_by_alias=False,
+)
+async def create(
+    request: Request,
+    response: Response,
+    uploads: AudioUploadsDep,
+    settings: Annotated[Settings, Depends(get_settings)],
+    data: AudioUploadCreate = Body(...),
+    auth_result: str = Security(verify_token),
+):
+    if data.size > settings.audio_max_size:
+        raise PayloadTooLargeException(settings.audio_max_size)
+
+    document = await uploads.create(data)
+    response.headers["Location"] = str(
+        request.url_for("upload_audio", id=str(document["_id"]))
+    )
+    return document
+
+
+@router.get(
+    "/{id}",
+    response_description="Get an audio file",
+    name="get_audio",
+    response_model=AudioFile,
+    response_model_by_alias=False,
+)
+async def get(
+    id: str,
+    uploads: AudioUploadsDep,
+    auth_result: str = Security(verify_token),
+):
+    return await uploads.get(id)
+
+
+@router.head(
+    "/{id}",
+    response_description="Get the offset to resume an audio upload from",
+    name="get_audio_upload_offset",
+)
+async def offset(
+    id: str,
+    uploads: AudioUploadsDep,
+    auth_result: str = Security(verify_token),
+):
+    document = await uploads.get(id)
+    return Response(
+        headers={
+            "Cache-Control": "no-store",
+            "Upload-Length": str(document["size"]),
+            "Upload-Offset": str(document["offset"]),
+        }
+    )
+
+
+@router.patch(
+    "/{id}",
+    response_description="Append a chunk to an audio upload",
+    description=(
+        "Appends the request body at Upload-Offset. Completed WAV uploads are "
+        "queued for analysis; other formats are marked unsupported."
+    ),
+    name="upload_audio",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def upload(
+    id: str,
+    request: Request,
+    uploads: AudioUploadsDep,
+    storage: AudioStorageDep,
+    pipeline: AnalysisPipelineDep,
+    upload_offset: int = Header(..., ge=0),
+    auth_result: str = Security(verify_token),
+):
+    document = await uploads.claim(id, upload_offset)
+    renewed = monotonic()
+    writer: Optional[AudioWriter] = None
+    received = upload_offset
+
+    # The body is streamed to storage as it arrives rather than read into
+    # memory, and whatever made it to disk is kept if the client goes away
+
+    try:
+        writer = await storage.writer(str(document["_id"]), upload_offset)
+        async for chunk in request.stream():
+            if received + len(chunk) > document["size"]:
+                raise PayloadTooLargeException(document["size"])
+            if monotonic() - renewed >= uploads.renew_interval:
+                document = await uploads.renew(document)
+                renewed = monotonic()
+            await writer.write(chunk)
+            received += len(chunk)
+    except ClientDisconnect:
+        pass
+    finally:
+        try:
+            if writer:
+                await writer.close()
+        finally:
+            document = await uploads.release(
+                document, writer.offset if writer else upload_offset
+            )
+
+    if document["complete"]:
+        await pipeline.submit(document)
+
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={"Upload-Offset": str(document["offset"])},
+    )
+
+
+@router.post(
+    "/{id}/analysis",
+    response_description="Queue an audio file for analysis again",
+    description=(
+        "Only WAV audio can be analysed. Other formats are recorded with an "
+        "unsupported analysis status instead of being queued."
+    ),
+    name="analyse_audio",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def reanalyse(
+    id: str,
+    uploads: AudioUploadsDep,
+    pipeline: AnalysisPipelineDep,
+    auth_result: str = Security(verify_token),
+):
+    document = await uploads.get(id)
+    if not document["complete"]:
+        raise ConflictException(f"Audio {id} has not finished uploading")
+    await pipeline.submit(document)
+
+
+@router.get(
+    "/{id}/content",
+    response_description="Download an audio file, optionally as a byte range",
+    name="download_audio",
+    response_class=StreamingResponse,
+    responses={status.HTTP_206_PARTIAL_CONTENT: {"description": "Partial content"}},
+)
+async def download(
+    id: str,
+    uploads: AudioUploadsDep,
+    storage: AudioStorageDep,
+    range: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None),
+    auth_result: str = Security(verify_token),
+):
+    document = await uploads.get(id)
+    if not document["complete"]:
+        raise ConflictException(f"Audio {id} has not finished uploading")
+
+    # Uploaded audio never changes, so the ID and size make a strong validator
+
+    size = document["size"]
+    etag = f'"{document["_id"]}-{size}"'
+    byte_range = parse_range(range, size) if if_range in (None, etag) else None
+    start, end = byte_range or (0, size - 1)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "ETag": etag,
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return StreamingResponse(
+        storage.read(str(document["_id"]), start, end),
+        status_code=(
+            status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK
+        ),
+        media_type=document["content_type"],
+        headers=headers,
+    )
+
+
+@router.delete(
+    "/{id}",
+    response_description="Delete an audio file",
+    description="Audio still used by a cart can't be deleted.",
+    name="delete_audio",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_409_CONFLICT: {"description": "Audio used by a cart"}},
+)
+async def delete(
+    id: str,
+    uploads: AudioUploadsDep,
+    carts: CartCollectionDep,
+    storage: AudioStorageDep,
+    waveforms: WaveformCollectionDep,
+    auth_result: str = Security(verify_token),
+):
+    # Carts copy the analysis and waveform of their audio, so deleting audio
+    # a cart still plays would leave it pointing at a missing file
+
+    document = await uploads.get(id)
+    if await carts.count_documents({"audio": document["_id"]}, limit=1):
+        raise ConflictException(f"Audio {id} is used by a cart")
+
+    object_id = await uploads.delete(id)
+    await waveforms.delete_many({"audio": object_id})
+    await storage.delete(str(object_id))
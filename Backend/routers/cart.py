@@ -0,0 +1,126 @@
+from bson import ObjectId
+from datetime import datetime
+from errors.exceptions import NotFoundException, NotModifiedException
+from fastapi import APIRouter, Query, Request, Response, Security, status
+from fastapi_pagination import Page
+from fastapi_pagination.api import set_page
+from models.cart import Cart, CartSearchResult, CartUpdate
+from models.mongodb import PyObjectIdReference
+from routers.crud import create_crud_router
+from services.analysis import find_waveform_level
+from services.database import (
+    CartCollectionDep,
+    get_cart_collection,
+    WaveformCollectionDep,
+)
+from services.etag import is_not_modified
+from services.references import CartHooksDep, get_cart_hooks
+from services.responses import DocumentSerializer
+from services.search import build_cart_filter, search_collection
+from services.security import verify_token
+from services.waveform import resample
+from typing import Any, Optional
+
+router = APIRouter(prefix="/cart", tags=["cart"])
+serializer = DocumentSerializer(CartSearchResult)
+projection = {
+    field.alias or field_name: 1 for field_name, field in Cart.model_fields.items()
+}
+
+
+@router.get(
+    "/search",
+    response_description="Search carts",
+    name="search_carts",
+    response_model=Page[CartSearchResult],
+    response_model_by_alias=False,
+)
+async def search(
+    response: Response,
+    collection: CartCollectionDep,
+    hooks: CartHooksDep,
+    q: str = Query(..., min_length=1, max_length=256, description="Search terms"),
+    type: Optional[PyObjectIdReference] = Query(None, description="Cart type ID"),
+    genre: Optional[PyObjectIdReference] = Query(None, description="Genre ID"),
+    tag: Optional[PyObjectIdReference] = Query(None, description="Tag ID"),
+    valid_at: Optional[datetime] = Query(
+        None, description="Only carts valid at this time"
+    ),
+    auth_result: str = Security(verify_token),
+):
+    query_filter = build_cart_filter(q, type, genre, tag, valid_at)
+
+    with set_page(Page[Any]):
+        page = await search_collection(
+            collection,
+            query_filter,
+            {**projection, **{field: 1 for field in hooks.fields}},
+        )
+    page.items = await hooks.resolve(list(page.items))
+    return serializer.page_response(page, headers=response.headers)
+
+
+@router.get(
+    "/{id}/waveform",
+    response_description="Get a cart's waveform overview as int16 min/max pairs",
+    name="get_cart_waveform",
+    response_class=Response,
+    responses={status.HTTP_200_OK: {"content": {"application/octet-stream": {}}}},
+)
+async def waveform(
+    id: str,
+    request: Request,
+    collection: CartCollectionDep,
+    waveforms: WaveformCollectionDep,
+    resolution: int = Query(
+        1024, ge=1, le=65536, description="Number of min/max points wanted"
+    ),
+    auth_result: str = Security(verify_token),
+):
+    if not ObjectId.is_valid(id) or not (
+        cart := await collection.find_one({"_id": ObjectId(id)}, {"audio": 1})
+    ):
+        raise NotFoundException("Cart", id)
+
+    level = cart.get("audio") and await find_waveform_level(
+        waveforms, cart["audio"], resolution
+    )
+    if not level:
+        raise NotFoundException("Waveform for cart", id)
+
+    # Levels are replaced rather than updated when audio is analysed again,
+    # so the level's ID identifies its content
+
+    points = min(resolution, level["points"])
+    etag = f'"{level["_id"]}-{points}"'
+    if is_not_modified(request, etag):
+        raise NotModifiedException(etag)
+
+    return Response(
+        resample(level["data"], points),
+        media_type="application/octet-stream",
+        headers={
+            "ETag": etag,
+            "X-Waveform-Frames-Per-Point": str(
+                level["frames_per_point"] * level["points"] / points
+            ),
+            "X-Waveform-Points": str(points),
+            "X-Waveform-Sample-Rate": str(level["sample_rate"]),
+        },
+    )
+
+
+# Registered after the search route so /search isn't taken for a cart ID
+
+router.include_router(
+    create_crud_router(
+        name="cart",
+        plural="carts",
+        model=Cart,
+        update_model=CartUpdate,
+        collection_dependency=get_cart_collection,
+        prefix="",
+        tags=["cart"],
+        hooks_dependency=get_cart_hooks,
+    )
+)
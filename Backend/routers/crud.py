@@ -0,0 +1,168 @@
+from errors.exceptions import NotModifiedException
+from fastapi import APIRouter, Body, Depends, Request, Response, Security, status
+from fastapi_pagination import Page
+from fastapi_pagination.api import set_page
+from fastapi_pagination.cursor import CursorPage
+from models.bulk import BulkRequest, BulkResponse
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pydantic import BaseModel
+from services.cache import CachesDep
+from services.etag import is_not_modified, make_etag
+from services.pagination import KeysetParams
+from services.repository import Repository, RepositoryHooks
+from services.responses import DocumentSerializer
+from services.security import verify_token
+from typing import Annotated, Any, Callable, List, Optional, Type
+
+
+def no_hooks() -> Optional[RepositoryHooks]:
+    return None
+
+
+def create_crud_router(
+    name: str,
+    plural: str,
+    model: Type[BaseModel],
+    update_model: Type[BaseModel],
+    collection_dependency: Callable[..., AsyncIOMotorCollection],
+    prefix: str,
+    tags: List[str],
+    hooks_dependency: Optional[Callable[..., RepositoryHooks]] = None,
+) -> APIRouter:
+    router = APIRouter(prefix=prefix, tags=tags)
+
+    # List pages are serialized straight from the Motor documents and returned
+    # as a response, so response_model only documents the schema there
+
+    serializer = DocumentSerializer(model)
+
+    def get_repository(
+        collection: Annotated[AsyncIOMotorCollection, Depends(collection_dependency)],
+        caches: CachesDep,
+        hooks: Annotated[
+            Optional[RepositoryHooks], Depends(hooks_dependency or no_hooks)
+        ],
+    ) -> Repository:
+        return Repository(collection, model, name.capitalize(), caches.get(name), hooks)
+
+    RepositoryDep = Annotated[Repository, Depends(get_repository)]
+
+    async def check_etag(
+        request: Request,
+        response: Response,
+        repository: RepositoryDep,
+        auth_result: str = Security(verify_token),
+    ):
+        etag = make_etag(await repository.version(), request)
+        if is_not_modified(request, etag):
+            raise NotModifiedException(etag)
+        response.headers["ETag"] = etag
+
+    @router.post(
+        "/",
+        response_description=f"Create a {name}",
+        name=f"create_{name}",
+        response_model=model,
+        status_code=status.HTTP_201_CREATED,
+        response_model_by_alias=False,
+    )
+    async def create(
+        repository: RepositoryDep,
+        data: update_model = Body(...),
+        auth_result: str = Security(verify_token),
+    ):
+        return await repository.create(data)
+
+    @router.post(
+        "/bulk",
+        response_description=f"Create, update and delete {plural} in bulk",
+        name=f"bulk_{plural}",
+        response_model=BulkResponse[model],
+        response_model_by_alias=False,
+    )
+    async def bulk(
+        repository: RepositoryDep,
+        request: BulkRequest[update_model] = Body(...),
+        auth_result: str = Security(verify_token),
+    ):
+        return await repository.bulk(request)
+
+    @router.get(
+        "/cursor",
+        response_description=f"List {plural} by cursor",
+        name=f"list_{plural}_cursor",
+        dependencies=[Depends(check_etag)],
+        response_model=CursorPage[model],
+        response_model_by_alias=False,
+    )
+    async def list_by_cursor(
+        response: Response,
+        repository: RepositoryDep,
+        params: KeysetParams = Depends(),
+        auth_result: str = Security(verify_token),
+    ):
+        with set_page(CursorPage[Any]):
+            page = await repository.list_by_cursor(params)
+        return serializer.page_response(page, headers=response.headers)
+
+    @router.get(
+        "/{id}",
+        response_description=f"Get a {name}",
+        name=f"get_{name}",
+        dependencies=[Depends(check_etag)],
+        response_model=model,
+        response_model_by_alias=False,
+    )
+    async def get(
+        id: str,
+        repository: RepositoryDep,
+        auth_result: str = Security(verify_token),
+    ):
+        return await repository.get(id)
+
+    @router.delete(
+        "/{id}",
+        response_description=f"Delete a {name}",
+        name=f"delete_{name}",
+        status_code=204,
+    )
+    async def delete(
+        id: str,
+        repository: RepositoryDep,
+        auth_result: str = Security(verify_token),
+    ):
+        await repository.delete(id)
+
+    @router.put(
+        "/{id}",
+        response_description=f"Update a {name}",
+        name=f"update_{name}",
+        response_model=model,
+        response_model_by_alias=False,
+    )
+    async def update(
+        id: str,
+        repository: RepositoryDep,
+        data: update_model = Body(...),
+        auth_result: str = Security(verify_token),
+    ):
+        return await repository.update(id, data)
+
+    @router.get(
+        "/",
+        response_description=f"List {plural}",
+        name=f"list_{plural}",
+        dependencies=[Depends(check_etag)],
+        response_model=Page[model],
+        response_model_by_alias=False,
+    )
+    async def list_all(
+        response: Response,
+        repository: RepositoryDep,
+        auth_result: str = Security(verify_token),
+    ):
+        with set_page(Page[Any]):
+            page = await repository.list()
+        return serializer.page_response(page, headers=response.headers)
+
+    return router
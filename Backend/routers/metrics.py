@@ -0,0 +1,55 @@
+from errors.exceptions import UnauthenticatedException, UnauthorizedException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from hmac import compare_digest
+from os import environ
+from prometheus_client import (
+    CollectorRegistry,
+    CONTENT_TYPE_LATEST,
+    generate_latest,
+    multiprocess,
+    REGISTRY,
+)
+from services.settings import get_settings, Settings
+from typing import Annotated, Optional
+
+
+def verify_metrics_token(
+    settings: Annotated[Settings, Depends(get_settings)],
+    authorization: Annotated[Optional[str], Header()] = None,
+):
+    # Metrics name every route and count MongoDB and identity provider
+    # traffic, so they're only served to a scraper holding METRICS_TOKEN and
+    # not at all until one is set
+
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    if not authorization:
+        raise UnauthenticatedException()
+
+    if not compare_digest(
+        authorization.encode(), f"Bearer {settings.metrics_token}".encode()
+    ):
+        raise UnauthorizedException(detail="Invalid metrics token")
+
+
+router = APIRouter(
+    prefix="/metrics", tags=["metrics"], dependencies=[Depends(verify_metrics_token)]
+)
+
+
+def get_registry() -> CollectorRegistry:
+    # Under multiple workers every scrape has to gather the samples written
+    # by all of them, not just the worker that happens to answer
+
+    if "PROMETHEUS_MULTIPROC_DIR" not in environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+@router.get("", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(generate_latest(get_registry()), media_type=CONTENT_TYPE_LATEST)
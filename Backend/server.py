@@ -0,0 +1,60 @@
+from importlib import import_module
+from os import cpu_count, environ
+from pathlib import Path
+from services.settings import get_settings, Settings
+from tempfile import mkdtemp
+import uvicorn
+
+PROMETHEUS_MULTIPROC_DIR = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def worker_count(settings: Settings) -> int:
+    return max(settings.web_concurrency or cpu_count() or 1, 1)
+
+
+def prepare_metrics_directory():
+    # Each worker is its own process, so metrics are written to a shared
+    # directory and aggregated when /metrics is scraped. Files left from an
+    # earlier run would otherwise be counted again.
+
+    if PROMETHEUS_MULTIPROC_DIR not in environ:
+        environ[PROMETHEUS_MULTIPROC_DIR] = mkdtemp(prefix="alldaydj-metrics-")
+
+    for stale in Path(environ[PROMETHEUS_MULTIPROC_DIR]).glob("*.db"):
+        stale.unlink()
+
+
+def check_app_imports():
+    # Workers are spawned and import the app for themselves, so nothing is
+    # shared with them. Importing it here first is only a check, so the
+    # container fails fast on a broken build or config rather than once per
+    # worker after the socket is bound.
+
+    import_module("main")
+
+
+def main():
+    settings = get_settings()
+    workers = worker_count(settings)
+
+    if workers > 1:
+        prepare_metrics_directory()
+
+    check_app_imports()
+
+    uvicorn.run(
+        "main:app",
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        access_log=settings.server_access_log,
+        proxy_headers=True,
+        timeout_keep_alive=settings.server_keep_alive_timeout,
+        timeout_graceful_shutdown=settings.server_graceful_shutdown_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
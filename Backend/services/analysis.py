@@ -0,0 +1,227 @@
+from asyncio import CancelledError, create_task, gather, get_running_loop, Task
+from bson import Binary, ObjectId
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import Depends, Request
+from logging import getLogger, Logger
+from models.audio import AnalysisStatus
+from motor.motor_asyncio import AsyncIOMotorCollection
+from multiprocessing import get_context
+from pathlib import Path
+from pymongo import ASCENDING, DESCENDING
+from services.database import Database
+from services.loudness import analyse
+from services.settings import Settings
+from services.storage import AudioStorage
+from services.versions import bump_version
+from services.waveform import POINT_SIZE, WaveformLevel
+from typing import Annotated, Dict, List, Optional, Set
+import os
+
+# Levels are stored one per document, so any too big for a document are
+# left out; that's only the finest levels of recordings over a few hours
+
+MAX_LEVEL_SIZE = 8 * 1024 * 1024
+
+# Analysis decodes audio with the standard library's wave module, so only
+# PCM WAV files can be measured; anything else is marked unsupported rather
+# than left to fail in a worker
+
+ANALYSABLE_CONTENT_TYPES = {"audio/vnd.wave", "audio/wav", "audio/wave", "audio/x-wav"}
+ANALYSABLE_EXTENSIONS = {".wav", ".wave"}
+
+
+def is_analysable(content_type: str, filename: str) -> bool:
+    return (
+        content_type.lower() in ANALYSABLE_CONTENT_TYPES
+        or Path(filename).suffix.lower() in ANALYSABLE_EXTENSIONS
+    )
+
+
+def unsupported_analysis(content_type: str) -> Dict:
+    return {
+        "status": AnalysisStatus.Unsupported,
+        "error": f"Unsupported format {content_type}, only WAV audio is analysed",
+    }
+
+
+def worker_count(settings: Settings) -> int:
+    # Each web worker has its own pool, so by default the cores are shared
+    # out between them rather than every worker claiming all of them
+
+    if settings.audio_analysis_workers:
+        return settings.audio_analysis_workers
+
+    cores = os.cpu_count() or 1
+    return max(1, cores // (settings.web_concurrency or cores))
+
+
+async def store_waveform(
+    collection: AsyncIOMotorCollection,
+    object_id: ObjectId,
+    summary: Dict,
+    levels: List[WaveformLevel],
+):
+    # New levels go in before the old ones are removed so readers never find
+    # the waveform missing
+
+    documents = [
+        {
+            "audio": object_id,
+            "frames_per_point": level.frames_per_point,
+            "points": len(level.data) // POINT_SIZE,
+            "sample_rate": summary["sample_rate"],
+            "data": Binary(level.data),
+        }
+        for level in levels
+        if len(level.data) <= MAX_LEVEL_SIZE
+    ]
+    result = await collection.insert_many(documents) if documents else None
+    await collection.delete_many(
+        {"audio": object_id, "_id": {"$nin": result.inserted_ids if result else []}}
+    )
+
+
+class AnalysisPipeline:
+    __database: Database
+    __executor: ProcessPoolExecutor
+    __logger: Logger
+    __settings: Settings
+    __storage: AudioStorage
+    __tasks: Set[Task]
+
+    def __init__(
+        self,
+        database: Database,
+        storage: AudioStorage,
+        settings: Settings,
+        logger: Logger = getLogger("uvicorn.error"),
+    ):
+        self.__database = database
+        self.__logger = logger
+        self.__settings = settings
+        self.__storage = storage
+        self.__tasks = set()
+        self.__executor = self.__create_executor()
+
+    def __create_executor(self) -> ProcessPoolExecutor:
+        # Workers are spawned rather than forked from a process that already
+        # has an event loop and MongoDB threads running
+
+        return ProcessPoolExecutor(
+            max_workers=worker_count(self.__settings), mp_context=get_context("spawn")
+        )
+
+    async def submit(self, document: Dict):
+        object_id = document["_id"]
+        if not is_analysable(document["content_type"], document["filename"]):
+            self.__logger.info("Skipping analysis of unsupported audio %s", object_id)
+            await self.__record(
+                object_id, unsupported_analysis(document["content_type"])
+            )
+            return
+
+        await self.__record(object_id, {"status": AnalysisStatus.Pending})
+        self.__start(object_id)
+
+    async def resume(self):
+        # Analyses a shutdown interrupted were put back as pending. Every
+        # worker starts them, but only the one that claims each runs it
+
+        cursor = self.__database.get_collection("audio").find(
+            {"analysis.status": AnalysisStatus.Pending}, {"_id": 1}
+        )
+        async for document in cursor:
+            self.__start(document["_id"])
+
+    def __start(self, object_id: ObjectId):
+        task = create_task(self.__run(object_id))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __record(self, object_id: ObjectId, analysis: Dict):
+        # The audio record is written first so carts created meanwhile copy
+        # the latest result, then every cart using the audio is brought up
+        # to date
+
+        await self.__database.get_collection("audio").update_one(
+            {"_id": object_id}, {"$set": {"analysis": analysis}}
+        )
+
+        carts = self.__database.get_collection("cart")
+        result = await carts.update_many(
+            {"audio": object_id}, {"$set": {"analysis": analysis}}
+        )
+        if result.modified_count:
+            await bump_version(carts)
+
+    async def __run(self, object_id: ObjectId):
+        claimed = await self.__database.get_collection("audio").find_one_and_update(
+            {"_id": object_id, "analysis.status": AnalysisStatus.Pending},
+            {"$set": {"analysis.status": AnalysisStatus.Running}},
+        )
+        if not claimed:
+            return
+
+        self.__logger.info("Analysing audio %s", object_id)
+        executor = self.__executor
+        try:
+            async with self.__storage.local_file(str(object_id)) as path:
+                result = await get_running_loop().run_in_executor(
+                    executor,
+                    analyse,
+                    str(path),
+                    self.__settings.audio_analysis_silence_threshold,
+                    self.__settings.audio_analysis_cue_threshold,
+                )
+            await store_waveform(
+                self.__database.get_collection("waveform"),
+                object_id,
+                result.summary,
+                result.waveform,
+            )
+            analysis = {"status": AnalysisStatus.Complete, **result.summary}
+        except CancelledError:
+            self.__logger.info("Analysis of audio %s interrupted", object_id)
+            await self.__record(object_id, {"status": AnalysisStatus.Pending})
+            raise
+        except BrokenProcessPool:
+            self.__logger.error("Analysis worker died on audio %s", object_id)
+            if executor is self.__executor:
+                self.__executor = self.__create_executor()
+            analysis = {"status": AnalysisStatus.Failed, "error": "Worker crashed"}
+        except Exception as error:
+            self.__logger.exception("Failed to analyse audio %s", object_id)
+            analysis = {"status": AnalysisStatus.Failed, "error": str(error)}
+
+        await self.__record(object_id, analysis)
+
+    async def close(self):
+        for task in self.__tasks:
+            task.cancel()
+        await gather(*self.__tasks, return_exceptions=True)
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def find_waveform_level(
+    collection: AsyncIOMotorCollection, audio: ObjectId, points: int
+) -> Optional[Dict]:
+    # The coarsest level with enough points is folded down to the request,
+    # falling back to the finest there is for very wide requests
+
+    cursor = collection.find({"audio": audio, "points": {"$gte": points}})
+    async for document in cursor.sort("points", ASCENDING).limit(1):
+        return document
+
+    cursor = collection.find({"audio": audio})
+    async for document in cursor.sort("points", DESCENDING).limit(1):
+        return document
+
+    return None
+
+
+def get_analysis_pipeline(request: Request) -> AnalysisPipeline:
+    return request.app.state.analysis_pipeline
+
+
+AnalysisPipelineDep = Annotated[AnalysisPipeline, Depends(get_analysis_pipeline)]
@@ -0,0 +1,119 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime, timedelta, timezone
+from errors.exceptions import ConflictException, NotFoundException
+from fastapi import Depends
+from models.audio import AudioUploadCreate
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from services.database import AudioCollectionDep
+from services.settings import get_settings, Settings
+from typing import Annotated, Dict
+
+
+class AudioUploads:
+    __collection: AsyncIOMotorCollection
+    __lease: timedelta
+    renew_interval: float
+
+    def __init__(self, collection: AsyncIOMotorCollection, lease: timedelta):
+        self.__collection = collection
+        self.__lease = lease
+        self.renew_interval = lease.total_seconds() / 2
+
+    @staticmethod
+    def __parse_id(id: str) -> ObjectId:
+        try:
+            return ObjectId(id)
+        except (InvalidId, TypeError):
+            raise NotFoundException("Audio", id)
+
+    async def create(self, data: AudioUploadCreate) -> Dict:
+        document = {
+            **data.model_dump(),
+            "offset": 0,
+            "complete": False,
+            "created": datetime.now(timezone.utc),
+        }
+        result = await self.__collection.insert_one(document)
+        return {"_id": result.inserted_id, **document}
+
+    async def get(self, id: str) -> Dict:
+        document = await self.__collection.find_one({"_id": self.__parse_id(id)})
+        if not document:
+            raise NotFoundException("Audio", id)
+        return document
+
+    async def claim(self, id: str, offset: int) -> Dict:
+        # Only one request may append at a time; the lease expires so an upload
+        # whose connection died mid-request can be resumed
+
+        now = datetime.now(timezone.utc)
+        document = await self.__collection.find_one_and_update(
+            {
+                "_id": self.__parse_id(id),
+                "offset": offset,
+                "complete": False,
+                "$or": [{"lease": None}, {"lease": {"$lt": now}}],
+            },
+            {"$set": {"lease": now + self.__lease, "lease_holder": ObjectId()}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if document:
+            return document
+
+        document = await self.get(id)
+        if document["complete"]:
+            raise ConflictException(f"Audio {id} has already been uploaded")
+        if document["offset"] != offset:
+            raise ConflictException(
+                f"Upload offset is {document['offset']}",
+                headers={"Upload-Offset": str(document["offset"])},
+            )
+        raise ConflictException(f"Audio {id} is being uploaded by another request")
+
+    async def renew(self, document: Dict) -> Dict:
+        # A long request renews its lease as chunks arrive, so the lease only
+        # runs out on an upload that has stalled. If it ran out anyway and was
+        # claimed by another request, this one has to stop.
+
+        renewed = await self.__collection.find_one_and_update(
+            {"_id": document["_id"], "lease_holder": document["lease_holder"]},
+            {"$set": {"lease": datetime.now(timezone.utc) + self.__lease}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not renewed:
+            raise ConflictException(
+                f"Audio {document['_id']} is being uploaded by another request"
+            )
+        return renewed
+
+    async def release(self, document: Dict, offset: int) -> Dict:
+        # Only the request holding the lease records its offset, so one that
+        # lost its lease can't move the offset under the new holder
+
+        fields = {"offset": offset, "complete": offset == document["size"]}
+        result = await self.__collection.update_one(
+            {"_id": document["_id"], "lease_holder": document["lease_holder"]},
+            {"$set": fields, "$unset": {"lease": "", "lease_holder": ""}},
+        )
+        if not result.matched_count:
+            return await self.__collection.find_one({"_id": document["_id"]})
+        return {**document, **fields}
+
+    async def delete(self, id: str) -> ObjectId:
+        object_id = self.__parse_id(id)
+        result = await self.__collection.delete_one({"_id": object_id})
+        if not result.deleted_count == 1:
+            raise NotFoundException("Audio", id)
+        return object_id
+
+
+def get_audio_uploads(
+    collection: AudioCollectionDep,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> AudioUploads:
+    return AudioUploads(collection, timedelta(seconds=settings.audio_upload_lease))
+
+
+AudioUploadsDep = Annotated[AudioUploads, Depends(get_audio_uploads)]
@@ -0,0 +1,177 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from models.bulk import (
+    BulkItemResult,
+    BulkItemStatus,
+    BulkOperationType,
+    BulkRequest,
+    BulkResponse,
+)
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+DUPLICATE_KEY_ERROR = 11000
+
+SUCCESS_STATUS: Dict[BulkOperationType, BulkItemStatus] = {
+    BulkOperationType.Create: BulkItemStatus.Created,
+    BulkOperationType.Update: BulkItemStatus.Updated,
+    BulkOperationType.Delete: BulkItemStatus.Deleted,
+}
+
+
+def _parse_ids(request: BulkRequest, results: List[BulkItemResult]) -> List:
+    object_ids = []
+
+    for index, operation in enumerate(request.operations):
+        object_id = None
+        if operation.op is not BulkOperationType.Create:
+            try:
+                object_id = ObjectId(operation.id)
+            except (InvalidId, TypeError):
+                results[index].status = BulkItemStatus.Invalid
+                results[index].error = f"{operation.id} is not a valid ID"
+        object_ids.append(object_id)
+
+    return object_ids
+
+
+async def _find_existing(collection: AsyncIOMotorCollection, object_ids) -> Set:
+    lookup = list({object_id for object_id in object_ids if object_id})
+    if not lookup:
+        return set()
+
+    cursor = collection.find({"_id": {"$in": lookup}}, {"_id": 1})
+    return {document["_id"] async for document in cursor}
+
+
+async def bulk_write_operations(
+    collection: AsyncIOMotorCollection,
+    request: BulkRequest,
+    prepare: Optional[Callable[[List[Dict]], Awaitable]] = None,
+) -> BulkResponse:
+    results = [
+        BulkItemResult(index=index, op=operation.op, status=BulkItemStatus.Skipped)
+        for index, operation in enumerate(request.operations)
+    ]
+    object_ids = _parse_ids(request, results)
+    existing = await _find_existing(collection, object_ids)
+
+    # Walk the operations in order so a delete followed by an update of the
+    # same document is reported as not found, matching what Mongo will do
+
+    writes = []
+    write_indexes = []
+    documents = {}
+
+    for index, operation in enumerate(request.operations):
+        if results[index].status is BulkItemStatus.Invalid:
+            if request.ordered:
+                break
+            continue
+
+        object_id = object_ids[index]
+        if operation.op is not BulkOperationType.Create and object_id not in existing:
+            results[index].status = BulkItemStatus.NotFound
+            results[index].id = operation.id
+            continue
+
+        match operation.op:
+            case BulkOperationType.Create:
+                # The ID is assigned here rather than left to the driver, so
+                # it's known whether or not the insert gets to run
+
+                document = {
+                    "_id": ObjectId(),
+                    **operation.data.model_dump(by_alias=True),
+                }
+                writes.append(InsertOne(document))
+                documents[index] = document
+            case BulkOperationType.Update:
+                fields = operation.data.model_dump(by_alias=True)
+                writes.append(UpdateOne({"_id": object_id}, {"$set": fields}))
+                documents[index] = fields
+            case BulkOperationType.Delete:
+                writes.append(DeleteOne({"_id": object_id}))
+                existing.discard(object_id)
+
+        write_indexes.append(index)
+
+    # Documents are prepared together, so derived fields can be filled from
+    # one batch of lookups; the writes hold the same dicts and see the changes
+
+    if prepare and documents:
+        await prepare(list(documents.values()))
+
+    for index, document in documents.items():
+        if request.operations[index].op is BulkOperationType.Update:
+            documents[index] = {"_id": object_ids[index], **document}
+
+    write_errors = {}
+    if writes:
+        try:
+            await collection.bulk_write(writes, ordered=request.ordered)
+        except BulkWriteError as error:
+            write_errors = {
+                write_error["index"]: write_error
+                for write_error in error.details.get("writeErrors", [])
+            }
+
+    # An ordered batch stops at the first failure, so nothing after it ran
+
+    executed = len(write_indexes)
+    if request.ordered and write_errors:
+        executed = min(write_errors) + 1
+
+    for write_index, index in enumerate(write_indexes[:executed]):
+        result = results[index]
+        result.id = request.operations[index].id
+
+        if write_index in write_errors:
+            write_error = write_errors[write_index]
+            result.status = (
+                BulkItemStatus.Conflict
+                if write_error.get("code") == DUPLICATE_KEY_ERROR
+                else BulkItemStatus.Failed
+            )
+            result.error = write_error.get("errmsg")
+        else:
+            result.status = SUCCESS_STATUS[result.op]
+            if index in documents:
+                result.item = documents[index]
+                result.id = str(documents[index]["_id"])
+
+    # Anything after the first failure is reported as skipped, including
+    # operations already found to be missing
+
+    if request.ordered:
+        failures = [
+            index
+            for index, result in enumerate(results)
+            if result.status is BulkItemStatus.Invalid
+        ] + [write_indexes[write_index] for write_index in write_errors]
+
+        if failures:
+            for result in results[min(failures) + 1 :]:
+                result.status = BulkItemStatus.Skipped
+                result.id = None
+                result.item = None
+                result.error = None
+
+    return BulkResponse(
+        created=sum(result.status is BulkItemStatus.Created for result in results),
+        updated=sum(result.status is BulkItemStatus.Updated for result in results),
+        deleted=sum(result.status is BulkItemStatus.Deleted for result in results),
+        failed=sum(
+            result.status
+            in [
+                BulkItemStatus.Conflict,
+                BulkItemStatus.Failed,
+                BulkItemStatus.Invalid,
+                BulkItemStatus.NotFound,
+            ]
+            for result in results
+        ),
+        results=results,
+    )
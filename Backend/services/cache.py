@@ -0,0 +1,167 @@
+from asyncio import CancelledError, create_task, Lock, sleep, Task
+from bson import ObjectId
+from fastapi import Depends, Request
+from logging import getLogger, Logger
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import PyMongoError
+from services.repository import RepositoryCache
+from services.versions import get_version, VERSION_COLLECTION
+from typing import Annotated, Dict, List, NamedTuple, Optional
+
+
+class CacheSnapshot(NamedTuple):
+    version: int
+    documents: Dict[ObjectId, Dict]
+
+
+class CollectionCache(RepositoryCache):
+    __collection: AsyncIOMotorCollection
+    __generation: int
+    __lock: Lock
+    __logger: Logger
+    __poll_interval: int
+    __retry_interval: int
+    __snapshot: Optional[CacheSnapshot]
+    __task: Optional[Task]
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        poll_interval: int,
+        retry_interval: int = 5,
+        logger: Logger = getLogger("uvicorn.error"),
+    ):
+        self.__collection = collection
+        self.__generation = 0
+        self.__lock = Lock()
+        self.__logger = logger
+        self.__poll_interval = poll_interval
+        self.__retry_interval = retry_interval
+        self.__snapshot = None
+        self.__task = None
+
+    async def __load(self) -> CacheSnapshot:
+        if (snapshot := self.__snapshot) is not None:
+            return snapshot
+
+        async with self.__lock:
+            if self.__snapshot is not None:
+                return self.__snapshot
+
+            # The version is read before the documents so they are never older
+            # than the version they're tagged with. A write landing mid-load
+            # bumps the generation, in which case the snapshot is served to
+            # this caller but not kept.
+
+            generation = self.__generation
+            version = await get_version(self.__collection)
+            cursor = self.__collection.find({}).sort("_id", 1)
+            snapshot = CacheSnapshot(
+                version=version,
+                documents={document["_id"]: document async for document in cursor},
+            )
+
+            if generation == self.__generation:
+                self.__snapshot = snapshot
+
+            return snapshot
+
+    async def get(self, object_id: ObjectId) -> Optional[Dict]:
+        return (await self.__load()).documents.get(object_id)
+
+    async def list(self) -> List[Dict]:
+        return list((await self.__load()).documents.values())
+
+    async def version(self) -> int:
+        return (await self.__load()).version
+
+    def invalidate(self):
+        self.__generation += 1
+        self.__snapshot = None
+
+    def start(self):
+        if not self.__task:
+            self.__task = create_task(self.__watch())
+
+    async def stop(self):
+        if self.__task:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except CancelledError:
+                pass
+            self.__task = None
+
+    async def __watch(self):
+        opened = False
+
+        while True:
+            try:
+                async with self.__collection.database.watch(
+                    self.__pipeline()
+                ) as stream:
+                    opened = True
+                    self.invalidate()
+                    async for _ in stream:
+                        self.invalidate()
+            except CancelledError:
+                raise
+            except Exception as error:
+                if not opened:
+                    self.__logger.info(
+                        "Change streams unavailable for %s (%s), polling every %ds",
+                        self.__collection.name,
+                        error,
+                        self.__poll_interval,
+                    )
+                    await self.__poll()
+                    return
+
+                self.__logger.warning(
+                    "Change stream for %s failed: %s", self.__collection.name, error
+                )
+                self.invalidate()
+                await sleep(self.__retry_interval)
+
+    def __pipeline(self) -> List[Dict]:
+        return [
+            {
+                "$match": {
+                    "$or": [
+                        {"ns.coll": self.__collection.name},
+                        {
+                            "ns.coll": VERSION_COLLECTION,
+                            "documentKey._id": self.__collection.name,
+                        },
+                    ]
+                }
+            }
+        ]
+
+    async def __poll(self):
+        # Every write through the API bumps the collection's version, so the
+        # snapshot is only dropped once the version has moved past it
+
+        while True:
+            await sleep(self.__poll_interval)
+
+            if (snapshot := self.__snapshot) is None:
+                continue
+
+            try:
+                version = await get_version(self.__collection)
+            except PyMongoError as error:
+                self.__logger.warning(
+                    "Version poll for %s failed: %s", self.__collection.name, error
+                )
+                continue
+
+            if version != snapshot.version:
+                self.invalidate()
+
+
+def get_caches(request: Request) -> Dict[str, CollectionCache]:
+    return request.app.state.caches
+
+
+CachesDep = Annotated[Dict[str, CollectionCache], Depends(get_caches)]
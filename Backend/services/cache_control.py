@@ -0,0 +1,46 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, List, Optional, Tuple
+
+
+class CacheControlMiddleware:
+    __app: ASGIApp
+    __policies: List[Tuple[str, str]]
+
+    def __init__(self, app: ASGIApp, policies: Dict[str, str]):
+        self.__app = app
+
+        # Longest prefix first, so a router's own policy wins over the one
+        # for the prefix it's mounted under
+
+        self.__policies = sorted(
+            ((prefix.rstrip("/"), policy) for prefix, policy in policies.items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def __policy(self, path: str) -> Optional[str]:
+        for prefix, policy in self.__policies:
+            if path == prefix or path.startswith(f"{prefix}/"):
+                return policy
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.__app(scope, receive, send)
+            return
+
+        if not (policy := self.__policy(scope["path"])):
+            await self.__app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and (
+                200 <= message["status"] < 300 or message["status"] == 304
+            ):
+                headers = MutableHeaders(scope=message)
+                if "cache-control" not in headers:
+                    headers["Cache-Control"] = policy
+            await send(message)
+
+        await self.__app(scope, receive, send_wrapper)
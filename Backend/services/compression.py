@@ -0,0 +1,201 @@
+from services.etag import encode_etag, matching_etag
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Optional, Protocol
+import brotli
+import zlib
+
+COMPRESSIBLE_TYPES = (
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+EXCLUDED_TYPES = ("text/event-stream",)
+
+# Preferred encodings first, used when the client weights them equally
+
+ENCODINGS = ["br", "gzip"]
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes, finish: bool) -> bytes: ...
+
+
+class GzipCompressor:
+    __compressor: "zlib._Compress"
+
+    def __init__(self, level: int):
+        self.__compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        return self.__compressor.compress(data) + self.__compressor.flush(
+            zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH
+        )
+
+
+class BrotliCompressor:
+    __compressor: brotli.Compressor
+
+    def __init__(self, quality: int):
+        self.__compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        return self.__compressor.process(data) + (
+            self.__compressor.finish() if finish else self.__compressor.flush()
+        )
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    weights: Dict[str, float] = {}
+
+    for candidate in accept_encoding.split(","):
+        name, _, parameters = candidate.strip().partition(";")
+        weight = 1.0
+        if parameters.strip().startswith("q="):
+            try:
+                weight = float(parameters.strip()[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    def weight(encoding: str) -> float:
+        return weights.get(encoding, weights.get("*", 0.0))
+
+    accepted = [encoding for encoding in ENCODINGS if weight(encoding) > 0]
+    return max(accepted, key=weight) if accepted else None
+
+
+def is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(
+        EXCLUDED_TYPES
+    )
+
+
+class CompressionResponder:
+    __compressor: Optional[Compressor]
+    __encoding: Optional[str]
+    __if_none_match: Optional[str]
+    __middleware: "CompressionMiddleware"
+    __send: Send
+    __start: Optional[Message]
+
+    def __init__(
+        self,
+        middleware: "CompressionMiddleware",
+        encoding: Optional[str],
+        if_none_match: Optional[str],
+        send: Send,
+    ):
+        self.__compressor = None
+        self.__encoding = encoding
+        self.__if_none_match = if_none_match
+        self.__middleware = middleware
+        self.__send = send
+        self.__start = None
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            # The start is held back until the first body chunk shows whether
+            # the response is worth compressing
+
+            self.__start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.__send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        start, self.__start = self.__start, None
+        if start is not None:
+            self.__compressor = self.__begin(start, body, more_body)
+
+        if self.__compressor:
+            message["body"] = self.__compressor.compress(body, finish=not more_body)
+
+        if start is not None:
+            if self.__compressor and not more_body:
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.__send(start)
+
+        await self.__send(message)
+
+    def __begin(
+        self, start: Message, body: bytes, more_body: bool
+    ) -> Optional[Compressor]:
+        headers = MutableHeaders(raw=start["headers"])
+
+        # A client revalidating a compressed copy holds that copy's ETag, and
+        # is told that's the one still current
+
+        if start["status"] == 304 and (etag := headers.get("etag")):
+            headers["ETag"] = matching_etag(self.__if_none_match, etag) or etag
+
+        if (
+            start["status"] < 200
+            or start["status"] in (204, 206, 304)
+            or "content-encoding" in headers
+            or not is_compressible(headers)
+        ):
+            return None
+
+        headers.add_vary_header("Accept-Encoding")
+
+        if not self.__encoding or (
+            not more_body and len(body) < self.__middleware.minimum_size
+        ):
+            return None
+
+        compressor = self.__middleware.compressor(self.__encoding)
+        headers["Content-Encoding"] = self.__encoding
+        del headers["Content-Length"]
+
+        if (etag := headers.get("etag")) and not etag.startswith("W/"):
+            headers["ETag"] = encode_etag(etag, self.__encoding)
+
+        return compressor
+
+
+class CompressionMiddleware:
+    __app: ASGIApp
+    __brotli_quality: int
+    __gzip_level: int
+    minimum_size: int
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.__app = app
+        self.__brotli_quality = brotli_quality
+        self.__gzip_level = gzip_level
+        self.minimum_size = minimum_size
+
+    def compressor(self, encoding: str) -> Compressor:
+        if encoding == "br":
+            return BrotliCompressor(self.__brotli_quality)
+        return GzipCompressor(self.__gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.__app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        responder = CompressionResponder(
+            self,
+            negotiate_encoding(headers.get("accept-encoding", "")),
+            headers.get("if-none-match"),
+            send,
+        )
+        await self.__app(scope, receive, responder.send)
@@ -1,20 +1,140 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from services.settings import get_settings
+from asyncio import gather
+from fastapi import Depends, Request
+from logging import getLogger, Logger
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase,
+)
+from pymongo import ASCENDING, IndexModel, TEXT
+from services.metrics import MongoCommandMetrics
+from services.settings import Settings
+from typing import Annotated, Dict, List
 
-# Connection
+REFERENCE_COLLECTIONS = ["genre", "tag", "type"]
+
+# Indexes
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "cart": [
+        IndexModel("label"),
+        IndexModel("audio"),
+        IndexModel("import_source", sparse=True),
+        IndexModel(
+            [("type", ASCENDING), ("valid_from", ASCENDING), ("valid_to", ASCENDING)]
+        ),
+        IndexModel(
+            [("genre", ASCENDING), ("valid_from", ASCENDING), ("valid_to", ASCENDING)]
+        ),
+        IndexModel(
+            [("tags", ASCENDING), ("valid_from", ASCENDING), ("valid_to", ASCENDING)]
+        ),
+        IndexModel([("valid_from", ASCENDING), ("valid_to", ASCENDING)]),
+        # Stemming and stop words are off as titles and artists come in any
+        # language and "The The" is a band
+        IndexModel(
+            [
+                ("title", TEXT),
+                ("artist", TEXT),
+                ("album", TEXT),
+                ("label", TEXT),
+                ("isrc", TEXT),
+                ("record_label", TEXT),
+            ],
+            name="cart_search",
+            default_language="none",
+            weights={
+                "title": 10,
+                "artist": 10,
+                "label": 8,
+                "isrc": 8,
+                "album": 4,
+                "record_label": 1,
+            },
+        ),
+    ],
+    "genre": [IndexModel("genre", unique=True)],
+    "tag": [IndexModel("tag", unique=True)],
+    "type": [IndexModel("cart_type", unique=True)],
+    "waveform": [IndexModel([("audio", ASCENDING), ("points", ASCENDING)])],
+}
+
+
+class Database:
+    __client: AsyncIOMotorClient
+    __database: AsyncIOMotorDatabase
+    __logger: Logger
+    __settings: Settings
+
+    def __init__(self, settings: Settings, logger: Logger = getLogger("uvicorn.error")):
+        self.__logger = logger
+        self.__settings = settings
+        self.__client = AsyncIOMotorClient(
+            settings.mongodb_url,
+            maxPoolSize=settings.mongodb_max_pool_size,
+            minPoolSize=settings.mongodb_min_pool_size,
+            event_listeners=[MongoCommandMetrics()],
+        )
+        self.__database = self.__client[settings.mongodb_database]
+
+    def get_collection(self, name: str) -> AsyncIOMotorCollection:
+        return self.__database.get_collection(name)
+
+    async def create_indexes(self):
+        for collection_name, indexes in INDEXES.items():
+            self.__logger.info("Creating indexes on %s", collection_name)
+            await self.get_collection(collection_name).create_indexes(indexes)
+
+    async def warm(self):
+        # Concurrent pings force the pool to open connections up front rather
+        # than on the first requests after a deploy
+
+        connections = max(self.__settings.mongodb_min_pool_size, 1)
+        self.__logger.info("Warming %d MongoDB connection(s)", connections)
+        await gather(*[self.__client.admin.command("ping") for _ in range(connections)])
+
+    def close(self):
+        self.__client.close()
+
+
+def get_database(request: Request) -> Database:
+    return request.app.state.database
 
-settings = get_settings()
-client = AsyncIOMotorClient(settings.mongodb_url)
-db = client.alldaydj
+
+DatabaseDep = Annotated[Database, Depends(get_database)]
 
 # Collections
 
-genre_collection = db.get_collection("genre")
-tag_collection = db.get_collection("tag")
-type_collection = db.get_collection("type")
 
-# Indexes
+def get_audio_collection(database: DatabaseDep) -> AsyncIOMotorCollection:
+    return database.get_collection("audio")
+
+
+def get_cart_collection(database: DatabaseDep) -> AsyncIOMotorCollection:
+    return database.get_collection("cart")
+
+
+def get_genre_collection(database: DatabaseDep) -> AsyncIOMotorCollection:
+    return database.get_collection("genre")
+
+
+def get_tag_collection(database: DatabaseDep) -> AsyncIOMotorCollection:
+    return database.get_collection("tag")
+
+
+def get_type_collection(database: DatabaseDep) -> AsyncIOMotorCollection:
+    return database.get_collection("type")
+
+
+def get_waveform_collection(database: DatabaseDep) -> AsyncIOMotorCollection:
+    return database.get_collection("waveform")
+
 
-genre_collection.create_index("genre", unique=True)
-tag_collection.create_index("tag", unique=True)
-type_collection.create_index("cart_type", unique=True)
+AudioCollectionDep = Annotated[AsyncIOMotorCollection, Depends(get_audio_collection)]
+CartCollectionDep = Annotated[AsyncIOMotorCollection, Depends(get_cart_collection)]
+GenreCollectionDep = Annotated[AsyncIOMotorCollection, Depends(get_genre_collection)]
+TagCollectionDep = Annotated[AsyncIOMotorCollection, Depends(get_tag_collection)]
+TypeCollectionDep = Annotated[AsyncIOMotorCollection, Depends(get_type_collection)]
+WaveformCollectionDep = Annotated[
+    AsyncIOMotorCollection, Depends(get_waveform_collection)
+]
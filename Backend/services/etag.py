@@ -0,0 +1,36 @@
+from fastapi import Request
+from hashlib import sha256
+from typing import Optional
+
+
+def make_etag(version: int, request: Request) -> str:
+    variant = sha256(f"{request.url.path}?{request.url.query}".encode()).hexdigest()
+    return f'"{version}-{variant[:16]}"'
+
+
+def encode_etag(etag: str, encoding: str) -> str:
+    # Compressed bytes are a representation of their own, so they get their
+    # own strong validator with the content coding appended
+
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def matching_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    if not if_none_match:
+        return None
+
+    if if_none_match.strip() == "*":
+        return etag
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == etag or (
+            candidate.startswith(f"{etag[:-1]}-") and candidate.endswith('"')
+        ):
+            return candidate
+
+    return None
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    return matching_etag(request.headers.get("if-none-match"), etag) is not None
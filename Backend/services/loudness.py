@@ -0,0 +1,193 @@
+from services.waveform import build_levels, PeakAccumulator, WaveformLevel
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
+import wave
+
+# Audio is measured in 100 ms blocks; four of them make the 400 ms gating
+# window from ITU-R BS.1770 with its 75% overlap
+
+BLOCK_SECONDS = 0.1
+GATE_BLOCKS = 4
+READ_BLOCKS = 100
+
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+LOUDNESS_OFFSET = -0.691
+
+
+def _biquad_response(b: List[float], a: List[float], z: np.ndarray) -> np.ndarray:
+    return (b[0] + b[1] / z + b[2] / z**2) / (a[0] + a[1] / z + a[2] / z**2)
+
+
+def k_weighting(rate: int, block_frames: int) -> np.ndarray:
+    # The BS.1770 pre-filter and high-pass, designed for the file's sample
+    # rate as in libebur128, as a power response over the block's FFT bins
+
+    k = np.tan(np.pi * 1681.974450955533 / rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh**0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf_b = [
+        (vh + vb * k / q + k * k) / a0,
+        2 * (k * k - vh) / a0,
+        (vh - vb * k / q + k * k) / a0,
+    ]
+    shelf_a = [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    k = np.tan(np.pi * 38.13547087602444 / rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    high_pass_b = [1.0, -2.0, 1.0]
+    high_pass_a = [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    z = np.exp(2j * np.pi * np.fft.rfftfreq(block_frames))
+    response = _biquad_response(shelf_b, shelf_a, z) * _biquad_response(
+        high_pass_b, high_pass_a, z
+    )
+    return np.abs(response) ** 2
+
+
+def decode(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    if sample_width == 1:
+        samples = (np.frombuffer(data, np.uint8).astype(np.float64) - 128) / 128
+    elif sample_width == 3:
+        raw = np.frombuffer(data, np.uint8).reshape(-1, 3).astype(np.int32)
+        signed = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        samples = np.where(signed >= 1 << 23, signed - (1 << 24), signed) / 2.0**23
+    else:
+        dtype = {2: "<i2", 4: "<i4"}[sample_width]
+        samples = np.frombuffer(data, dtype) / 2.0 ** (8 * sample_width - 1)
+    return samples.reshape(-1, channels)
+
+
+def read_samples(file: wave.Wave_read, block_frames: int) -> Iterator[np.ndarray]:
+    # Whole WAVs can run to hundreds of MB, so they're decoded a few seconds
+    # at a time
+
+    while data := file.readframes(block_frames * READ_BLOCKS):
+        yield decode(data, file.getsampwidth(), file.getnchannels())
+
+
+def to_blocks(samples: np.ndarray, block_frames: int) -> np.ndarray:
+    padding = -len(samples) % block_frames
+    if padding:
+        samples = np.concatenate([samples, np.zeros((padding, samples.shape[1]))])
+    return samples.reshape(-1, block_frames, samples.shape[1])
+
+
+def measure_blocks(
+    blocks: np.ndarray, weighting: np.ndarray, threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    block_frames = blocks.shape[1]
+
+    # Parseval's theorem gives each block's K-weighted mean square straight
+    # from its spectrum, which stands in for running the IIR filter
+
+    bins = np.full(weighting.shape, 2.0)
+    bins[0] = 1.0
+    if block_frames % 2 == 0:
+        bins[-1] = 1.0
+    spectrum = np.abs(np.fft.rfft(blocks, axis=1)) ** 2
+    power = np.einsum("bfc,f->b", spectrum, bins * weighting) / block_frames**2
+
+    magnitude = np.abs(blocks).max(axis=2)
+    loud = magnitude > threshold
+    first = np.where(loud.any(axis=1), loud.argmax(axis=1), -1)
+    last = np.where(
+        loud.any(axis=1), block_frames - 1 - loud[:, ::-1].argmax(axis=1), -1
+    )
+
+    return power, magnitude.max(axis=1), first, last
+
+
+def _decibels(value: float) -> Optional[float]:
+    return round(float(20 * np.log10(value)), 2) if value > 0 else None
+
+
+def integrated_loudness(power: np.ndarray) -> Tuple[Optional[float], np.ndarray]:
+    if len(power) < GATE_BLOCKS:
+        return None, np.array([])
+
+    gates = np.convolve(power, np.ones(GATE_BLOCKS) / GATE_BLOCKS, "valid")
+    with np.errstate(divide="ignore"):
+        momentary = LOUDNESS_OFFSET + 10 * np.log10(gates)
+
+    audible = momentary > ABSOLUTE_GATE
+    if not audible.any():
+        return None, momentary
+
+    relative = LOUDNESS_OFFSET + 10 * np.log10(gates[audible].mean()) + RELATIVE_GATE
+    gated = gates[audible & (momentary > relative)]
+    return LOUDNESS_OFFSET + 10 * np.log10(gated.mean()), momentary
+
+
+class Analysis(NamedTuple):
+    summary: Dict
+    waveform: List[WaveformLevel]
+
+
+def analyse(path: str, silence_threshold: float, cue_threshold: float) -> Analysis:
+    with wave.open(path, "rb") as file:
+        rate = file.getframerate()
+        channels = file.getnchannels()
+        frames = file.getnframes()
+        block_frames = max(int(round(rate * BLOCK_SECONDS)), 1)
+        weighting = k_weighting(rate, block_frames)
+        threshold = 10 ** (silence_threshold / 20)
+
+        measured = []
+        peaks = PeakAccumulator()
+        read = 0
+        for samples in read_samples(file, block_frames):
+            read += len(samples)
+            measured.append(
+                measure_blocks(to_blocks(samples, block_frames), weighting, threshold)
+            )
+            peaks.add(samples)
+
+    power, peak, first, last = (
+        (
+            np.concatenate([measures[index] for measures in measured])
+            if measured
+            else np.array([])
+        )
+        for index in range(4)
+    )
+
+    def seconds(frame: int) -> float:
+        return round(float(frame) / rate, 3)
+
+    result = {
+        "duration": seconds(frames),
+        "sample_rate": rate,
+        "channels": channels,
+        "loudness": None,
+        "peak": _decibels(peak.max()) if len(peak) else None,
+        "trim_start": None,
+        "trim_end": None,
+        "intro": None,
+        "outro": None,
+    }
+
+    sounding = np.flatnonzero(first >= 0)
+    if len(sounding):
+        result["trim_start"] = seconds(sounding[0] * block_frames + first[sounding[0]])
+        result["trim_end"] = seconds(
+            min(sounding[-1] * block_frames + last[sounding[-1]] + 1, frames)
+        )
+
+    # The last block is padded with silence when the file stops part way
+    # through it, so only complete blocks are gated. Intro and outro mark
+    # where the momentary loudness first reaches and last holds within
+    # cue_threshold LU of the programme loudness
+
+    loudness, momentary = integrated_loudness(power[: read // block_frames])
+    if loudness is not None:
+        result["loudness"] = round(float(loudness), 2)
+        cued = np.flatnonzero(momentary >= loudness - cue_threshold)
+        if len(cued):
+            result["intro"] = seconds((cued[0] + GATE_BLOCKS) * block_frames)
+            result["outro"] = seconds(min(cued[-1] * block_frames, frames))
+
+    return Analysis(result, build_levels(*peaks.finish()))
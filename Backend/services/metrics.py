@@ -0,0 +1,131 @@
+from prometheus_client import Counter, Histogram
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Tuple, Union
+
+FAST_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+REQUEST_DURATION = Histogram(
+    "alldaydj_http_request_duration_seconds",
+    "HTTP request latency",
+    ["router", "method", "route", "status"],
+)
+
+CommandEvent = Union[
+    monitoring.CommandStartedEvent,
+    monitoring.CommandSucceededEvent,
+    monitoring.CommandFailedEvent,
+]
+
+MONGODB_COMMAND_DURATION = Histogram(
+    "alldaydj_mongodb_command_duration_seconds",
+    "MongoDB command latency",
+    ["collection", "command", "outcome"],
+    buckets=FAST_BUCKETS,
+)
+
+JWKS_FETCHES = Counter(
+    "alldaydj_jwks_fetches_total",
+    "JWKS fetches from the identity provider",
+    ["outcome"],
+)
+
+TOKEN_VERIFICATION_DURATION = Histogram(
+    "alldaydj_token_verification_duration_seconds",
+    "Bearer token verification latency",
+    ["cache", "outcome"],
+    buckets=FAST_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    __app: ASGIApp
+
+    def __init__(self, app: ASGIApp):
+        self.__app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.__app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        start = perf_counter()
+        try:
+            await self.__app(scope, receive, send_wrapper)
+        finally:
+            # Routes are labelled by their path template and first tag, which
+            # keeps the label sets bounded however many documents are hit
+
+            route = scope.get("route")
+            tags = getattr(route, "tags", None)
+            REQUEST_DURATION.labels(
+                router=tags[0] if tags else "none",
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status[0],
+            ).observe(perf_counter() - start)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    __lock: Lock
+    __pending: Dict[Tuple, Tuple[str, str]]
+
+    def __init__(self):
+        self.__lock = Lock()
+        self.__pending = {}
+
+    @staticmethod
+    def __key(event: CommandEvent) -> Tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        # Only the started event carries the command document, so the
+        # collection is held until the command completes
+
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+
+        with self.__lock:
+            self.__pending[self.__key(event)] = (
+                target if isinstance(target, str) else "none",
+                event.command_name,
+            )
+
+    def __observe(self, event: CommandEvent, outcome: str):
+        with self.__lock:
+            collection, command = self.__pending.pop(
+                self.__key(event), ("none", event.command_name)
+            )
+
+        MONGODB_COMMAND_DURATION.labels(
+            collection=collection, command=command, outcome=outcome
+        ).observe(event.duration_micros / 1_000_000)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self.__observe(event, "success")
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self.__observe(event, "failure")
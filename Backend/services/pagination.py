@@ -0,0 +1,102 @@
+from bisect import bisect_right
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Query, status
+from fastapi_pagination import create_page
+from fastapi_pagination.cursor import CursorPage, CursorParams, CursorRawParams
+from motor.motor_asyncio import AsyncIOMotorCollection
+from typing import Any, Dict, List, Optional
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor value"
+    )
+
+
+class KeysetParams(CursorParams):
+    include_total: bool = Query(False, description="Include the total item count")
+
+    def to_raw_params(self) -> CursorRawParams:
+        # Valid base64 that doesn't decode to text gets past the library's own
+        # check, so it's turned away here like any other bad cursor
+
+        try:
+            return super().to_raw_params()
+        except UnicodeDecodeError:
+            raise _invalid_cursor()
+
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[ObjectId]:
+    if not cursor:
+        return None
+
+    try:
+        return ObjectId(cursor)
+    except InvalidId:
+        raise _invalid_cursor()
+
+
+def _create_keyset_page(
+    items: List[Dict], params: KeysetParams, total: Optional[int]
+) -> CursorPage:
+    raw_params = params.to_raw_params()
+
+    next_cursor = None
+    if raw_params.size and len(items) > raw_params.size:
+        items = items[: raw_params.size]
+        next_cursor = str(items[-1]["_id"])
+
+    return create_page(
+        items,
+        total=total,
+        params=params,
+        current=raw_params.cursor,
+        next_=next_cursor,
+    )
+
+
+async def paginate_keyset(
+    collection: AsyncIOMotorCollection,
+    params: KeysetParams,
+    query_filter: Optional[Dict[str, Any]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> CursorPage:
+    query_filter = query_filter or {}
+    raw_params = params.to_raw_params()
+
+    # Pages are walked in _id order, so each page is an index seek from the
+    # last _id seen rather than a skip over everything before it
+
+    page_filter = dict(query_filter)
+    if after := _parse_cursor(raw_params.cursor):
+        page_filter["_id"] = {"$gt": after}
+
+    cursor = (
+        collection.find(page_filter, projection)
+        .sort("_id", 1)
+        .limit(raw_params.size + 1)
+    )
+    items = await cursor.to_list(length=raw_params.size + 1)
+
+    total = None
+    if params.include_total:
+        if query_filter:
+            total = await collection.count_documents(query_filter)
+        else:
+            total = await collection.estimated_document_count()
+
+    return _create_keyset_page(items, params, total)
+
+
+def paginate_keyset_sequence(documents: List[Dict], params: KeysetParams) -> CursorPage:
+    raw_params = params.to_raw_params()
+
+    start = 0
+    if after := _parse_cursor(raw_params.cursor):
+        start = bisect_right(documents, after, key=lambda document: document["_id"])
+
+    items = documents[start : start + raw_params.size + 1]
+    total = len(documents) if params.include_total else None
+
+    return _create_keyset_page(items, params, total)
@@ -0,0 +1,36 @@
+from errors.exceptions import RangeNotSatisfiableException
+from typing import Optional, Tuple
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    # Only single byte ranges are served partially; anything malformed or
+    # asking for several ranges gets the whole file, which RFC 9110 allows
+
+    if not header:
+        return None
+
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    first, separator, last = ranges.strip().partition("-")
+    if not separator:
+        return None
+
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiableException(size)
+            return max(size - suffix, 0), size - 1
+
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if last and start > end:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableException(size)
+    return start, min(end, size - 1)
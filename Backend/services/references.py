@@ -0,0 +1,220 @@
+from asyncio import gather
+from bson import ObjectId
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateMany
+from services.cache import CachesDep
+from services.database import Database, DatabaseDep
+from services.repository import RepositoryCache, RepositoryHooks
+from services.settings import get_settings, Settings
+from services.versions import bump_version
+from typing import Annotated, Dict, Iterable, List, NamedTuple, Optional, Set
+
+
+class Reference(NamedTuple):
+    field: str
+    collection: str
+    name: str
+    many: bool
+
+
+CART_REFERENCES: Dict[str, Reference] = {
+    "type": Reference("type", "type", "cart_type", many=False),
+    "genre": Reference("genre", "genre", "genre", many=False),
+    "tag": Reference("tags", "tag", "tag", many=True),
+}
+
+Found = Dict[ObjectId, Dict]
+
+
+def _referenced_ids(reference: Reference, documents: Iterable[Dict]) -> Set[ObjectId]:
+    ids = set()
+    for document in documents:
+        value = document.get(reference.field)
+        if reference.many:
+            ids.update(value or [])
+        elif value:
+            ids.add(value)
+    return ids
+
+
+def _summary(reference: Reference, document: Dict) -> Dict:
+    return {"_id": document["_id"], reference.name: document.get(reference.name)}
+
+
+class ReferenceResolver:
+    __caches: Dict[str, RepositoryCache]
+    __database: Database
+
+    def __init__(self, database: Database, caches: Dict[str, RepositoryCache]):
+        self.__caches = caches
+        self.__database = database
+
+    async def __fetch(self, reference: Reference, ids: Set[ObjectId]) -> Found:
+        if not ids:
+            return {}
+
+        if cache := self.__caches.get(reference.collection):
+            found = {}
+            for object_id in ids:
+                if document := await cache.get(object_id):
+                    found[object_id] = _summary(reference, document)
+            return found
+
+        cursor = self.__database.get_collection(reference.collection).find(
+            {"_id": {"$in": list(ids)}}, {reference.name: 1}
+        )
+        return {document["_id"]: document async for document in cursor}
+
+    async def fetch(self, documents: List[Dict]) -> Dict[str, Found]:
+        # One query per referenced collection covers the whole batch, and the
+        # collections are read concurrently
+
+        references = list(CART_REFERENCES.values())
+        found = await gather(
+            *[
+                self.__fetch(reference, _referenced_ids(reference, documents))
+                for reference in references
+            ]
+        )
+        return {
+            reference.field: documents
+            for reference, documents in zip(references, found)
+        }
+
+    async def fetch_analyses(self, documents: List[Dict]) -> Found:
+        ids = {document["audio"] for document in documents if document.get("audio")}
+        if not ids:
+            return {}
+
+        cursor = self.__database.get_collection("audio").find(
+            {"_id": {"$in": list(ids)}}, {"analysis": 1}
+        )
+        return {document["_id"]: document.get("analysis") async for document in cursor}
+
+    @staticmethod
+    def embed(document: Dict, found: Dict[str, Found]) -> Dict:
+        references = {}
+        for reference in CART_REFERENCES.values():
+            documents = found[reference.field]
+            value = document.get(reference.field)
+            if reference.many:
+                references[reference.field] = [
+                    documents[object_id]
+                    for object_id in value or []
+                    if object_id in documents
+                ]
+            else:
+                references[reference.field] = documents.get(value)
+        return references
+
+
+class CartReferenceHooks(RepositoryHooks):
+    __resolver: ReferenceResolver
+    __snapshots: bool
+
+    def __init__(self, resolver: ReferenceResolver, snapshots: bool):
+        self.__resolver = resolver
+        self.__snapshots = snapshots
+        self.fields = ["references"] if snapshots else []
+
+    async def prepare(self, documents: List[Dict]):
+        # Analysis belongs to the audio, so carts pick up whatever has been
+        # worked out for theirs whenever it's set or changed
+
+        analyses = await self.__resolver.fetch_analyses(documents)
+        for document in documents:
+            document["analysis"] = analyses.get(document.get("audio"))
+
+        if not self.__snapshots:
+            return
+
+        found = await self.__resolver.fetch(documents)
+        for document in documents:
+            document["references"] = self.__resolver.embed(document, found)
+
+    async def resolve(self, documents: List[Dict]) -> List[Dict]:
+        # Carts written with a snapshot are served from it, anything older is
+        # resolved in a single batch
+
+        def snapshot(document: Dict) -> Optional[Dict]:
+            return document.get("references") if self.__snapshots else None
+
+        pending = [document for document in documents if not snapshot(document)]
+        found = await self.__resolver.fetch(pending) if pending else {}
+
+        return [
+            {
+                **document,
+                **(snapshot(document) or self.__resolver.embed(document, found)),
+            }
+            for document in documents
+        ]
+
+
+class CartReferenceSync(RepositoryHooks):
+    __carts: AsyncIOMotorCollection
+    __reference: Reference
+    __snapshots: bool
+
+    def __init__(
+        self, carts: AsyncIOMotorCollection, reference: Reference, snapshots: bool
+    ):
+        self.__carts = carts
+        self.__reference = reference
+        self.__snapshots = snapshots
+
+    def __update(self, object_id: ObjectId, snapshot: Optional[Dict]) -> UpdateMany:
+        field = self.__reference.field
+        query = {field: object_id, "references": {"$exists": True}}
+
+        if not self.__reference.many:
+            return UpdateMany(query, {"$set": {f"references.{field}": snapshot}})
+        if snapshot is None:
+            return UpdateMany(
+                query, {"$pull": {f"references.{field}": {"_id": object_id}}}
+            )
+        return UpdateMany(
+            {f"references.{field}._id": object_id},
+            {"$set": {f"references.{field}.$[reference]": snapshot}},
+            array_filters=[{"reference._id": object_id}],
+        )
+
+    async def changed(self, updated: List[Dict], deleted: List[ObjectId]):
+        if self.__snapshots:
+            writes = [
+                self.__update(document["_id"], _summary(self.__reference, document))
+                for document in updated
+            ] + [self.__update(object_id, None) for object_id in deleted]
+            await self.__carts.bulk_write(writes, ordered=False)
+
+        # Carts embed what they reference, so their representation and ETag
+        # change along with it
+
+        await bump_version(self.__carts)
+
+
+def get_cart_hooks(
+    database: DatabaseDep,
+    caches: CachesDep,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> CartReferenceHooks:
+    return CartReferenceHooks(
+        ReferenceResolver(database, caches), settings.cart_reference_snapshots
+    )
+
+
+def reference_sync(reference: Reference):
+    def get_reference_sync(
+        database: DatabaseDep, settings: Annotated[Settings, Depends(get_settings)]
+    ) -> CartReferenceSync:
+        return CartReferenceSync(
+            database.get_collection("cart"),
+            reference,
+            settings.cart_reference_snapshots,
+        )
+
+    return get_reference_sync
+
+
+CartHooksDep = Annotated[CartReferenceHooks, Depends(get_cart_hooks)]
@@ -0,0 +1,200 @@
+from abc import ABC, abstractmethod
+from bson import ObjectId
+from bson.errors import InvalidId
+from errors.exceptions import NotFoundException
+from fastapi_pagination import Page, paginate as paginate_sequence
+from fastapi_pagination.bases import AbstractPage
+from fastapi_pagination.cursor import CursorPage
+from fastapi_pagination.ext.motor import paginate
+from models.bulk import BulkItemStatus, BulkRequest, BulkResponse
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+from services.bulk import bulk_write_operations
+from services.pagination import (
+    KeysetParams,
+    paginate_keyset,
+    paginate_keyset_sequence,
+)
+from services.versions import bump_version, get_version
+from typing import Dict, Generic, List, Optional, Type, TypeVar
+
+T = TypeVar("T", bound=BaseModel)
+U = TypeVar("U", bound=BaseModel)
+
+
+class RepositoryCache(ABC):
+    @abstractmethod
+    async def get(self, object_id: ObjectId) -> Optional[Dict]:
+        pass
+
+    @abstractmethod
+    async def list(self) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    async def version(self) -> int:
+        pass
+
+    @abstractmethod
+    def invalidate(self):
+        pass
+
+
+class RepositoryHooks:
+    fields: List[str] = []
+
+    async def prepare(self, documents: List[Dict]):
+        pass
+
+    async def resolve(self, documents: List[Dict]) -> List[Dict]:
+        return documents
+
+    async def changed(self, updated: List[Dict], deleted: List[ObjectId]):
+        pass
+
+
+class Repository(Generic[T, U]):
+    __cache: Optional[RepositoryCache]
+    __collection: AsyncIOMotorCollection
+    __hooks: RepositoryHooks
+    __name: str
+    __projection: Dict[str, int]
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        model: Type[T],
+        name: str,
+        cache: Optional[RepositoryCache] = None,
+        hooks: Optional[RepositoryHooks] = None,
+    ):
+        self.__cache = cache
+        self.__collection = collection
+        self.__hooks = hooks or RepositoryHooks()
+        self.__name = name
+        self.__projection = {
+            field.alias or field_name: 1
+            for field_name, field in model.model_fields.items()
+        }
+        self.__projection.update({field: 1 for field in self.__hooks.fields})
+
+    def parse_id(self, id: str) -> ObjectId:
+        try:
+            return ObjectId(id)
+        except (InvalidId, TypeError):
+            raise NotFoundException(self.__name, id)
+
+    async def get(self, id: str) -> Dict:
+        object_id = self.parse_id(id)
+
+        # Cached documents go through the same hooks as ones read from the
+        # collection, so a hit and a miss return the same shape
+
+        document = None
+        if self.__cache:
+            document = await self.__cache.get(object_id)
+        if not document:
+            document = await self.__collection.find_one(
+                {"_id": object_id}, self.__projection
+            )
+        if not document:
+            raise NotFoundException(self.__name, id)
+        return (await self.__hooks.resolve([document]))[0]
+
+    async def version(self) -> int:
+        if self.__cache:
+            return await self.__cache.version()
+
+        return await get_version(self.__collection)
+
+    async def list(self) -> Page[T]:
+        if self.__cache:
+            page = paginate_sequence(await self.__cache.list(), safe=True)
+        else:
+            page = await paginate(self.__collection, projection=self.__projection)
+
+        return await self.resolve_page(page)
+
+    async def list_by_cursor(self, params: KeysetParams) -> CursorPage[T]:
+        if self.__cache:
+            page = paginate_keyset_sequence(await self.__cache.list(), params)
+        else:
+            page = await paginate_keyset(
+                self.__collection, params, projection=self.__projection
+            )
+
+        return await self.resolve_page(page)
+
+    async def resolve_page(self, page: AbstractPage) -> AbstractPage:
+        page.items = await self.__hooks.resolve(list(page.items))
+        return page
+
+    async def create(self, data: U) -> Dict:
+        document = data.model_dump(by_alias=True)
+        await self.__hooks.prepare([document])
+        result = await self.__collection.insert_one(document)
+        await self.__changed()
+        document = {"_id": result.inserted_id, **document}
+        return (await self.__hooks.resolve([document]))[0]
+
+    async def update(self, id: str, data: U) -> Dict:
+        fields = data.model_dump(by_alias=True)
+        await self.__hooks.prepare([fields])
+        document = await self.__collection.find_one_and_update(
+            {"_id": self.parse_id(id)},
+            {"$set": fields},
+            projection=self.__projection,
+            return_document=ReturnDocument.AFTER,
+        )
+        if not document:
+            raise NotFoundException(self.__name, id)
+        await self.__changed(updated=[document])
+        return (await self.__hooks.resolve([document]))[0]
+
+    async def delete(self, id: str):
+        object_id = self.parse_id(id)
+        result = await self.__collection.delete_one({"_id": object_id})
+        if not result.deleted_count == 1:
+            raise NotFoundException(self.__name, id)
+        await self.__changed(deleted=[object_id])
+
+    async def bulk(self, request: BulkRequest[U]) -> BulkResponse[T]:
+        response = await bulk_write_operations(
+            self.__collection, request, prepare=self.__hooks.prepare
+        )
+
+        results = [result for result in response.results if result.item]
+        items = await self.__hooks.resolve([result.item for result in results])
+        for result, item in zip(results, items):
+            result.item = item
+
+        if response.created or response.updated or response.deleted:
+            await self.__changed(
+                updated=[
+                    result.item
+                    for result in response.results
+                    if result.status is BulkItemStatus.Updated
+                ],
+                deleted=[
+                    ObjectId(result.id)
+                    for result in response.results
+                    if result.status is BulkItemStatus.Deleted
+                ],
+            )
+        return response
+
+    async def __changed(
+        self,
+        updated: Optional[List[Dict]] = None,
+        deleted: Optional[List[ObjectId]] = None,
+    ):
+        # The version is bumped after the write and before the cache is
+        # dropped, so a reload never pairs new documents with an old version
+
+        await bump_version(self.__collection)
+        if self.__cache:
+            self.__cache.invalidate()
+
+        if updated or deleted:
+            await self.__hooks.changed(updated or [], deleted or [])
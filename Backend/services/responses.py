@@ -0,0 +1,78 @@
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse
+from fastapi_pagination.bases import AbstractPage
+from pydantic import BaseModel
+from typing import Any, Dict, get_args, get_origin, List, Mapping, Optional, Tuple, Type
+import orjson
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class MongoJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_encode)
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    # Unwraps Optional[Model] and List[Model] so embedded documents are
+    # serialized with their own field names
+
+    many = False
+    while (origin := get_origin(annotation)) is not None:
+        arguments = [
+            argument for argument in get_args(annotation) if argument is not type(None)
+        ]
+        if len(arguments) != 1:
+            return None, False
+        many = many or origin in (list, List)
+        annotation = arguments[0]
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, many
+    return None, False
+
+
+class DocumentSerializer:
+    __fields: List[Tuple[str, str, Any, Optional["DocumentSerializer"], bool]]
+
+    def __init__(self, model: Type[BaseModel]):
+        self.__fields = []
+        for field_name, field in model.model_fields.items():
+            nested, many = _nested_model(field.annotation)
+            self.__fields.append(
+                (
+                    field_name,
+                    field.alias or field_name,
+                    field.get_default(call_default_factory=True),
+                    DocumentSerializer(nested) if nested else None,
+                    many,
+                )
+            )
+
+    def serialize(self, document: Dict) -> Dict:
+        serialized = {}
+        for field_name, key, default, nested, many in self.__fields:
+            value = document.get(key, default)
+            if nested and value is not None:
+                value = (
+                    [nested.serialize(item) for item in value]
+                    if many
+                    else nested.serialize(value)
+                )
+            serialized[field_name] = value
+        return serialized
+
+    def serialize_page(self, page: AbstractPage) -> Dict:
+        return {
+            **dict(page),
+            "items": [self.serialize(document) for document in page.items],
+        }
+
+    def page_response(
+        self, page: AbstractPage, headers: Optional[Mapping[str, str]] = None
+    ) -> MongoJSONResponse:
+        return MongoJSONResponse(self.serialize_page(page), headers=headers)
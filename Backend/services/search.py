@@ -0,0 +1,47 @@
+from bson import ObjectId
+from datetime import datetime
+from fastapi_pagination import Page
+from fastapi_pagination.ext.motor import paginate
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING
+from typing import Any, Dict, Optional
+
+TEXT_SCORE = {"$meta": "textScore"}
+
+
+def build_cart_filter(
+    query: str,
+    type: Optional[ObjectId] = None,
+    genre: Optional[ObjectId] = None,
+    tag: Optional[ObjectId] = None,
+    valid_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    query_filter: Dict[str, Any] = {"$text": {"$search": query}}
+
+    if type:
+        query_filter["type"] = type
+    if genre:
+        query_filter["genre"] = genre
+    if tag:
+        query_filter["tags"] = tag
+    if valid_at:
+        query_filter["valid_from"] = {"$lte": valid_at}
+        query_filter["valid_to"] = {"$gte": valid_at}
+
+    return query_filter
+
+
+async def search_collection(
+    collection: AsyncIOMotorCollection,
+    query_filter: Dict[str, Any],
+    projection: Dict[str, Any],
+) -> Page:
+    # Ties on relevance are broken by _id so paging through equally ranked
+    # results is stable
+
+    return await paginate(
+        collection,
+        query_filter,
+        sort=[("score", TEXT_SCORE), ("_id", ASCENDING)],
+        projection={**projection, "score": TEXT_SCORE},
+    )
@@ -1,19 +1,160 @@
+from asyncio import create_task, Lock, Task
+from collections import OrderedDict
 from errors.exceptions import UnauthenticatedException, UnauthorizedException
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, SecurityScopes
-from jwt import decode, PyJWKClient
-from jwt.exceptions import DecodeError, PyJWKClientError
+from hashlib import sha256
+from httpx import AsyncClient, HTTPError
+from jwt import decode, get_unverified_header, PyJWK, PyJWKSet
+from jwt.exceptions import DecodeError, PyJWKClientError, PyJWTError
 from logging import getLogger, Logger
+from services.metrics import JWKS_FETCHES, TOKEN_VERIFICATION_DURATION
 from services.settings import get_settings, Settings
-from typing import List, Optional
+from time import monotonic, perf_counter, time
+from typing import Annotated, Dict, List, Optional, Tuple
 
 token_auth_scheme = HTTPBearer()
 
 
+class JwksKeyCache:
+    __client: AsyncClient
+    __expires_at: float
+    __jwks_url: str
+    __keys: Dict[str, PyJWK]
+    __last_fetch: float
+    __lock: Lock
+    __logger: Logger
+    __min_refresh_interval: int
+    __refresh_task: Optional[Task]
+    __ttl: int
+
+    def __init__(
+        self,
+        jwks_url: str,
+        ttl: int,
+        min_refresh_interval: int,
+        logger: Logger = getLogger("uvicorn.error"),
+        client: Optional[AsyncClient] = None,
+    ):
+        self.__client = client or AsyncClient(timeout=10)
+        self.__expires_at = 0
+        self.__jwks_url = jwks_url
+        self.__keys = {}
+        self.__last_fetch = float("-inf")
+        self.__lock = Lock()
+        self.__logger = logger
+        self.__min_refresh_interval = min_refresh_interval
+        self.__refresh_task = None
+        self.__ttl = ttl
+
+    async def get_signing_key(self, kid: Optional[str]):
+        if not kid:
+            raise PyJWKClientError("Token does not specify a key ID")
+
+        if kid in self.__keys:
+            if monotonic() >= self.__expires_at:
+                self.__schedule_refresh()
+            return self.__keys[kid].key
+
+        # Unknown key IDs could be a rotation, but are rate limited so bogus
+        # tokens can't hammer the identity provider. The limit holds with no
+        # keys cached too, so an outage fails requests fast in between fetches
+        # rather than sending every one of them to the identity provider
+
+        if monotonic() - self.__last_fetch >= self.__min_refresh_interval:
+            await self.refresh()
+
+        if kid not in self.__keys:
+            raise PyJWKClientError(
+                f'Unable to find a signing key that matches: "{kid}"'
+            )
+
+        return self.__keys[kid].key
+
+    def __schedule_refresh(self):
+        if self.__refresh_task and not self.__refresh_task.done():
+            return
+
+        self.__refresh_task = create_task(self.refresh())
+
+    async def refresh(self):
+        requested_at = monotonic()
+
+        async with self.__lock:
+            if self.__last_fetch >= requested_at:
+                return
+
+            self.__logger.info("Fetching JWKS from %s", self.__jwks_url)
+
+            try:
+                response = await self.__client.get(self.__jwks_url)
+                response.raise_for_status()
+                jwk_set = PyJWKSet.from_dict(response.json())
+            except (HTTPError, PyJWTError, ValueError) as error:
+                self.__logger.error("Failed to fetch JWKS: %s", error)
+                JWKS_FETCHES.labels(outcome="failure").inc()
+                return
+            finally:
+                self.__last_fetch = monotonic()
+
+            self.__keys = {
+                key.key_id: key
+                for key in jwk_set.keys
+                if key.key_id and key.public_key_use in ["sig", None]
+            }
+            self.__expires_at = monotonic() + self.__ttl
+            JWKS_FETCHES.labels(outcome="success").inc()
+
+    async def close(self):
+        if self.__refresh_task and not self.__refresh_task.done():
+            self.__refresh_task.cancel()
+        await self.__client.aclose()
+
+
+class VerifiedTokenCache:
+    __entries: OrderedDict[bytes, Tuple[Dict, float]]
+    __maxsize: int
+
+    def __init__(self, maxsize: int):
+        self.__entries = OrderedDict()
+        self.__maxsize = maxsize
+
+    @staticmethod
+    def __hash(token: str) -> bytes:
+        return sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        key = self.__hash(token)
+        entry = self.__entries.get(key)
+
+        if entry is None:
+            return None
+
+        payload, expires_at = entry
+        if time() >= expires_at:
+            del self.__entries[key]
+            return None
+
+        self.__entries.move_to_end(key)
+        return dict(payload)
+
+    def put(self, token: str, payload: Dict):
+        if self.__maxsize <= 0 or "exp" not in payload:
+            return
+
+        key = self.__hash(token)
+        self.__entries[key] = (dict(payload), float(payload["exp"]))
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__maxsize:
+            self.__entries.popitem(last=False)
+
+
 class TokenVerifier:
-    __client: PyJWKClient
+    __key_cache: JwksKeyCache
     __logger: Logger
     __settings: Settings
+    __token_cache: VerifiedTokenCache
 
     def __init__(self, logger: Logger = getLogger("uvicorn.error")):
         self.__logger = logger
@@ -22,7 +163,13 @@ class TokenVerifier:
         jwks_url = f"https://{self.__settings.jwt_domain}/.well-known/jwks.json"
         self.__logger.info("Set JWKS URL to %s", jwks_url)
 
-        self.__client = PyJWKClient(jwks_url)
+        self.__key_cache = JwksKeyCache(
+            jwks_url,
+            ttl=self.__settings.jwks_cache_ttl,
+            min_refresh_interval=self.__settings.jwks_min_refresh_interval,
+            logger=self.__logger,
+        )
+        self.__token_cache = VerifiedTokenCache(self.__settings.token_cache_size)
 
     @staticmethod
     def __check_claims(payload, claim_name: str, expected_values: List[str]):
@@ -38,24 +185,55 @@ class TokenVerifier:
             if expected_value not in payload_claim:
                 raise UnauthorizedException(detail=f"Missing {claim_name} scope")
 
+    async def warm(self):
+        await self.__key_cache.refresh()
+
+    async def close(self):
+        await self.__key_cache.close()
+
     async def verify(
         self,
         security_scopes: SecurityScopes,
-        token: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer()),
+        token: Optional[HTTPAuthorizationCredentials],
     ):
         if not token:
             raise UnauthenticatedException()
 
+        # The cache label is how the token cache's hit rate is observed, from
+        # the sample counts of each label
+
+        start = perf_counter()
+        cache = "hit"
+        outcome = "failure"
+
+        try:
+            if (payload := self.__token_cache.get(token.credentials)) is None:
+                cache = "miss"
+                payload = await self.__decode(token.credentials)
+                self.__token_cache.put(token.credentials, payload)
+            outcome = "success"
+        finally:
+            TOKEN_VERIFICATION_DURATION.labels(cache=cache, outcome=outcome).observe(
+                perf_counter() - start
+            )
+
+        if len(security_scopes.scopes) > 0:
+            self.__check_claims(payload, "scope", security_scopes.scopes)
+
+        return payload
+
+    async def __decode(self, credentials: str) -> Dict:
         try:
-            signing_key = self.__client.get_signing_key_from_jwt(token.credentials).key
+            kid = get_unverified_header(credentials).get("kid")
+            signing_key = await self.__key_cache.get_signing_key(kid)
         except DecodeError as error:
             raise UnauthorizedException(str(error))
         except PyJWKClientError as error:
             raise UnauthorizedException(str(error))
 
         try:
-            payload = decode(
-                token.credentials,
+            return decode(
+                credentials,
                 signing_key,
                 algorithms=[self.__settings.jwt_algorithm],
                 audience=self.__settings.jwt_audience,
@@ -64,7 +242,17 @@ class TokenVerifier:
         except Exception as error:
             raise UnauthorizedException(str(error))
 
-        if len(security_scopes.scopes) > 0:
-            self.__check_claims(payload, "scope", security_scopes.scopes)
 
-        return payload
+def get_token_verifier(request: Request) -> TokenVerifier:
+    return request.app.state.token_verifier
+
+
+TokenVerifierDep = Annotated[TokenVerifier, Depends(get_token_verifier)]
+
+
+async def verify_token(
+    security_scopes: SecurityScopes,
+    token_verifier: TokenVerifierDep,
+    token: Optional[HTTPAuthorizationCredentials] = Depends(token_auth_scheme),
+):
+    return await token_verifier.verify(security_scopes, token)
@@ -1,14 +1,44 @@
 from functools import lru_cache
 from pydantic_settings import BaseSettings
+from typing import Optional
 
 
 class Settings(BaseSettings):
+    audio_analysis_cue_threshold: float = 10.0
+    audio_analysis_silence_threshold: float = -60.0
+    audio_analysis_workers: Optional[int] = None
+    audio_chunk_size: int = 1024 * 1024
+    audio_max_size: int = 4 * 1024 * 1024 * 1024
+    audio_storage_backend: str = "local"
+    audio_storage_path: str = "audio"
+    audio_upload_lease: int = 300
+    cache_control_api: str = "private, no-cache"
+    cache_control_settings: str = "public, max-age=3600"
+    cart_reference_snapshots: bool = False
+    compression_brotli_quality: int = 4
+    compression_gzip_level: int = 6
+    compression_minimum_size: int = 1024
     jwt_audience: str
     jwt_algorithm: str
     jwt_client_id: str
     jwt_domain: str
     jwt_issuer: str
+    jwks_cache_ttl: int = 3600
+    jwks_min_refresh_interval: int = 30
+    metrics_token: Optional[str] = None
     mongodb_url: str
+    mongodb_database: str = "alldaydj"
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 10
+    reference_cache_enabled: bool = True
+    reference_cache_poll_interval: int = 30
+    server_access_log: bool = True
+    server_graceful_shutdown_timeout: int = 30
+    server_host: str = "0.0.0.0"
+    server_keep_alive_timeout: int = 5
+    server_port: int = 80
+    token_cache_size: int = 1024
+    web_concurrency: Optional[int] = None
 
     class Config:
         env_file = ".env"
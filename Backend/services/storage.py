@@ -0,0 +1,136 @@
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from fastapi import Depends, Request
+from pathlib import Path
+from services.settings import Settings
+from starlette.concurrency import run_in_threadpool
+from typing import Annotated, AsyncContextManager, AsyncIterator, BinaryIO
+
+
+class AudioWriter(ABC):
+    offset: int
+
+    @abstractmethod
+    async def write(self, data: bytes):
+        pass
+
+    @abstractmethod
+    async def close(self):
+        pass
+
+
+class AudioStorage(ABC):
+    @abstractmethod
+    async def writer(self, key: str, offset: int) -> AudioWriter:
+        pass
+
+    @abstractmethod
+    def read(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def local_file(self, key: str) -> AsyncContextManager[Path]:
+        pass
+
+
+class LocalDiskWriter(AudioWriter):
+    __buffer: bytearray
+    __chunk_size: int
+    __file: BinaryIO
+
+    def __init__(self, file: BinaryIO, offset: int, chunk_size: int):
+        self.__buffer = bytearray()
+        self.__chunk_size = chunk_size
+        self.__file = file
+        self.offset = offset
+
+    async def write(self, data: bytes):
+        # Request bodies arrive in small pieces, so they're gathered into
+        # chunks before handing the disk write to a thread
+
+        self.__buffer += data
+        if len(self.__buffer) >= self.__chunk_size:
+            await self.__flush()
+
+    async def __flush(self):
+        if self.__buffer:
+            chunk = bytes(self.__buffer)
+            self.__buffer.clear()
+            await run_in_threadpool(self.__file.write, chunk)
+            self.offset += len(chunk)
+
+    async def close(self):
+        try:
+            await self.__flush()
+        finally:
+            await run_in_threadpool(self.__file.close)
+
+
+class LocalDiskStorage(AudioStorage):
+    __chunk_size: int
+    __root: Path
+
+    def __init__(self, root: Path, chunk_size: int):
+        self.__chunk_size = chunk_size
+        self.__root = root
+
+    def __path(self, key: str) -> Path:
+        return self.__root / key[-2:] / key
+
+    def __open(self, path: Path, offset: int) -> BinaryIO:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file = open(path, "r+b" if path.exists() else "wb")
+
+        # Anything past the committed offset is from an interrupted write and
+        # is overwritten by the resumed upload
+
+        file.seek(offset)
+        file.truncate()
+        return file
+
+    async def writer(self, key: str, offset: int) -> AudioWriter:
+        file = await run_in_threadpool(self.__open, self.__path(key), offset)
+        return LocalDiskWriter(file, offset, self.__chunk_size)
+
+    async def read(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        file = await run_in_threadpool(open, self.__path(key), "rb")
+        try:
+            await run_in_threadpool(file.seek, start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await run_in_threadpool(
+                    file.read, min(self.__chunk_size, remaining)
+                )
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await run_in_threadpool(file.close)
+
+    async def delete(self, key: str):
+        await run_in_threadpool(self.__path(key).unlink, missing_ok=True)
+
+    @asynccontextmanager
+    async def local_file(self, key: str) -> AsyncIterator[Path]:
+        yield self.__path(key)
+
+
+def create_audio_storage(settings: Settings) -> AudioStorage:
+    match settings.audio_storage_backend:
+        case "local":
+            return LocalDiskStorage(
+                Path(settings.audio_storage_path), settings.audio_chunk_size
+            )
+    raise ValueError(f"Unknown audio storage backend {settings.audio_storage_backend}")
+
+
+def get_audio_storage(request: Request) -> AudioStorage:
+    return request.app.state.audio_storage
+
+
+AudioStorageDep = Annotated[AudioStorage, Depends(get_audio_storage)]
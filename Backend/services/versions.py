@@ -0,0 +1,23 @@
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+
+VERSION_COLLECTION = "version"
+
+
+def _get_versions(collection: AsyncIOMotorCollection) -> AsyncIOMotorCollection:
+    return collection.database.get_collection(VERSION_COLLECTION)
+
+
+async def get_version(collection: AsyncIOMotorCollection) -> int:
+    document = await _get_versions(collection).find_one({"_id": collection.name})
+    return document["version"] if document else 0
+
+
+async def bump_version(collection: AsyncIOMotorCollection) -> int:
+    document = await _get_versions(collection).find_one_and_update(
+        {"_id": collection.name},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return document["version"]
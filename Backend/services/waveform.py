@@ -0,0 +1,95 @@
+from typing import List, NamedTuple, Tuple
+import numpy as np
+
+# The finest level keeps a min/max pair for every 256 frames and each coarser
+# level halves it, stopping once a level fits a small overview
+
+BASE_FRAMES_PER_POINT = 256
+MIN_POINTS = 256
+
+PEAK_SCALE = 32767
+
+# Each point is a little-endian int16 minimum followed by the maximum
+
+POINT_SIZE = 4
+
+
+class WaveformLevel(NamedTuple):
+    frames_per_point: int
+    data: bytes
+
+
+class PeakAccumulator:
+    __maxima: List[np.ndarray]
+    __minima: List[np.ndarray]
+    __remainder: np.ndarray
+
+    def __init__(self):
+        self.__maxima = []
+        self.__minima = []
+        self.__remainder = np.empty((0, 2))
+
+    def add(self, samples: np.ndarray):
+        # Channels are folded together so the overview shows the widest swing
+        # across all of them
+
+        folded = np.stack([samples.min(axis=1), samples.max(axis=1)], axis=1)
+        folded = np.concatenate([self.__remainder, folded])
+        usable = len(folded) // BASE_FRAMES_PER_POINT * BASE_FRAMES_PER_POINT
+
+        points = folded[:usable].reshape(-1, BASE_FRAMES_PER_POINT, 2)
+        self.__minima.append(points[:, :, 0].min(axis=1))
+        self.__maxima.append(points[:, :, 1].max(axis=1))
+        self.__remainder = folded[usable:]
+
+    def finish(self) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self.__remainder):
+            self.__minima.append(self.__remainder[:, 0].min(keepdims=True))
+            self.__maxima.append(self.__remainder[:, 1].max(keepdims=True))
+            self.__remainder = np.empty((0, 2))
+
+        if not self.__minima:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(self.__minima), np.concatenate(self.__maxima)
+
+
+def encode(minima: np.ndarray, maxima: np.ndarray) -> bytes:
+    pairs = np.stack([minima, maxima], axis=1)
+    return np.round(np.clip(pairs, -1, 1) * PEAK_SCALE).astype("<i2").tobytes()
+
+
+def decode(data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    pairs = np.frombuffer(data, "<i2").reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def build_levels(minima: np.ndarray, maxima: np.ndarray) -> List[WaveformLevel]:
+    levels = [WaveformLevel(BASE_FRAMES_PER_POINT, encode(minima, maxima))]
+    frames_per_point = BASE_FRAMES_PER_POINT
+
+    while len(minima) > MIN_POINTS:
+        if len(minima) % 2:
+            minima = np.append(minima, minima[-1])
+            maxima = np.append(maxima, maxima[-1])
+        minima = minima.reshape(-1, 2).min(axis=1)
+        maxima = maxima.reshape(-1, 2).max(axis=1)
+        frames_per_point *= 2
+        levels.append(WaveformLevel(frames_per_point, encode(minima, maxima)))
+
+    return levels
+
+
+def resample(data: bytes, points: int) -> bytes:
+    # Folding a finer level into exactly the requested number of points
+    # keeps every peak, where picking samples would drop transients
+
+    minima, maxima = decode(data)
+    if points >= len(minima):
+        return data
+
+    edges = np.linspace(0, len(minima), points + 1).astype(int)[:-1]
+    pairs = np.stack(
+        [np.minimum.reduceat(minima, edges), np.maximum.reduceat(maxima, edges)],
+        axis=1,
+    )
+    return pairs.astype("<i2").tobytes()
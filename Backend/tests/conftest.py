@@ -0,0 +1,75 @@
+from benchmarks.identity import LocalIdentityProvider
+from benchmarks.run import DEFAULT_ENVIRONMENT, mongodb_stand_in
+from fastapi.testclient import TestClient
+from services.settings import get_settings, Settings
+from typing import Dict
+from uuid import uuid4
+
+import pytest
+
+
+@pytest.fixture
+def environment() -> Dict[str, str]:
+    return {}
+
+
+@pytest.fixture
+def settings(environment: Dict[str, str], monkeypatch, tmp_path) -> Settings:
+    for name, value in DEFAULT_ENVIRONMENT.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setenv("AUDIO_STORAGE_PATH", str(tmp_path / "audio"))
+    monkeypatch.setenv("MONGODB_DATABASE", f"alldaydj_test_{uuid4().hex[:8]}")
+    monkeypatch.setenv("MONGODB_URL", "mongodb://localhost:27017")
+    for name, value in environment.items():
+        monkeypatch.setenv(name, value)
+
+    get_settings.cache_clear()
+    yield get_settings()
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def identity() -> LocalIdentityProvider:
+    return LocalIdentityProvider()
+
+
+@pytest.fixture
+def headers(settings: Settings, identity: LocalIdentityProvider) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {identity.issue_token(settings, 'test')}"}
+
+
+@pytest.fixture
+def client(settings: Settings, identity: LocalIdentityProvider):
+    # The app reads its settings as it's imported, so it's only loaded once
+    # the environment has been filled in
+
+    from main import app
+
+    with mongodb_stand_in(), identity.serve(), TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def cart_body(client, headers) -> Dict:
+    def create(resource: str, field: str, value: str) -> str:
+        response = client.post(
+            f"/api/{resource}/", json={field: value}, headers=headers
+        )
+        return response.json()["id"]
+
+    return {
+        "label": "SRD0001",
+        "artist": "The The",
+        "title": "This Is the Day",
+        "album": "Soul Mining",
+        "year": 1983,
+        "sweeper": False,
+        "override_fade": False,
+        "valid_from": "2020-01-01T00:00:00Z",
+        "valid_to": "2030-01-01T00:00:00Z",
+        "isrc": "GBBBN8300012",
+        "record_label": "Some Bizzare",
+        "type": create("type", "cart_type", "Song"),
+        "genre": create("genre", "genre", "Pop"),
+        "tags": [create("tag", "tag", "Upbeat"), create("tag", "tag", "Eighties")],
+    }
@@ -0,0 +1,239 @@
+from asyncio import Event, run, sleep
+from bson import ObjectId
+from contextlib import asynccontextmanager
+from models.audio import AnalysisStatus
+from mongomock_motor import AsyncMongoMockClient
+from services.analysis import AnalysisPipeline
+from services.loudness import analyse
+from services.waveform import (
+    BASE_FRAMES_PER_POINT,
+    build_levels,
+    decode,
+    encode,
+    MIN_POINTS,
+    resample,
+)
+import numpy as np
+import wave
+
+import pytest
+
+
+def write_wav(path, seconds, amplitude=1.0, channels=1, rate=48000, delay=0.0):
+    frames = np.arange(int(rate * seconds)) / rate
+    samples = amplitude * np.sin(2 * np.pi * 997 * frames)
+    samples = np.concatenate([np.zeros(int(rate * delay)), samples])
+    with wave.open(str(path), "wb") as file:
+        file.setnchannels(channels)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        pcm = np.round(np.repeat(samples[:, None], channels, axis=1) * 32767)
+        file.writeframes(pcm.astype("<i2").tobytes())
+    return str(path)
+
+
+@pytest.mark.parametrize("seconds", [0.45, 1.0, 1.05, 3.333])
+def test_full_scale_sine_loudness(tmp_path, seconds):
+    # Arrange
+
+    path = write_wav(tmp_path / "sine.wav", seconds)
+
+    # Act
+
+    summary = analyse(path, -60, 10).summary
+
+    # Assert
+
+    # BS.1770 puts a full scale 997 Hz sine in one channel at -3.01 LUFS,
+    # whatever the length of the file
+
+    assert summary["loudness"] == pytest.approx(-3.01, abs=0.1)
+    assert summary["peak"] == pytest.approx(0, abs=0.01)
+    assert summary["duration"] == pytest.approx(seconds, abs=0.001)
+
+
+def test_stereo_sine_loudness(tmp_path):
+    # Arrange
+
+    path = write_wav(tmp_path / "sine.wav", 5, 10 ** (-23 / 20), channels=2)
+
+    # Act
+
+    summary = analyse(path, -60, 10).summary
+
+    # Assert
+
+    assert summary["loudness"] == pytest.approx(-23, abs=0.1)
+    assert summary["peak"] == pytest.approx(-23, abs=0.01)
+    assert summary["channels"] == 2
+
+
+def test_quiet_passage_gated_out(tmp_path):
+    # Arrange
+
+    rate = 48000
+    frames = np.arange(rate * 40) / rate
+    amplitude = np.where(frames < 20, 10 ** (-20 / 20), 10 ** (-40 / 20))
+    path = tmp_path / "gated.wav"
+    with wave.open(str(path), "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        samples = amplitude * np.sin(2 * np.pi * 997 * frames) * 32767
+        file.writeframes(np.round(samples).astype("<i2").tobytes())
+
+    # Act
+
+    summary = analyse(str(path), -60, 10).summary
+
+    # Assert
+
+    # The -40 dBFS half sits more than 10 LU under the loud half, so the
+    # relative gate leaves only the -20 dBFS half and the few gates that
+    # straddle the change
+
+    assert summary["loudness"] == pytest.approx(-23.01, abs=0.1)
+
+
+def test_silence_has_no_loudness(tmp_path):
+    # Arrange
+
+    path = write_wav(tmp_path / "silence.wav", 2, 0.0)
+
+    # Act
+
+    summary = analyse(path, -60, 10).summary
+
+    # Assert
+
+    assert summary["loudness"] is None
+    assert summary["peak"] is None
+    assert summary["trim_start"] is None
+    assert summary["intro"] is None
+
+
+def test_trim_and_cues_around_leading_silence(tmp_path):
+    # Arrange
+
+    path = write_wav(tmp_path / "delayed.wav", 2, 0.5, delay=1)
+
+    # Act
+
+    summary = analyse(path, -60, 10).summary
+
+    # Assert
+
+    assert summary["peak"] == pytest.approx(-6.02, abs=0.01)
+    assert summary["trim_start"] == pytest.approx(1, abs=0.001)
+    assert summary["trim_end"] == pytest.approx(3, abs=0.001)
+    assert 1 <= summary["intro"] <= 1.5
+    assert 2.5 <= summary["outro"] <= 3
+
+
+def test_build_levels_halve_down_to_overview():
+    # Arrange
+
+    points = MIN_POINTS * 4 + 1
+    minima = -np.linspace(0, 1, points)
+    maxima = np.linspace(0, 1, points)
+
+    # Act
+
+    levels = build_levels(minima, maxima)
+
+    # Assert
+
+    assert [level.frames_per_point for level in levels] == [
+        BASE_FRAMES_PER_POINT * 2**level for level in range(4)
+    ]
+    assert [len(decode(level.data)[0]) for level in levels] == [1025, 513, 257, 129]
+    assert decode(levels[-1].data)[1].max() == 32767
+
+
+def test_encode_clips_to_full_scale():
+    # Act
+
+    minima, maxima = decode(encode(np.array([-2.0, -0.5]), np.array([0.5, 2.0])))
+
+    # Assert
+
+    assert list(minima) == [-32767, -16384]
+    assert list(maxima) == [16384, 32767]
+
+
+def test_resample_keeps_extremes():
+    # Arrange
+
+    minima = np.zeros(1000)
+    maxima = np.zeros(1000)
+    minima[123] = -1
+    maxima[777] = 1
+    data = encode(minima, maxima)
+
+    # Act
+
+    resampled = decode(resample(data, 10))
+
+    # Assert
+
+    assert len(resampled[0]) == 10
+    assert resampled[0][1] == -32767
+    assert resampled[1][7] == 32767
+    assert resample(data, 2000) == data
+
+
+class BlockingStorage:
+    def __init__(self):
+        self.opened = Event()
+
+    @asynccontextmanager
+    async def local_file(self, key):
+        self.opened.set()
+        await Event().wait()
+        yield key
+
+
+class MissingStorage:
+    @asynccontextmanager
+    async def local_file(self, key):
+        raise FileNotFoundError(key)
+        yield key
+
+
+def test_interrupted_analysis_resumed(settings):
+    # Arrange
+
+    database = AsyncMongoMockClient()["alldaydj_test"]
+    audio = database.get_collection("audio")
+    document = {
+        "_id": ObjectId(),
+        "filename": "ident.wav",
+        "content_type": "audio/wav",
+        "analysis": {"status": AnalysisStatus.Pending},
+    }
+
+    async def interrupt_then_resume():
+        await audio.insert_one(document)
+        storage = BlockingStorage()
+        pipeline = AnalysisPipeline(database, storage, settings)
+        await pipeline.submit(document)
+        await storage.opened.wait()
+        running = await audio.find_one()
+        await pipeline.close()
+        interrupted = await audio.find_one()
+
+        pipeline = AnalysisPipeline(database, MissingStorage(), settings)
+        await pipeline.resume()
+        while (await audio.find_one())["analysis"]["status"] != AnalysisStatus.Failed:
+            await sleep(0.01)
+        await pipeline.close()
+        return running, interrupted
+
+    # Act
+
+    running, interrupted = run(interrupt_then_resume())
+
+    # Assert
+
+    assert running["analysis"]["status"] == AnalysisStatus.Running
+    assert interrupted["analysis"]["status"] == AnalysisStatus.Pending
@@ -0,0 +1,257 @@
+from asyncio import run
+from datetime import timedelta
+from errors.exceptions import ConflictException
+from fastapi import HTTPException
+from models.audio import AudioUploadCreate
+from mongomock_motor import AsyncMongoMockClient
+from services.audio import AudioUploads
+from services.ranges import parse_range
+
+import pytest
+
+# MP3s aren't analysed, which keeps the process pool out of these tests
+
+CONTENT = bytes(range(256)) * 40
+
+
+def create_upload(client, headers, size=len(CONTENT)):
+    return client.post(
+        "/api/audio/",
+        json={"filename": "ident.mp3", "content_type": "audio/mpeg", "size": size},
+        headers=headers,
+    ).json()
+
+
+def append(client, headers, id, offset, body):
+    return client.patch(
+        f"/api/audio/{id}",
+        content=body,
+        headers={**headers, "Upload-Offset": str(offset)},
+    )
+
+
+@pytest.fixture
+def audio(client, headers):
+    audio = create_upload(client, headers)
+    append(client, headers, audio["id"], 0, CONTENT)
+    return audio
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=0-0", (0, 0)),
+        ("bytes=0-99,200-299", None),
+        ("items=0-99", None),
+        ("bytes=99-0", None),
+        ("bytes=nonsense", None),
+        ("bytes=a-b", None),
+    ],
+)
+def test_parse_range(header, expected):
+    # Act
+
+    byte_range = parse_range(header, 1000)
+
+    # Assert
+
+    assert byte_range == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5000-6000", "bytes=-0"])
+def test_parse_range_not_satisfiable(header):
+    # Act
+
+    with pytest.raises(HTTPException) as error:
+        parse_range(header, 1000)
+
+    # Assert
+
+    assert error.value.status_code == 416
+    assert error.value.headers == {"Content-Range": "bytes */1000"}
+
+
+def test_upload_resumed_from_offset(client, headers):
+    # Arrange
+
+    audio = create_upload(client, headers)
+    first = append(client, headers, audio["id"], 0, CONTENT[:1000])
+
+    # Act
+
+    offset = client.head(f"/api/audio/{audio['id']}", headers=headers)
+    rest = append(client, headers, audio["id"], 1000, CONTENT[1000:])
+
+    # Assert
+
+    assert first.headers["Upload-Offset"] == "1000"
+    assert offset.headers["Upload-Offset"] == "1000"
+    assert offset.headers["Upload-Length"] == str(len(CONTENT))
+    assert rest.headers["Upload-Offset"] == str(len(CONTENT))
+    uploaded = client.get(f"/api/audio/{audio['id']}", headers=headers).json()
+    assert uploaded["complete"]
+    assert uploaded["analysis"]["status"] == "unsupported"
+
+
+def test_upload_at_wrong_offset_conflicts(client, headers):
+    # Arrange
+
+    audio = create_upload(client, headers)
+    append(client, headers, audio["id"], 0, CONTENT[:1000])
+
+    # Act
+
+    response = append(client, headers, audio["id"], 500, CONTENT[500:])
+
+    # Assert
+
+    assert response.status_code == 409
+    assert response.headers["Upload-Offset"] == "1000"
+
+
+def test_upload_past_size_rejected(client, headers):
+    # Arrange
+
+    audio = create_upload(client, headers, size=100)
+
+    # Act
+
+    response = append(client, headers, audio["id"], 0, CONTENT[:200])
+
+    # Assert
+
+    assert response.status_code == 413
+
+
+def test_completed_upload_conflicts(client, headers, audio):
+    # Act
+
+    response = append(client, headers, audio["id"], len(CONTENT), b"more")
+
+    # Assert
+
+    assert response.status_code == 409
+
+
+def test_lease_renewed_and_lost():
+    # Arrange
+
+    async def renew_then_take_over():
+        uploads = AudioUploads(
+            AsyncMongoMockClient()["alldaydj_test"]["audio"], timedelta(seconds=-1)
+        )
+        document = await uploads.create(
+            AudioUploadCreate(filename="ident.wav", size=10)
+        )
+        id = str(document["_id"])
+
+        claimed = await uploads.claim(id, 0)
+        renewed = await uploads.renew(claimed)
+
+        # A negative lease has always run out, so the next claim takes over
+
+        await uploads.claim(id, 0)
+        with pytest.raises(ConflictException):
+            await uploads.renew(renewed)
+        released = await uploads.release(renewed, 5)
+        return claimed, renewed, released
+
+    # Act
+
+    claimed, renewed, released = run(renew_then_take_over())
+
+    # Assert
+
+    assert renewed["lease"] >= claimed["lease"]
+    assert released["offset"] == 0
+    assert released["lease_holder"] != claimed["lease_holder"]
+
+
+def test_download_whole_file(client, headers, audio):
+    # Act
+
+    response = client.get(f"/api/audio/{audio['id']}/content", headers=headers)
+
+    # Assert
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    [("bytes=100-199", 100, 199), ("bytes=-10", len(CONTENT) - 10, len(CONTENT) - 1)],
+)
+def test_download_range(client, headers, audio, header, start, end):
+    # Act
+
+    response = client.get(
+        f"/api/audio/{audio['id']}/content", headers={**headers, "Range": header}
+    )
+
+    # Assert
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[start : end + 1]
+    assert response.headers["Content-Range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+
+
+def test_download_range_not_satisfiable(client, headers, audio):
+    # Act
+
+    response = client.get(
+        f"/api/audio/{audio['id']}/content",
+        headers={**headers, "Range": f"bytes={len(CONTENT)}-"},
+    )
+
+    # Assert
+
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_download_stale_if_range_gets_whole_file(client, headers, audio):
+    # Act
+
+    response = client.get(
+        f"/api/audio/{audio['id']}/content",
+        headers={**headers, "Range": "bytes=0-9", "If-Range": '"stale"'},
+    )
+
+    # Assert
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_delete_audio_used_by_cart_conflicts(client, headers, audio, cart_body):
+    # Arrange
+
+    client.post("/api/cart/", json={**cart_body, "audio": audio["id"]}, headers=headers)
+
+    # Act
+
+    response = client.delete(f"/api/audio/{audio['id']}", headers=headers)
+
+    # Assert
+
+    assert response.status_code == 409
+    assert client.get(f"/api/audio/{audio['id']}", headers=headers).status_code == 200
+
+
+def test_delete_unused_audio(client, headers, audio):
+    # Act
+
+    response = client.delete(f"/api/audio/{audio['id']}", headers=headers)
+
+    # Assert
+
+    assert response.status_code == 204
+    assert client.get(f"/api/audio/{audio['id']}", headers=headers).status_code == 404
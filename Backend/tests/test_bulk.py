@@ -0,0 +1,99 @@
+def create_tags(client, headers, *tags):
+    response = client.post(
+        "/api/tag/bulk",
+        json={"operations": [{"op": "create", "data": {"tag": tag}} for tag in tags]},
+        headers=headers,
+    )
+    return [result["id"] for result in response.json()["results"]]
+
+
+def test_create_reports_ids_and_counts(client, headers):
+    # Act
+
+    response = client.post(
+        "/api/tag/bulk",
+        json={
+            "operations": [
+                {"op": "create", "data": {"tag": "Upbeat"}},
+                {"op": "create", "data": {"tag": "Mellow"}},
+            ]
+        },
+        headers=headers,
+    )
+
+    # Assert
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 0)
+    assert [result["status"] for result in body["results"]] == ["created", "created"]
+    assert [result["item"]["tag"] for result in body["results"]] == ["Upbeat", "Mellow"]
+    assert all(result["id"] == result["item"]["id"] for result in body["results"])
+
+
+def test_ordered_stops_at_first_conflict(client, headers):
+    # Arrange
+
+    create_tags(client, headers, "Upbeat")
+
+    # Act
+
+    response = client.post(
+        "/api/tag/bulk",
+        json={
+            "operations": [
+                {"op": "create", "data": {"tag": "Mellow"}},
+                {"op": "create", "data": {"tag": "Upbeat"}},
+                {"op": "create", "data": {"tag": "Chill"}},
+            ]
+        },
+        headers=headers,
+    )
+
+    # Assert
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [
+        "created",
+        "conflict",
+        "skipped",
+    ]
+    assert results[2]["id"] is None
+    tags = client.get("/api/tag/", headers=headers).json()["items"]
+    assert sorted(tag["tag"] for tag in tags) == ["Mellow", "Upbeat"]
+
+
+def test_unordered_carries_on_past_failures(client, headers):
+    # Arrange
+
+    [upbeat, mellow] = create_tags(client, headers, "Upbeat", "Mellow")
+
+    # Act
+
+    response = client.post(
+        "/api/tag/bulk",
+        json={
+            "ordered": False,
+            "operations": [
+                {"op": "update", "id": upbeat, "data": {"tag": "Mellow"}},
+                {"op": "delete", "id": "not-an-id"},
+                {"op": "delete", "id": mellow},
+                {"op": "update", "id": mellow, "data": {"tag": "Gone"}},
+                {"op": "create", "data": {"tag": "Chill"}},
+            ],
+        },
+        headers=headers,
+    )
+
+    # Assert
+
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == [
+        "conflict",
+        "invalid",
+        "deleted",
+        "not_found",
+        "created",
+    ]
+    assert (body["created"], body["deleted"], body["failed"]) == (1, 1, 3)
@@ -0,0 +1,77 @@
+from asyncio import run, sleep
+from mongomock_motor import AsyncMongoMockClient
+from models.genre import Genre
+from services.cache import CollectionCache
+from services.repository import Repository, RepositoryHooks
+from services.versions import bump_version
+from typing import Dict, List
+
+
+class MarkResolved(RepositoryHooks):
+    async def resolve(self, documents: List[Dict]) -> List[Dict]:
+        return [{**document, "resolved": True} for document in documents]
+
+
+def genres():
+    return AsyncMongoMockClient()["alldaydj_test"]["genre"]
+
+
+def test_poll_keeps_snapshot_while_version_unchanged():
+    # Arrange
+
+    async def poll():
+        collection = genres()
+        await collection.insert_one({"genre": "Rock"})
+        cache = CollectionCache(collection, poll_interval=0)
+        before = await cache.list()
+
+        cache.start()
+        await sleep(0.05)
+        await collection.insert_one({"genre": "Pop"})
+        await sleep(0.05)
+        unchanged = await cache.list()
+
+        await bump_version(collection)
+        await sleep(0.05)
+        changed = await cache.list()
+
+        await cache.stop()
+        return before, unchanged, changed
+
+    # Act
+
+    before, unchanged, changed = run(poll())
+
+    # Assert
+
+    assert unchanged[0] is before[0]
+    assert [genre["genre"] for genre in unchanged] == ["Rock"]
+    assert [genre["genre"] for genre in changed] == ["Rock", "Pop"]
+
+
+def test_cache_hit_resolved_like_miss():
+    # Arrange
+
+    async def get_both():
+        collection = genres()
+        result = await collection.insert_one({"genre": "Rock"})
+        id = str(result.inserted_id)
+
+        uncached = Repository(collection, Genre, "Genre", hooks=MarkResolved())
+        cached = Repository(
+            collection,
+            Genre,
+            "Genre",
+            cache=CollectionCache(collection, poll_interval=30),
+            hooks=MarkResolved(),
+        )
+        return await uncached.get(id), await cached.get(id)
+
+    # Act
+
+    uncached, cached = run(get_both())
+
+    # Assert
+
+    assert cached == uncached
+    assert cached["resolved"]
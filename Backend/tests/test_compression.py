@@ -0,0 +1,136 @@
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from services.compression import CompressionMiddleware, negotiate_encoding
+import brotli
+import gzip
+
+import pytest
+
+TEXT = "AllDay DJ " * 200
+
+
+@pytest.fixture
+def compressing_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(TEXT)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("AllDay DJ")
+
+    @app.get("/binary")
+    async def binary():
+        return Response(TEXT.encode(), media_type="application/octet-stream")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(4):
+                yield "AllDay DJ "
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def get_raw(client: TestClient, path: str, accept_encoding: str):
+    # httpx decodes responses itself, so the raw stream is read to check the
+    # bytes actually sent
+
+    with client.stream(
+        "GET", path, headers={"Accept-Encoding": accept_encoding}
+    ) as response:
+        return response, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("identity", None),
+        ("*", "br"),
+        ("*, br;q=0", "gzip"),
+        ("gzip;q=nonsense, br", "br"),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, encoding):
+    # Act
+
+    negotiated = negotiate_encoding(accept_encoding)
+
+    # Assert
+
+    assert negotiated == encoding
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress",
+    [("br", brotli.decompress), ("gzip", gzip.decompress)],
+)
+def test_large_response_compressed(compressing_client, encoding, decompress):
+    # Act
+
+    response, body = get_raw(compressing_client, "/large", encoding)
+
+    # Assert
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) == len(body)
+    assert decompress(body).decode() == TEXT
+
+
+def test_response_under_minimum_size_not_compressed(compressing_client):
+    # Act
+
+    response, body = get_raw(compressing_client, "/small", "br")
+
+    # Assert
+
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert body == b"AllDay DJ"
+
+
+def test_binary_response_not_compressed(compressing_client):
+    # Act
+
+    response, body = get_raw(compressing_client, "/binary", "br")
+
+    # Assert
+
+    assert "Content-Encoding" not in response.headers
+    assert body == TEXT.encode()
+
+
+def test_streamed_response_compressed(compressing_client):
+    # Act
+
+    response, body = get_raw(compressing_client, "/stream", "gzip")
+
+    # Assert
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(body).decode() == "AllDay DJ " * 4
+
+
+def test_cache_control_per_router(client, headers):
+    # Act
+
+    settings = client.get("/api/settings/")
+    genres = client.get("/api/genre/", headers=headers)
+
+    # Assert
+
+    assert settings.headers["Cache-Control"] == "public, max-age=3600"
+    assert genres.headers["Cache-Control"] == "private, no-cache"
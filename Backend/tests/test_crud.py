@@ -0,0 +1,62 @@
+import pytest
+
+RESOURCES = [("genre", "genre"), ("tag", "tag"), ("type", "cart_type")]
+
+CACHE_ENVIRONMENTS = [
+    {"REFERENCE_CACHE_ENABLED": "true"},
+    {"REFERENCE_CACHE_ENABLED": "false"},
+]
+
+
+@pytest.mark.parametrize("environment", CACHE_ENVIRONMENTS)
+@pytest.mark.parametrize("resource, field", RESOURCES)
+def test_create_read_update_delete(client, headers, resource, field):
+    # Act
+
+    created = client.post(f"/api/{resource}/", json={field: "Rock"}, headers=headers)
+    fetched = client.get(f"/api/{resource}/{created.json()['id']}", headers=headers)
+    updated = client.put(
+        f"/api/{resource}/{created.json()['id']}",
+        json={field: "Pop"},
+        headers=headers,
+    )
+    listed = client.get(f"/api/{resource}/", headers=headers)
+    deleted = client.delete(f"/api/{resource}/{created.json()['id']}", headers=headers)
+    missing = client.get(f"/api/{resource}/{created.json()['id']}", headers=headers)
+
+    # Assert
+
+    assert created.status_code == 201
+    assert fetched.json() == created.json()
+    assert updated.json() == {"id": created.json()["id"], field: "Pop"}
+    assert listed.json()["items"] == [updated.json()]
+    assert listed.json()["total"] == 1
+    assert deleted.status_code == 204
+    assert missing.status_code == 404
+
+
+@pytest.mark.parametrize("method", ["get", "put", "delete"])
+def test_unknown_id_not_found(client, headers, method):
+    # Act
+
+    response = client.request(
+        method,
+        "/api/genre/not-an-id",
+        json={"genre": "Rock"} if method == "put" else None,
+        headers=headers,
+    )
+
+    # Assert
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Genre not-an-id not found"
+
+
+def test_token_required(client):
+    # Act
+
+    response = client.get("/api/genre/")
+
+    # Assert
+
+    assert response.status_code == 403
@@ -0,0 +1,85 @@
+import pytest
+
+
+@pytest.fixture
+def genres(client, headers):
+    # Enough genres that the list is over the compression minimum size
+
+    client.post(
+        "/api/genre/bulk",
+        json={
+            "operations": [
+                {"op": "create", "data": {"genre": f"Genre {index}"}}
+                for index in range(50)
+            ]
+        },
+        headers=headers,
+    )
+
+
+def get_genres(client, headers, **extra):
+    return client.get("/api/genre/", headers={**headers, **extra})
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+def test_compressed_list_has_strong_encoding_etag(client, headers, genres, encoding):
+    # Act
+
+    identity = get_genres(client, headers, **{"Accept-Encoding": "identity"})
+    compressed = get_genres(client, headers, **{"Accept-Encoding": encoding})
+
+    # Assert
+
+    assert compressed.headers["Content-Encoding"] == encoding
+    assert not compressed.headers["ETag"].startswith("W/")
+    assert compressed.headers["ETag"] == (
+        f'{identity.headers["ETag"][:-1]}-{encoding}"'
+    )
+    assert compressed.json() == identity.json()
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip", "identity"])
+def test_conditional_get_returns_held_etag(client, headers, genres, encoding):
+    # Arrange
+
+    etag = get_genres(client, headers, **{"Accept-Encoding": encoding}).headers["ETag"]
+
+    # Act
+
+    response = get_genres(
+        client, headers, **{"Accept-Encoding": encoding, "If-None-Match": etag}
+    )
+
+    # Assert
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_conditional_get_after_write_returns_new_etag(client, headers, genres):
+    # Arrange
+
+    etag = get_genres(client, headers, **{"Accept-Encoding": "br"}).headers["ETag"]
+    client.post("/api/genre/", json={"genre": "Rock"}, headers=headers)
+
+    # Act
+
+    response = get_genres(
+        client, headers, **{"Accept-Encoding": "br", "If-None-Match": etag}
+    )
+
+    # Assert
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.headers["ETag"].endswith('-br"')
+
+
+def test_unrelated_etag_not_matched(client, headers, genres):
+    # Act
+
+    response = get_genres(client, headers, **{"If-None-Match": '"0-0000000000000000"'})
+
+    # Assert
+
+    assert response.status_code == 200
@@ -0,0 +1,96 @@
+from asyncio import run
+from datetime import datetime, timedelta, timezone
+from importer.library import CartDefaults, LibraryImporter
+from importer.run import as_utc
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import BulkWriteError
+from services.storage import LocalDiskStorage
+
+import pytest
+
+DEFAULTS = CartDefaults(
+    cart_type="Song",
+    genre="Unknown",
+    tags=[],
+    valid_from=datetime(2020, 1, 1, tzinfo=timezone.utc),
+    valid_to=datetime(2099, 12, 31, tzinfo=timezone.utc),
+)
+
+
+class PartlyFailingDatabase:
+    # Only the first cart of a batch is written before the batch fails
+
+    def __init__(self):
+        self.database = AsyncMongoMockClient()["alldaydj_test"]
+
+    def get_collection(self, name):
+        collection = self.database.get_collection(name)
+        if name == "cart":
+
+            async def bulk_write(writes, ordered):
+                await collection.insert_one(writes[0]._doc)
+                raise BulkWriteError({"writeErrors": [{"index": 1, "code": 2}]})
+
+            collection.bulk_write = bulk_write
+        return collection
+
+
+def entry(path):
+    path.write_bytes(b"ID3" + bytes(100))
+    return {
+        "path": str(path),
+        "label": path.stem,
+        "artist": "The The",
+        "title": path.stem,
+        "album": "",
+        "isrc": "",
+        "record_label": "",
+        "year": 1983,
+        "genre": None,
+        "tags": [],
+    }
+
+
+def test_failed_batch_removes_unwritten_audio(tmp_path):
+    # Arrange
+
+    database = PartlyFailingDatabase()
+    storage = LocalDiskStorage(tmp_path / "audio", 1024)
+    importer = LibraryImporter(database, DEFAULTS, storage)
+    entries = [entry(tmp_path / "first.mp3"), entry(tmp_path / "second.mp3")]
+
+    async def import_then_list():
+        with pytest.raises(BulkWriteError):
+            await importer.import_batch(entries)
+        carts = await database.get_collection("cart").find().to_list(None)
+        audio = await database.get_collection("audio").find().to_list(None)
+        return carts, audio
+
+    # Act
+
+    carts, audio = run(import_then_list())
+
+    # Assert
+
+    assert [cart["import_source"] for cart in carts] == [entries[0]["path"]]
+    assert [document["_id"] for document in audio] == [carts[0]["audio"]]
+    copies = [path for path in (tmp_path / "audio").rglob("*") if path.is_file()]
+    assert [path.name for path in copies] == [str(carts[0]["audio"])]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        datetime(2099, 12, 31),
+        datetime(2099, 12, 31, 1, tzinfo=timezone(timedelta(hours=1))),
+    ],
+)
+def test_dates_normalised_to_utc(value):
+    # Act
+
+    normalised = as_utc(value)
+
+    # Assert
+
+    assert normalised == datetime(2099, 12, 31, tzinfo=timezone.utc)
+    assert normalised.tzinfo == timezone.utc
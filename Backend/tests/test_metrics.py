@@ -0,0 +1,46 @@
+import pytest
+
+TOKEN_ENVIRONMENT = {"METRICS_TOKEN": "scraper-token"}
+
+
+def test_metrics_disabled_without_token_setting(client):
+    # Act
+
+    response = client.get("/metrics")
+
+    # Assert
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("environment", [TOKEN_ENVIRONMENT])
+@pytest.mark.parametrize(
+    "authorization, status_code",
+    [(None, 401), ("Bearer wrong-token", 403), ("scraper-token", 403)],
+)
+def test_metrics_refused_without_token(client, authorization, status_code):
+    # Act
+
+    response = client.get(
+        "/metrics", headers={"Authorization": authorization} if authorization else {}
+    )
+
+    # Assert
+
+    assert response.status_code == status_code
+
+
+@pytest.mark.parametrize("environment", [TOKEN_ENVIRONMENT])
+def test_metrics_served_with_token(client, headers):
+    # Arrange
+
+    client.get("/api/genre/", headers=headers)
+
+    # Act
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scraper-token"})
+
+    # Assert
+
+    assert response.status_code == 200
+    assert "alldaydj_http_request_duration_seconds" in response.text
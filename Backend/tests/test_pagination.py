@@ -0,0 +1,88 @@
+from base64 import b64encode
+
+import pytest
+
+CACHE_ENVIRONMENTS = [
+    {"REFERENCE_CACHE_ENABLED": "true"},
+    {"REFERENCE_CACHE_ENABLED": "false"},
+]
+
+
+def create_genres(client, headers, *genres):
+    for genre in genres:
+        client.post("/api/genre/", json={"genre": genre}, headers=headers)
+
+
+@pytest.mark.parametrize("environment", CACHE_ENVIRONMENTS)
+def test_cursor_walks_every_page_once(client, headers):
+    # Arrange
+
+    create_genres(client, headers, "Rock", "Pop", "Jazz", "Funk", "Soul")
+
+    # Act
+
+    pages = []
+    params = {"size": 2, "include_total": True}
+    while True:
+        page = client.get("/api/genre/cursor", params=params, headers=headers).json()
+        pages.append(page)
+        if not page["next_page"]:
+            break
+        params = {"size": 2, "cursor": page["next_page"]}
+
+    # Assert
+
+    assert [len(page["items"]) for page in pages] == [2, 2, 1]
+    assert [genre["genre"] for page in pages for genre in page["items"]] == [
+        "Rock",
+        "Pop",
+        "Jazz",
+        "Funk",
+        "Soul",
+    ]
+    assert pages[0]["total"] == 5
+    assert pages[1]["total"] is None
+
+
+@pytest.mark.parametrize("environment", CACHE_ENVIRONMENTS)
+def test_cursor_carries_on_after_deleted_item(client, headers):
+    # Arrange
+
+    create_genres(client, headers, "Rock", "Pop", "Jazz")
+    first_page = client.get(
+        "/api/genre/cursor", params={"size": 2}, headers=headers
+    ).json()
+    client.delete(f"/api/genre/{first_page['items'][1]['id']}", headers=headers)
+
+    # Act
+
+    response = client.get(
+        "/api/genre/cursor",
+        params={"size": 2, "cursor": first_page["next_page"]},
+        headers=headers,
+    )
+
+    # Assert
+
+    assert [genre["genre"] for genre in response.json()["items"]] == ["Jazz"]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "A",
+        "nope",
+        b64encode(b"not an object id").decode(),
+    ],
+)
+def test_invalid_cursor_rejected(client, headers, cursor):
+    # Act
+
+    response = client.get(
+        "/api/genre/cursor", params={"cursor": cursor}, headers=headers
+    )
+
+    # Assert
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor value"
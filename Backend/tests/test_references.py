@@ -0,0 +1,99 @@
+from asyncio import run
+from bson import ObjectId
+from services.references import CART_REFERENCES, CartReferenceSync
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+SNAPSHOT_ENVIRONMENTS = [
+    {"CART_REFERENCE_SNAPSHOTS": "true"},
+    {"CART_REFERENCE_SNAPSHOTS": "false"},
+]
+
+
+@pytest.mark.parametrize("environment", SNAPSHOT_ENVIRONMENTS)
+def test_cart_embeds_references(client, headers, cart_body):
+    # Act
+
+    cart = client.post("/api/cart/", json=cart_body, headers=headers).json()
+
+    # Assert
+
+    assert cart["type"] == {"id": cart_body["type"], "cart_type": "Song"}
+    assert cart["genre"] == {"id": cart_body["genre"], "genre": "Pop"}
+    assert [tag["tag"] for tag in cart["tags"]] == ["Upbeat", "Eighties"]
+
+
+# The in-memory stand-in doesn't implement array filters, so renames with
+# snapshots on are covered by the writes they make instead
+
+
+@pytest.mark.parametrize("environment", [{"CART_REFERENCE_SNAPSHOTS": "false"}])
+def test_renamed_tag_updated_everywhere_in_cart(client, headers, cart_body):
+    # Arrange
+
+    [upbeat, eighties] = cart_body["tags"]
+    cart = client.post(
+        "/api/cart/",
+        json={**cart_body, "tags": [upbeat, eighties, upbeat]},
+        headers=headers,
+    ).json()
+
+    # Act
+
+    client.put(f"/api/tag/{upbeat}", json={"tag": "Lively"}, headers=headers)
+    client.put(
+        f"/api/genre/{cart_body['genre']}", json={"genre": "Synth Pop"}, headers=headers
+    )
+
+    # Assert
+
+    cart = client.get(f"/api/cart/{cart['id']}", headers=headers).json()
+    assert [tag["tag"] for tag in cart["tags"]] == ["Lively", "Eighties", "Lively"]
+    assert cart["genre"]["genre"] == "Synth Pop"
+
+
+@pytest.mark.parametrize("environment", SNAPSHOT_ENVIRONMENTS)
+def test_deleted_tag_dropped_from_cart(client, headers, cart_body):
+    # Arrange
+
+    cart = client.post("/api/cart/", json=cart_body, headers=headers).json()
+    etag = client.get(f"/api/cart/{cart['id']}", headers=headers).headers["ETag"]
+
+    # Act
+
+    client.delete(f"/api/tag/{cart_body['tags'][0]}", headers=headers)
+
+    # Assert
+
+    response = client.get(
+        f"/api/cart/{cart['id']}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert [tag["tag"] for tag in response.json()["tags"]] == ["Eighties"]
+
+
+def test_renamed_tag_snapshot_set_at_every_position():
+    # Arrange
+
+    tag_id = ObjectId()
+    carts = MagicMock()
+    carts.bulk_write = AsyncMock()
+    carts.database.get_collection.return_value.find_one_and_update = AsyncMock(
+        return_value={"version": 1}
+    )
+    sync = CartReferenceSync(carts, CART_REFERENCES["tag"], snapshots=True)
+
+    # Act
+
+    run(sync.changed([{"_id": tag_id, "tag": "Lively"}], []))
+
+    # Assert
+
+    [writes], _ = carts.bulk_write.call_args
+    [update] = writes
+    assert update._filter == {"references.tags._id": tag_id}
+    assert update._doc == {
+        "$set": {"references.tags.$[reference]": {"_id": tag_id, "tag": "Lively"}}
+    }
+    assert update._array_filters == [{"reference._id": tag_id}]
@@ -0,0 +1,93 @@
+from asyncio import run
+from httpx import AsyncClient, MockTransport, Request, Response
+from jwt.exceptions import PyJWKClientError
+from prometheus_client import REGISTRY
+from services.security import JwksKeyCache
+
+import pytest
+
+JWKS_URL = "https://identity.test/.well-known/jwks.json"
+
+
+def key_cache(handler, min_refresh_interval: int = 30) -> JwksKeyCache:
+    return JwksKeyCache(
+        JWKS_URL,
+        ttl=3600,
+        min_refresh_interval=min_refresh_interval,
+        client=AsyncClient(transport=MockTransport(handler)),
+    )
+
+
+def test_unreachable_identity_provider_is_not_refetched_per_request():
+    # Arrange
+
+    requests = []
+
+    def unavailable(request: Request) -> Response:
+        requests.append(request)
+        return Response(503)
+
+    async def verify_many():
+        cache = key_cache(unavailable)
+        for _ in range(5):
+            with pytest.raises(PyJWKClientError):
+                await cache.get_signing_key("signing")
+        await cache.close()
+
+    # Act
+
+    run(verify_many())
+
+    # Assert
+
+    assert len(requests) == 1
+
+
+def test_unreachable_identity_provider_retried_after_interval():
+    # Arrange
+
+    requests = []
+
+    def unavailable(request: Request) -> Response:
+        requests.append(request)
+        return Response(503)
+
+    async def verify_twice():
+        cache = key_cache(unavailable, min_refresh_interval=0)
+        for _ in range(2):
+            with pytest.raises(PyJWKClientError):
+                await cache.get_signing_key("signing")
+        await cache.close()
+
+    # Act
+
+    run(verify_twice())
+
+    # Assert
+
+    assert len(requests) == 2
+
+
+def test_token_cache_hits_recorded(client, headers):
+    # Arrange
+
+    def verifications(cache: str) -> float:
+        return (
+            REGISTRY.get_sample_value(
+                "alldaydj_token_verification_duration_seconds_count",
+                {"cache": cache, "outcome": "success"},
+            )
+            or 0
+        )
+
+    hits, misses = verifications("hit"), verifications("miss")
+
+    # Act
+
+    for _ in range(3):
+        client.get("/api/genre/", headers=headers)
+
+    # Assert
+
+    assert verifications("miss") - misses == 1
+    assert verifications("hit") - hits == 2
@@ -4,5 +4,6 @@ from typing import Optional
 
 class Settings(BaseModel):
     base_url: HttpUrl = HttpUrl("http://localhost:8000")
+    max_concurrent_requests: int = 8
     refresh_token: Optional[str] = None
     sound_device_preview: str = ""
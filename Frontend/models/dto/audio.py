@@ -21,8 +21,8 @@ class Cart(ApiBaseModel):
     artist: str
     title: str
     album: str
-    type: CartType
-    genre: Genre
+    type: Optional[CartType] = None
+    genre: Optional[Genre] = None
     year: int
     tags: List[Tag]
     sweeper: bool
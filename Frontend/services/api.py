@@ -1,23 +1,26 @@
 from models.dto.api import ApiSettings
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+from PySide6.QtNetwork import QNetworkReply, QNetworkRequest
+from services.http import HttpClient
 from services.logging import LoggingService, Logger
 from services.settings import SettingsService
-from typing import Callable, List
+from typing import Callable
 from urllib.parse import urljoin
 
 
 class ApiService:
+    __http_client: HttpClient
     __logger: Logger
-    __managers: List[QNetworkAccessManager] = []
     __settings_service: SettingsService
 
     ENCODING = "utf-8"
 
     def __init__(
         self,
+        http_client: HttpClient = None,
         logger: Logger = LoggingService().get_logger(__name__),
         settings_service: SettingsService = None,
     ):
+        self.__http_client = http_client or HttpClient()
         self.__logger = logger
         self.__settings_service = settings_service
 
@@ -27,8 +30,6 @@ class ApiService:
         success: Callable[[str], None],
         failure: Callable[[QNetworkReply.NetworkError, str], None],
     ):
-        network_access_manager = QNetworkAccessManager()
-
         def callback(reply: QNetworkReply):
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
@@ -44,12 +45,7 @@ class ApiService:
                 self.__logger.info("Successful network request", url=url)
                 success(content)
 
-            self.__managers.remove(network_access_manager)
-
-        network_access_manager.finished.connect(callback)
-        network_access_manager.get(QNetworkRequest(url))
-
-        self.__managers.append(network_access_manager)
+        self.__http_client.get(QNetworkRequest(url), callback)
 
     def get_api_settings(
         self,
@@ -15,8 +15,9 @@ from models.dto.authentication import (
     OAuthTokenResponseError,
 )
 from PySide6.QtCore import QTimer
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+from PySide6.QtNetwork import QNetworkReply, QNetworkRequest
 from services.api import ApiService
+from services.http import HttpClient
 from services.json import JsonService
 from services.logging import get_logger, Logger
 from services.settings import SettingsService
@@ -41,8 +42,8 @@ class AuthenticationService:
     __callbacks: List[Callable[[AuthenticationServiceState], None]] = []
     __device_code_response: OAuthDeviceCodeResponse
     __error: Optional[str]
+    __http_client: HttpClient
     __logger: Logger
-    __network_access_manager: QNetworkAccessManager
     __refresh_token: str
     __settings_service: SettingsService
     __state: AuthenticationServiceState
@@ -53,13 +54,14 @@ class AuthenticationService:
     def __init__(
         self,
         api_service: ApiService = None,
+        http_client: HttpClient = None,
         logger: Logger = get_logger(__name__),
         settings_service: SettingsService = None,
         state: AuthenticationServiceState = AuthenticationServiceState.Unauthenticated,
     ):
         self.__api_service = api_service
+        self.__http_client = http_client or HttpClient()
         self.__logger = logger
-        self.__network_access_manager = QNetworkAccessManager()
         self.__settings_service = settings_service
         self.__state = state
         self.__refresh_token_from_settings()
@@ -123,7 +125,6 @@ class AuthenticationService:
         )
 
         def callback(reply: QNetworkReply):
-            self.__network_access_manager.finished.disconnect(callback)
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
             if reply.error() is not QNetworkReply.NetworkError.NoError:
@@ -140,10 +141,10 @@ class AuthenticationService:
                 )
                 self.__make_token_request()
 
-        self.__network_access_manager.finished.connect(callback)
-        self.__network_access_manager.post(
+        self.__http_client.post(
             JsonService.generate_json_request(url),
             JsonService.dict_to_json(payload.model_dump()),
+            callback,
         )
 
     def __make_token_request(self, *args, **kwargs):
@@ -159,7 +160,6 @@ class AuthenticationService:
         self.__logger.info("Request token from OAuth service", url=url)
 
         def callback(reply: QNetworkReply):
-            self.__network_access_manager.finished.disconnect(callback)
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
             if reply.error() is not QNetworkReply.NetworkError.NoError:
@@ -191,10 +191,10 @@ class AuthenticationService:
                 )
                 self.__set_state(AuthenticationServiceState.Authenticated)
 
-        self.__network_access_manager.finished.connect(callback)
-        self.__network_access_manager.post(
+        self.__http_client.post(
             JsonService.generate_json_request(url),
             JsonService.dict_to_json(payload.model_dump()),
+            callback,
         )
 
     def __handle_error(self, error: str):
@@ -249,7 +249,6 @@ class AuthenticationService:
         self.__logger.info("Refresh token from OAuth service", url=url)
 
         def callback(reply: QNetworkReply):
-            self.__network_access_manager.finished.disconnect(callback)
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
             if reply.error() is not QNetworkReply.NetworkError.NoError:
@@ -267,10 +266,10 @@ class AuthenticationService:
                 )
                 self.__set_state(AuthenticationServiceState.Authenticated)
 
-        self.__network_access_manager.finished.connect(callback)
-        self.__network_access_manager.post(
+        self.__http_client.post(
             JsonService.generate_json_request(url),
             JsonService.dict_to_json(payload.model_dump()),
+            callback,
         )
 
     def get_token(self) -> Optional[str]:
@@ -0,0 +1,99 @@
+from pathlib import Path
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from services.logging import LoggingService, Logger
+from typing import List, Optional, Tuple, Type, TypeVar
+import json
+import sqlite3
+
+T = TypeVar("T", bound=BaseModel)
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, etag BLOB, content TEXT)",
+    "CREATE TABLE IF NOT EXISTS items (key TEXT PRIMARY KEY, content TEXT)",
+]
+
+
+class ReferenceCache:
+    __connection: sqlite3.Connection
+    __logger: Logger
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        logger: Logger = LoggingService().get_logger(__name__),
+    ):
+        self.__logger = logger
+        self.__connection = self.__connect(path)
+
+    def __connect(self, path: Optional[Path]) -> sqlite3.Connection:
+        # The cache only saves waiting on the network, so one that can't be
+        # opened is swapped for an in-memory one rather than stopping startup
+
+        if path:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(path)
+                for statement in SCHEMA:
+                    connection.execute(statement)
+                connection.commit()
+                self.__logger.info("Opened reference cache", path=str(path))
+                return connection
+            except (OSError, sqlite3.Error) as error:
+                self.__logger.error(
+                    "Falling back to in-memory reference cache",
+                    path=str(path),
+                    error=str(error),
+                )
+
+        connection = sqlite3.connect(":memory:")
+        for statement in SCHEMA:
+            connection.execute(statement)
+        return connection
+
+    def __fetch(self, query: str, parameters: Tuple) -> Optional[Tuple]:
+        try:
+            return self.__connection.execute(query, parameters).fetchone()
+        except sqlite3.Error as error:
+            self.__logger.error("Reference cache read failed", error=str(error))
+            return None
+
+    def __write(self, query: str, parameters: Tuple = ()):
+        try:
+            with self.__connection:
+                self.__connection.execute(query, parameters)
+        except sqlite3.Error as error:
+            self.__logger.error("Reference cache write failed", error=str(error))
+
+    def get_response(self, url: str) -> Optional[Tuple[bytes, str]]:
+        row = self.__fetch("SELECT etag, content FROM responses WHERE url = ?", (url,))
+        return (bytes(row[0]), row[1]) if row else None
+
+    def put_response(self, url: str, etag: bytes, content: str):
+        self.__write(
+            "INSERT OR REPLACE INTO responses (url, etag, content) VALUES (?, ?, ?)",
+            (url, etag, content),
+        )
+
+    def delete_response(self, url: str):
+        self.__write("DELETE FROM responses WHERE url = ?", (url,))
+
+    def get_items(self, key: str, model: Type[T]) -> Optional[List[T]]:
+        row = self.__fetch("SELECT content FROM items WHERE key = ?", (key,))
+        if not row:
+            return None
+
+        try:
+            return TypeAdapter(List[model]).validate_json(row[0])
+        except ValidationError as error:
+            self.__logger.warning("Discarding stale cache entry", key=key, error=error)
+            return None
+
+    def put_items(self, key: str, items: List[BaseModel]):
+        content = json.dumps([item.model_dump(mode="json") for item in items])
+        self.__write(
+            "INSERT OR REPLACE INTO items (key, content) VALUES (?, ?)", (key, content)
+        )
+
+    def clear(self):
+        self.__write("DELETE FROM responses")
+        self.__write("DELETE FROM items")
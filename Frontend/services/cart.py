@@ -0,0 +1,78 @@
+from models.dto.api import Pagination
+from models.dto.audio import Cart
+from PySide6.QtNetwork import QNetworkReply
+from pydantic import ValidationError
+from services.authentication import AuthenticationService
+from services.http import HttpClient
+from services.logging import LoggingService, Logger
+from services.pagination import page_url
+from services.settings import SettingsService
+from typing import Callable
+from urllib.parse import urljoin
+
+
+class CartService:
+    __authentication_service: AuthenticationService
+    __http_client: HttpClient
+    __logger: Logger
+    __settings_service: SettingsService
+
+    ENCODING = "utf-8"
+
+    def __init__(
+        self,
+        authetication_service: AuthenticationService = None,
+        http_client: HttpClient = None,
+        logger: Logger = LoggingService().get_logger(__name__),
+        settings_service: SettingsService = None,
+    ):
+        self.__authentication_service = authetication_service
+        self.__http_client = http_client or HttpClient()
+        self.__logger = logger
+        self.__settings_service = settings_service
+
+    def search(
+        self,
+        query: str,
+        page: int,
+        size: int,
+        success: Callable[[Pagination[Cart]], None],
+        failure: Callable[[str], None],
+    ):
+        # Without search terms the whole library is listed instead
+
+        base_url = str(self.__settings_service.get().base_url)
+        if query:
+            url = page_url(
+                urljoin(base_url, "/api/cart/search"), page, size, {"q": query}
+            )
+        else:
+            url = page_url(urljoin(base_url, "/api/cart/"), page, size)
+        self.__logger.info("GET Carts request", url=url)
+
+        def callback(reply: QNetworkReply):
+            content = str(reply.readAll().data(), encoding=self.ENCODING)
+
+            if reply.error() is not QNetworkReply.NoError:
+                self.__logger.error(
+                    "GET Carts request failed",
+                    url=url,
+                    error=reply.error(),
+                    response=content,
+                )
+                failure("Failed to retrieve carts from server")
+                return
+
+            try:
+                page_of_results = Pagination[Cart].model_validate_json(content)
+            except ValidationError as error:
+                self.__logger.error("Unreadable page of carts", url=url, error=error)
+                failure("Unexpected response from server")
+                return
+
+            self.__logger.info("GET Carts request successful", url=url)
+            success(page_of_results)
+
+        self.__http_client.get(
+            self.__authentication_service.get_authenticated_request(url), callback
+        )
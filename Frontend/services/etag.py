@@ -0,0 +1,70 @@
+from PySide6.QtNetwork import QNetworkReply, QNetworkRequest
+from services.cache import ReferenceCache
+from services.logging import LoggingService, Logger
+from typing import Dict, Optional, Tuple
+
+HTTP_NOT_MODIFIED = 304
+
+
+class ETagCache:
+    __entries: Dict[str, Tuple[bytes, str]]
+    __logger: Logger
+    __store: Optional[ReferenceCache]
+
+    def __init__(
+        self,
+        logger: Logger = LoggingService().get_logger(__name__),
+        store: Optional[ReferenceCache] = None,
+    ):
+        self.__entries = {}
+        self.__logger = logger
+        self.__store = store
+
+    def __load(self, url: str):
+        # Entries saved by an earlier session let the first request after
+        # startup revalidate instead of downloading everything again
+
+        if url not in self.__entries and self.__store:
+            entry = self.__store.get_response(url)
+            if entry:
+                self.__entries[url] = entry
+
+    def prepare(self, url: str, request: QNetworkRequest) -> QNetworkRequest:
+        self.__load(url)
+        if url in self.__entries:
+            etag, _ = self.__entries[url]
+            request.setRawHeader(b"If-None-Match", etag)
+        return request
+
+    def resolve(self, url: str, reply: QNetworkReply, content: str) -> Optional[str]:
+        status = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+        self.__load(url)
+
+        # The entry a 304 refers to can be cleared while the request is in
+        # flight, leaving nothing to reuse. None tells the caller to fetch
+        # again, which goes without If-None-Match as nothing is cached
+
+        if status == HTTP_NOT_MODIFIED:
+            if url not in self.__entries:
+                self.__logger.warning("Nothing cached to reuse", url=url)
+                return None
+            self.__logger.info("Reusing cached response", url=url)
+            _, cached_content = self.__entries[url]
+            return cached_content
+
+        etag = reply.rawHeader(b"ETag").data()
+        if etag:
+            self.__entries[url] = (etag, content)
+            if self.__store:
+                self.__store.put_response(url, etag, content)
+        else:
+            self.__entries.pop(url, None)
+            if self.__store:
+                self.__store.delete_response(url)
+
+        return content
+
+    def clear(self):
+        self.__entries.clear()
+        if self.__store:
+            self.__store.clear()
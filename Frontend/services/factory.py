@@ -1,8 +1,12 @@
 from services.api import ApiService
 from services.audio import AudioService
 from services.authentication import AuthenticationService
+from services.cache import ReferenceCache
+from services.cart import CartService
+from services.etag import ETagCache
 from services.file import AudioFileService
 from services.genre import GenreService
+from services.http import HttpClient
 from services.logging import LoggingService, Logger
 from services.settings import SettingsService
 from services.tag import TagService
@@ -12,7 +16,10 @@ from services.type import CartTypeService
 class ServiceFactory:
     __audio_service: AudioService = None
     __authentication_service: AuthenticationService = None
+    __etag_cache: ETagCache = None
+    __http_client: HttpClient = None
     __logger: Logger = None
+    __reference_cache: ReferenceCache = None
     instance = None
 
     def __new__(cls, logger: Logger = LoggingService().get_logger(__name__)):
@@ -22,7 +29,9 @@ class ServiceFactory:
         return cls.instance
 
     def apiService(self) -> ApiService:
-        return ApiService(settings_service=self.settingsService())
+        return ApiService(
+            http_client=self.httpClient(), settings_service=self.settingsService()
+        )
 
     def audioFileService(self) -> AudioFileService:
         return AudioFileService()
@@ -38,27 +47,66 @@ class ServiceFactory:
             self.__logger.info("Instantiating Authentication Service")
             self.__authentication_service = AuthenticationService(
                 api_service=self.apiService(),
+                http_client=self.httpClient(),
                 settings_service=self.settingsService(),
             )
         return self.__authentication_service
 
+    def cartService(self) -> CartService:
+        return CartService(
+            authetication_service=self.authenticationService(),
+            http_client=self.httpClient(),
+            settings_service=self.settingsService(),
+        )
+
     def cartTypeService(self) -> CartTypeService:
         return CartTypeService(
             authetication_service=self.authenticationService(),
+            etag_cache=self.etagCache(),
+            http_client=self.httpClient(),
+            reference_cache=self.referenceCache(),
             settings_service=self.settingsService(),
         )
 
+    def etagCache(self) -> ETagCache:
+        if not self.__etag_cache:
+            self.__logger.info("Instantiating ETag Cache")
+            self.__etag_cache = ETagCache(store=self.referenceCache())
+        return self.__etag_cache
+
     def genreService(self) -> GenreService:
         return GenreService(
             authetication_service=self.authenticationService(),
+            etag_cache=self.etagCache(),
+            http_client=self.httpClient(),
+            reference_cache=self.referenceCache(),
             settings_service=self.settingsService(),
         )
 
+    def httpClient(self) -> HttpClient:
+        if not self.__http_client:
+            self.__logger.info("Instantiating HTTP Client")
+            self.__http_client = HttpClient(
+                max_concurrent=self.settingsService().get().max_concurrent_requests
+            )
+        return self.__http_client
+
+    def referenceCache(self) -> ReferenceCache:
+        if not self.__reference_cache:
+            self.__logger.info("Instantiating Reference Cache")
+            self.__reference_cache = ReferenceCache(
+                path=self.settingsService().get_data_path() / "reference.sqlite3"
+            )
+        return self.__reference_cache
+
     def settingsService(self) -> SettingsService:
         return SettingsService()
 
     def tagService(self) -> TagService:
         return TagService(
             authetication_service=self.authenticationService(),
+            etag_cache=self.etagCache(),
+            http_client=self.httpClient(),
+            reference_cache=self.referenceCache(),
             settings_service=self.settingsService(),
         )
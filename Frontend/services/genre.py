@@ -1,9 +1,13 @@
 from models.dto.api import Pagination
 from models.dto.audio import Genre
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply
+from PySide6.QtNetwork import QNetworkReply
 from services.authentication import AuthenticationService
+from services.cache import ReferenceCache
+from services.etag import ETagCache
+from services.http import HttpClient
 from services.json import JsonService
 from services.logging import LoggingService, Logger
+from services.pagination import page_url, PagedFetch
 from services.settings import SettingsService
 from typing import Callable, List
 from urllib.parse import urljoin
@@ -11,35 +15,45 @@ from urllib.parse import urljoin
 
 class GenreService:
     __authentication_service: AuthenticationService
+    __etag_cache: ETagCache
+    __http_client: HttpClient
     __logger: Logger
+    __reference_cache: ReferenceCache
     __settings_service: SettingsService
-    __network_access_manager: QNetworkAccessManager
 
     ENCODING = "utf-8"
 
     def __init__(
         self,
         authetication_service: AuthenticationService = None,
+        etag_cache: ETagCache = None,
+        http_client: HttpClient = None,
         logger: Logger = LoggingService().get_logger(__name__),
+        reference_cache: ReferenceCache = None,
         settings_service: SettingsService = None,
     ):
         self.__authentication_service = authetication_service
+        self.__etag_cache = etag_cache or ETagCache()
+        self.__http_client = http_client or HttpClient()
         self.__logger = logger
-        self.__network_access_manager = QNetworkAccessManager()
+        self.__reference_cache = reference_cache or ReferenceCache()
         self.__settings_service = settings_service
 
     def __get_page(
         self,
-        url: str,
         page: int,
-        success: Callable[[List[Genre]], None],
-        failure: Callable[[List[Genre]], None],
-        genres_so_far: List[Genre],
+        size: int,
+        success: Callable[[str], None],
+        failure: Callable[[str], None],
     ):
+        url = page_url(
+            urljoin(str(self.__settings_service.get().base_url), "/api/genre"),
+            page,
+            size,
+        )
         self.__logger.info("GET Genres request", url=url)
 
         def callback(reply: QNetworkReply):
-            self.__network_access_manager.finished.disconnect(callback)
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
             if reply.error() is not QNetworkReply.NoError:
@@ -52,25 +66,37 @@ class GenreService:
                 failure("Failed to retrieve genres from server")
             else:
                 self.__logger.info("GET Genres request successful", url=url)
-                page_of_results = Pagination[Genre].model_validate_json(content)
-                genres_so_far.extend(page_of_results.items)
-                if page_of_results.pages > page_of_results.page:
-                    self.__get_page(
-                        page_of_results.next, page + 1, success, failure, genres_so_far
-                    )
+                resolved = self.__etag_cache.resolve(url, reply, content)
+                if resolved is None:
+                    self.__get_page(page, size, success, failure)
                 else:
-                    success(genres_so_far)
+                    success(resolved)
 
-        self.__network_access_manager.finished.connect(callback)
-        self.__network_access_manager.get(
-            self.__authentication_service.get_authenticated_request(url)
+        self.__http_client.get(
+            self.__etag_cache.prepare(
+                url, self.__authentication_service.get_authenticated_request(url)
+            ),
+            callback,
         )
 
     def get_all(
         self, success: Callable[[List[Genre]], None], failure: Callable[[str], None]
     ):
         url = urljoin(str(self.__settings_service.get().base_url), "/api/genre")
-        self.__get_page(url, 1, success, failure, [])
+
+        # The list from the last session is shown straight away while it's
+        # revalidated, and only handed over again if anything changed
+
+        cached = self.__reference_cache.get_items(url, Genre)
+        if cached is not None:
+            success(cached)
+
+        def revalidated(genres: List[Genre]):
+            self.__reference_cache.put_items(url, genres)
+            if genres != cached:
+                success(genres)
+
+        PagedFetch(Pagination[Genre], self.__get_page, revalidated, failure).start()
 
     def add(
         self,
@@ -83,7 +109,6 @@ class GenreService:
         self.__logger.info("POST Genre Request", body=body, url=url)
 
         def callback(reply: QNetworkReply):
-            self.__network_access_manager.finished.disconnect(callback)
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
             if reply.error() is not QNetworkReply.NoError:
@@ -99,10 +124,10 @@ class GenreService:
                 genre = Genre.model_validate_json(content)
                 success(genre)
 
-        self.__network_access_manager.finished.connect(callback)
-        self.__network_access_manager.post(
+        self.__http_client.post(
             self.__authentication_service.get_authenticated_request(url),
             JsonService.dict_to_json(body.model_dump(exclude_none=True)),
+            callback,
         )
 
     def delete(
@@ -114,7 +139,6 @@ class GenreService:
         self.__logger.info("DELETE Genre Request", url=url)
 
         def callback(reply: QNetworkReply):
-            self.__network_access_manager.finished.disconnect(callback)
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
             if reply.error() is not QNetworkReply.NoError:
@@ -129,7 +153,6 @@ class GenreService:
                 self.__logger.info("DELETE Genre request successful", url=url)
                 success()
 
-        self.__network_access_manager.finished.connect(callback)
-        self.__network_access_manager.deleteResource(
-            self.__authentication_service.get_authenticated_request(url)
+        self.__http_client.delete(
+            self.__authentication_service.get_authenticated_request(url), callback
         )
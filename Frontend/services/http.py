@@ -0,0 +1,83 @@
+from collections import deque
+from PySide6.QtCore import QByteArray
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+from services.logging import LoggingService, Logger
+from typing import Callable, Deque, Optional, Tuple
+
+# Enough to keep an HTTP/1.1 host's six connections busy with a little spare,
+# while stopping a burst of page fetches from swamping a slow link
+
+MAX_CONCURRENT_REQUESTS = 8
+TRANSFER_TIMEOUT_MS = 30000
+
+ReplyCallback = Callable[[QNetworkReply], None]
+
+
+class HttpClient:
+    __in_flight: int
+    __logger: Logger
+    __manager: QNetworkAccessManager
+    __max_concurrent: int
+    __queue: Deque[Tuple[Callable[[], QNetworkReply], ReplyCallback]]
+
+    def __init__(
+        self,
+        logger: Logger = LoggingService().get_logger(__name__),
+        manager: Optional[QNetworkAccessManager] = None,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+        transfer_timeout: int = TRANSFER_TIMEOUT_MS,
+    ):
+        self.__in_flight = 0
+        self.__logger = logger
+        self.__max_concurrent = max_concurrent
+        self.__queue = deque()
+
+        # One manager for the whole application shares its connection pool,
+        # so keep-alive connections and HTTP/2 sessions are reused
+
+        self.__manager = manager or QNetworkAccessManager()
+        self.__manager.setAutoDeleteReplies(True)
+        self.__manager.setTransferTimeout(transfer_timeout)
+
+    def get(self, request: QNetworkRequest, callback: ReplyCallback):
+        self.__send(lambda: self.__manager.get(request), request, callback)
+
+    def post(self, request: QNetworkRequest, body: QByteArray, callback: ReplyCallback):
+        self.__send(lambda: self.__manager.post(request, body), request, callback)
+
+    def put(self, request: QNetworkRequest, body: QByteArray, callback: ReplyCallback):
+        self.__send(lambda: self.__manager.put(request, body), request, callback)
+
+    def delete(self, request: QNetworkRequest, callback: ReplyCallback):
+        self.__send(lambda: self.__manager.deleteResource(request), request, callback)
+
+    def __send(
+        self,
+        send: Callable[[], QNetworkReply],
+        request: QNetworkRequest,
+        callback: ReplyCallback,
+    ):
+        request.setAttribute(QNetworkRequest.Attribute.Http2AllowedAttribute, True)
+
+        if self.__in_flight >= self.__max_concurrent:
+            self.__logger.debug("Queueing request", url=request.url().toString())
+            self.__queue.append((send, callback))
+        else:
+            self.__start(send, callback)
+
+    def __start(self, send: Callable[[], QNetworkReply], callback: ReplyCallback):
+        self.__in_flight += 1
+        reply = send()
+
+        # Each reply reports its own completion, so overlapping requests never
+        # see one another's responses
+
+        def finished():
+            self.__in_flight -= 1
+            try:
+                callback(reply)
+            finally:
+                while self.__queue and self.__in_flight < self.__max_concurrent:
+                    self.__start(*self.__queue.popleft())
+
+        reply.finished.connect(finished)
@@ -0,0 +1,107 @@
+from models.dto.api import Pagination
+from pydantic import ValidationError
+from services.logging import LoggingService, Logger
+from typing import Callable, Dict, Generic, List, Optional, Type, TypeVar
+from urllib.parse import urlencode
+
+T = TypeVar("T")
+
+# The API caps page sizes at 100, and a handful of requests in flight is
+# enough to hide the round trip without queueing behind Qt's per-host limit
+
+MAX_CONCURRENT_PAGES = 4
+PAGE_SIZE = 100
+
+PageRequest = Callable[[int, int, Callable[[str], None], Callable[[str], None]], None]
+
+
+def page_url(url: str, page: int, size: int, query: Optional[Dict] = None) -> str:
+    return f"{url}?{urlencode({**(query or {}), 'page': page, 'size': size})}"
+
+
+class PagedFetch(Generic[T]):
+    __done: bool
+    __failure: Callable[[str], None]
+    __in_flight: int
+    __logger: Logger
+    __max_concurrent: int
+    __model: Type[Pagination[T]]
+    __next_page: int
+    __page_count: int
+    __pages: Dict[int, List[T]]
+    __request_page: PageRequest
+    __size: int
+    __success: Callable[[List[T]], None]
+
+    def __init__(
+        self,
+        model: Type[Pagination[T]],
+        request_page: PageRequest,
+        success: Callable[[List[T]], None],
+        failure: Callable[[str], None],
+        logger: Logger = LoggingService().get_logger(__name__),
+        max_concurrent: int = MAX_CONCURRENT_PAGES,
+        size: int = PAGE_SIZE,
+    ):
+        self.__done = False
+        self.__failure = failure
+        self.__in_flight = 0
+        self.__logger = logger
+        self.__max_concurrent = max_concurrent
+        self.__model = model
+        self.__next_page = 2
+        self.__page_count = 1
+        self.__pages = {}
+        self.__request_page = request_page
+        self.__size = size
+        self.__success = success
+
+    def start(self):
+        self.__request(1)
+
+    def __request(self, page: int):
+        self.__in_flight += 1
+        self.__request_page(
+            page,
+            self.__size,
+            lambda content: self.__received(page, content),
+            self.__failed,
+        )
+
+    def __received(self, page: int, content: str):
+        self.__in_flight -= 1
+        if self.__done:
+            return
+
+        try:
+            page_of_results = self.__model.model_validate_json(content)
+        except ValidationError as error:
+            self.__logger.error("Unreadable page of results", page=page, error=error)
+            self.__failed("Unexpected response from server")
+            return
+
+        self.__pages[page] = page_of_results.items
+
+        # Only the first page decides how many follow, so the rest can all be
+        # asked for at once rather than one round trip after another
+
+        if page == 1:
+            self.__page_count = max(page_of_results.pages, 1)
+
+        while (
+            self.__in_flight < self.__max_concurrent
+            and self.__next_page <= self.__page_count
+        ):
+            self.__next_page += 1
+            self.__request(self.__next_page - 1)
+
+        if not self.__done and len(self.__pages) >= self.__page_count:
+            self.__done = True
+            self.__success(
+                [item for page in sorted(self.__pages) for item in self.__pages[page]]
+            )
+
+    def __failed(self, error: str):
+        if not self.__done:
+            self.__done = True
+            self.__failure(error)
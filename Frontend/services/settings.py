@@ -1,6 +1,7 @@
 from models.core.settings import Settings
+from pathlib import Path
 from pydantic import HttpUrl
-from PySide6.QtCore import QCoreApplication, QSettings
+from PySide6.QtCore import QCoreApplication, QSettings, QStandardPaths
 from services.logging import Logger, LoggingService
 
 
@@ -44,6 +45,13 @@ class SettingsService:
         self.__logger.debug("Extracted settings", settings=settings_dict)
         return Settings.model_validate(settings_dict)
 
+    def get_data_path(self) -> Path:
+        return Path(
+            QStandardPaths.writableLocation(
+                QStandardPaths.StandardLocation.AppDataLocation
+            )
+        )
+
     def save(self, settings: Settings):
         if not settings:
             self.__logger.error("Cannot save settings as no settings supplied!")
@@ -1,9 +1,13 @@
 from models.dto.api import Pagination
 from models.dto.audio import Tag
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply
+from PySide6.QtNetwork import QNetworkReply
 from services.authentication import AuthenticationService
+from services.cache import ReferenceCache
+from services.etag import ETagCache
+from services.http import HttpClient
 from services.json import JsonService
 from services.logging import LoggingService, Logger
+from services.pagination import page_url, PagedFetch
 from services.settings import SettingsService
 from typing import Callable, List
 from urllib.parse import urljoin
@@ -11,35 +15,45 @@ from urllib.parse import urljoin
 
 class TagService:
     __authentication_service: AuthenticationService
+    __etag_cache: ETagCache
+    __http_client: HttpClient
     __logger: Logger
+    __reference_cache: ReferenceCache
     __settings_service: SettingsService
-    __network_access_manager: QNetworkAccessManager
 
     ENCODING = "utf-8"
 
     def __init__(
         self,
         authetication_service: AuthenticationService = None,
+        etag_cache: ETagCache = None,
+        http_client: HttpClient = None,
         logger: Logger = LoggingService().get_logger(__name__),
+        reference_cache: ReferenceCache = None,
         settings_service: SettingsService = None,
     ):
         self.__authentication_service = authetication_service
+        self.__etag_cache = etag_cache or ETagCache()
+        self.__http_client = http_client or HttpClient()
         self.__logger = logger
-        self.__network_access_manager = QNetworkAccessManager()
+        self.__reference_cache = reference_cache or ReferenceCache()
         self.__settings_service = settings_service
 
     def __get_page(
         self,
-        url: str,
         page: int,
-        success: Callable[[List[Tag]], None],
-        failure: Callable[[List[str]], None],
-        tags_so_far: List[Tag],
+        size: int,
+        success: Callable[[str], None],
+        failure: Callable[[str], None],
     ):
+        url = page_url(
+            urljoin(str(self.__settings_service.get().base_url), "/api/tag"),
+            page,
+            size,
+        )
         self.__logger.info("GET Tags request", url=url)
 
         def callback(reply: QNetworkReply):
-            self.__network_access_manager.finished.disconnect(callback)
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
             if reply.error() is not QNetworkReply.NoError:
@@ -52,25 +66,37 @@ class TagService:
                 failure("Failed to retrieve tags from server")
             else:
                 self.__logger.info("GET Tags request successful", url=url)
-                page_of_results = Pagination[Tag].model_validate_json(content)
-                tags_so_far.extend(page_of_results.items)
-                if page_of_results.pages > page_of_results.page:
-                    self.__get_page(
-                        page_of_results.next, page + 1, success, failure, tags_so_far
-                    )
+                resolved = self.__etag_cache.resolve(url, reply, content)
+                if resolved is None:
+                    self.__get_page(page, size, success, failure)
                 else:
-                    success(tags_so_far)
+                    success(resolved)
 
-        self.__network_access_manager.finished.connect(callback)
-        self.__network_access_manager.get(
-            self.__authentication_service.get_authenticated_request(url)
+        self.__http_client.get(
+            self.__etag_cache.prepare(
+                url, self.__authentication_service.get_authenticated_request(url)
+            ),
+            callback,
         )
 
     def get_all(
         self, success: Callable[[List[Tag]], None], failure: Callable[[str], None]
     ):
         url = urljoin(str(self.__settings_service.get().base_url), "/api/tag")
-        self.__get_page(url, 1, success, failure, [])
+
+        # The list from the last session is shown straight away while it's
+        # revalidated, and only handed over again if anything changed
+
+        cached = self.__reference_cache.get_items(url, Tag)
+        if cached is not None:
+            success(cached)
+
+        def revalidated(tags: List[Tag]):
+            self.__reference_cache.put_items(url, tags)
+            if tags != cached:
+                success(tags)
+
+        PagedFetch(Pagination[Tag], self.__get_page, revalidated, failure).start()
 
     def add(
         self, tag: str, success: Callable[[Tag], None], failure: Callable[[str], None]
@@ -80,7 +106,6 @@ class TagService:
         self.__logger.info("POST Tag Request", body=body, url=url)
 
         def callback(reply: QNetworkReply):
-            self.__network_access_manager.finished.disconnect(callback)
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
             if reply.error() is not QNetworkReply.NoError:
@@ -96,10 +121,10 @@ class TagService:
                 tag = Tag.model_validate_json(content)
                 success(tag)
 
-        self.__network_access_manager.finished.connect(callback)
-        self.__network_access_manager.post(
+        self.__http_client.post(
             self.__authentication_service.get_authenticated_request(url),
             JsonService.dict_to_json(body.model_dump(exclude_none=True)),
+            callback,
         )
 
     def delete(
@@ -109,7 +134,6 @@ class TagService:
         self.__logger.info("DELETE Tag Request", url=url)
 
         def callback(reply: QNetworkReply):
-            self.__network_access_manager.finished.disconnect(callback)
             content = str(reply.readAll().data(), encoding=self.ENCODING)
 
             if reply.error() is not QNetworkReply.NoError:
@@ -124,7 +148,6 @@ class TagService:
                 self.__logger.info("DELETE Tag request successful", url=url)
                 success()
 
-        self.__network_access_manager.finished.connect(callback)
-        self.__network_access_manager.deleteResource(
-            self.__authentication_service.get_authenticated_request(url)
+        self.__http_client.delete(
+            self.__authentication_service.get_authenticated_request(url), callback
         )
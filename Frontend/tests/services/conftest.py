@@ -0,0 +1,19 @@
+from models.core.settings import Settings
+from PySide6.QtNetwork import QNetworkRequest
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def mock_settings_example():
+    settings_service = MagicMock()
+    settings_service.get.return_value = Settings(base_url="https://example.org")
+    return settings_service
+
+
+@pytest.fixture
+def mock_authentication():
+    authentication_service = MagicMock()
+    authentication_service.get_authenticated_request.side_effect = QNetworkRequest
+    return authentication_service
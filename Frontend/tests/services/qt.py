@@ -1,6 +1,6 @@
 from PySide6.QtCore import QByteArray
-from PySide6.QtNetwork import QNetworkReply
-from typing import List, Optional
+from PySide6.QtNetwork import QNetworkReply, QNetworkRequest
+from typing import Dict, List, Optional, Tuple
 
 
 class MockSignal:
@@ -18,18 +18,62 @@ class MockSignal:
 
 class MockQtHttpResponse:
     __error: Optional[QNetworkReply.NetworkError]
+    __headers: Dict[bytes, bytes]
     __response: QByteArray
+    __status: int
 
     def __init__(
         self,
         response: str,
         error: QNetworkReply.NetworkError = QNetworkReply.NetworkError.NoError,
+        status: int = 200,
+        headers: Optional[Dict[bytes, bytes]] = None,
     ):
         self.__error = error
+        self.__headers = headers or {}
         self.__response = QByteArray(response.encode())
+        self.__status = status
+
+    def attribute(self, attribute: QNetworkRequest.Attribute):
+        if attribute == QNetworkRequest.Attribute.HttpStatusCodeAttribute:
+            return self.__status
+
+    def rawHeader(self, header: bytes):
+        return QByteArray(self.__headers.get(header, b""))
 
     def readAll(self):
         return self.__response
 
     def error(self):
         return self.__error
+
+
+class MockHttpClient:
+    requests: List[Tuple[str, QNetworkRequest, Optional[QByteArray]]]
+    __responses: List[MockQtHttpResponse]
+
+    def __init__(self, responses: Optional[List[MockQtHttpResponse]] = None):
+        self.requests = []
+        self.__responses = responses or []
+
+    def get(self, request: QNetworkRequest, callback: callable):
+        self.__send("GET", request, None, callback)
+
+    def post(self, request: QNetworkRequest, body: QByteArray, callback: callable):
+        self.__send("POST", request, body, callback)
+
+    def put(self, request: QNetworkRequest, body: QByteArray, callback: callable):
+        self.__send("PUT", request, body, callback)
+
+    def delete(self, request: QNetworkRequest, callback: callable):
+        self.__send("DELETE", request, None, callback)
+
+    def __send(
+        self,
+        method: str,
+        request: QNetworkRequest,
+        body: Optional[QByteArray],
+        callback: callable,
+    ):
+        self.requests.append((method, request, body))
+        callback(self.__responses.pop(0))
@@ -9,7 +9,7 @@ from services.authentication import (
     SettingsService,
 )
 from tests.services.logging import mock_logger
-from tests.services.qt import MockSignal, MockQtHttpResponse, QNetworkReply
+from tests.services.qt import MockHttpClient, MockQtHttpResponse, QNetworkReply
 from unittest.mock import MagicMock
 
 import pytest
@@ -73,13 +73,6 @@ def test_authentication_short_circuit(
 )
 def test_happy_path(monkeypatch, starting_state, mock_settings_default):
     # Arrange
-    # Signals
-
-    mock_signal = MockSignal()
-    monkeypatch.setattr(
-        "services.authentication.QNetworkAccessManager.finished", mock_signal
-    )
-
     # API service
 
     mock_api = MagicMock()
@@ -96,26 +89,15 @@ def test_happy_path(monkeypatch, starting_state, mock_settings_default):
 
     # HTTP responses
 
-    http_responses = [
-        MockQtHttpResponse(
-            '{"device_code": "DEVICE123", "user_code": "USER54321", "verification_uri": "http://example.org/verify", "verification_uri_complete": "http://example.org/verify?device_code=DEVICE123", "expires_in": 500, "interval": 1}'
-        ),
-        MockQtHttpResponse(
-            '{"access_token": "TOKEN123", "refresh_token": "REFRESH123", "token_type": "Bearer", "expires_in": 500}'
-        ),
-    ]
-
-    def run_side_effects(*args, **kwargs):
-        mock_signal.connect_callbacks[-1](http_responses.pop(0))
-
-    mock_http_get = MagicMock(side_effect=run_side_effects)
-    mock_http_post = MagicMock(side_effect=run_side_effects)
-
-    monkeypatch.setattr(
-        "services.authentication.QNetworkAccessManager.get", mock_http_get
-    )
-    monkeypatch.setattr(
-        "services.authentication.QNetworkAccessManager.post", mock_http_post
+    http_client = MockHttpClient(
+        [
+            MockQtHttpResponse(
+                '{"device_code": "DEVICE123", "user_code": "USER54321", "verification_uri": "http://example.org/verify", "verification_uri_complete": "http://example.org/verify?device_code=DEVICE123", "expires_in": 500, "interval": 1}'
+            ),
+            MockQtHttpResponse(
+                '{"access_token": "TOKEN123", "refresh_token": "REFRESH123", "token_type": "Bearer", "expires_in": 500}'
+            ),
+        ]
     )
 
     # State changes
@@ -136,6 +118,7 @@ def test_happy_path(monkeypatch, starting_state, mock_settings_default):
     authentication_service = AuthenticationService(
         state=starting_state,
         api_service=ApiService(),
+        http_client=http_client,
         settings_service=mock_settings_default,
     )
     authentication_service.register_callback(state_change_callback)
@@ -155,8 +138,7 @@ def test_happy_path(monkeypatch, starting_state, mock_settings_default):
     # Assert
 
     assert state_history == expected_state_history
-    assert mock_http_post.call_count == 2
-    assert mock_http_get.call_count == 0
+    assert [method for method, _, _ in http_client.requests] == ["POST", "POST"]
     assert (
         authentication_service.get_state() == AuthenticationServiceState.Authenticated
     )
@@ -206,27 +188,14 @@ def test_token_valid(mock_settings_default):
 
 def test_refresh_token(monkeypatch, mock_settings_default):
     # Arrange
-    # Signals
-
-    mock_signal = MockSignal()
-    monkeypatch.setattr(
-        "services.authentication.QNetworkAccessManager.finished", mock_signal
-    )
-
     # HTTP responses
 
-    http_responses = [
-        MockQtHttpResponse(
-            '{"access_token": "ACCESS123", "id_token": "ID123", "scope": "openid profile offline_access", "expires_in": 500, "token_type": "Bearer"}'
-        )
-    ]
-
-    def run_side_effects(*args, **kwargs):
-        mock_signal.connect_callbacks[-1](http_responses.pop(0))
-
-    mock_http_post = MagicMock(side_effect=run_side_effects)
-    monkeypatch.setattr(
-        "services.authentication.QNetworkAccessManager.post", mock_http_post
+    http_client = MockHttpClient(
+        [
+            MockQtHttpResponse(
+                '{"access_token": "ACCESS123", "id_token": "ID123", "scope": "openid profile offline_access", "expires_in": 500, "token_type": "Bearer"}'
+            )
+        ]
     )
 
     # Token validation
@@ -241,7 +210,7 @@ def test_refresh_token(monkeypatch, mock_settings_default):
     # Service itself
 
     authentication_service = AuthenticationService(
-        settings_service=mock_settings_default
+        http_client=http_client, settings_service=mock_settings_default
     )
     authentication_service.set_api_settings(
         ApiSettings(
@@ -260,32 +229,16 @@ def test_refresh_token(monkeypatch, mock_settings_default):
     # Assert
 
     assert actual == expected
-    mock_http_post.assert_called_once()
+    assert [method for method, _, _ in http_client.requests] == ["POST"]
     mock_settings_default.save.assert_not_called()
 
 
 def test_refresh_token_failure(monkeypatch, mock_settings_with_refresh_token):
     # Arrange
-
-    # Signals
-
-    mock_signal = MockSignal()
-    monkeypatch.setattr(
-        "services.authentication.QNetworkAccessManager.finished", mock_signal
-    )
-
     # HTTP responses
 
-    http_responses = [
-        MockQtHttpResponse("ERROR", QNetworkReply.NetworkError.ContentAccessDenied)
-    ]
-
-    def run_side_effects(*args, **kwargs):
-        mock_signal.connect_callbacks[-1](http_responses.pop(0))
-
-    mock_http_post = MagicMock(side_effect=run_side_effects)
-    monkeypatch.setattr(
-        "services.authentication.QNetworkAccessManager.post", mock_http_post
+    http_client = MockHttpClient(
+        [MockQtHttpResponse("ERROR", QNetworkReply.NetworkError.ContentAccessDenied)]
     )
 
     # Authentication process
@@ -299,7 +252,7 @@ def test_refresh_token_failure(monkeypatch, mock_settings_with_refresh_token):
     # Service itself
 
     authentication_service = AuthenticationService(
-        settings_service=mock_settings_with_refresh_token
+        http_client=http_client, settings_service=mock_settings_with_refresh_token
     )
     authentication_service.set_api_settings(
         ApiSettings(
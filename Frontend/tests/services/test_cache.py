@@ -0,0 +1,142 @@
+from models.dto.audio import Genre
+from PySide6.QtNetwork import QNetworkRequest
+from services.cache import ReferenceCache
+from services.etag import ETagCache
+from services.genre import GenreService
+from tests.services.qt import MockHttpClient, MockQtHttpResponse
+from unittest.mock import MagicMock
+import json
+
+URL = "https://example.org/api/genre"
+
+
+def genre_page(names: list) -> str:
+    return json.dumps(
+        {
+            "items": [{"id": name, "genre": name} for name in names],
+            "page": 1,
+            "pages": 1,
+            "size": 100,
+            "total": len(names),
+        }
+    )
+
+
+def test_items_survive_reopening(tmp_path):
+    # Arrange
+
+    path = tmp_path / "reference.sqlite3"
+    ReferenceCache(path=path).put_items(URL, [Genre(id="1", genre="Rock")])
+
+    # Act
+
+    items = ReferenceCache(path=path).get_items(URL, Genre)
+
+    # Assert
+
+    assert items == [Genre(id="1", genre="Rock")]
+
+
+def test_missing_items():
+    # Act
+
+    items = ReferenceCache().get_items(URL, Genre)
+
+    # Assert
+
+    assert items is None
+
+
+def test_unopenable_path_falls_back_to_memory(tmp_path):
+    # Arrange
+
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    reference_cache = ReferenceCache(path=blocker / "reference.sqlite3")
+
+    # Act
+
+    reference_cache.put_items(URL, [Genre(id="1", genre="Rock")])
+
+    # Assert
+
+    assert reference_cache.get_items(URL, Genre) == [Genre(id="1", genre="Rock")]
+
+
+def test_etag_persisted_between_sessions(tmp_path):
+    # Arrange
+
+    path = tmp_path / "reference.sqlite3"
+    ETagCache(store=ReferenceCache(path=path)).resolve(
+        URL,
+        MockQtHttpResponse('{"items": []}', headers={b"ETag": b'"1-abc"'}),
+        '{"items": []}',
+    )
+    etag_cache = ETagCache(store=ReferenceCache(path=path))
+
+    # Act
+
+    request = etag_cache.prepare(URL, QNetworkRequest(URL))
+    content = etag_cache.resolve(URL, MockQtHttpResponse("", status=304), "")
+
+    # Assert
+
+    assert request.rawHeader("If-None-Match").data() == b'"1-abc"'
+    assert content == '{"items": []}'
+
+
+def test_cached_genres_shown_before_revalidation(
+    mock_authentication, mock_settings_example
+):
+    # Arrange
+
+    reference_cache = ReferenceCache()
+    reference_cache.put_items(URL, [Genre(id="Rock", genre="Rock")])
+    http_client = MockHttpClient([MockQtHttpResponse(genre_page(["Rock", "Jazz"]))])
+    mock_success = MagicMock()
+
+    # Act
+
+    genre_service = GenreService(
+        authetication_service=mock_authentication,
+        http_client=http_client,
+        reference_cache=reference_cache,
+        settings_service=mock_settings_example,
+    )
+    genre_service.get_all(mock_success, MagicMock())
+
+    # Assert
+
+    assert [call[0][0] for call in mock_success.call_args_list] == [
+        [Genre(id="Rock", genre="Rock")],
+        [Genre(id="Rock", genre="Rock"), Genre(id="Jazz", genre="Jazz")],
+    ]
+    assert reference_cache.get_items(URL, Genre) == [
+        Genre(id="Rock", genre="Rock"),
+        Genre(id="Jazz", genre="Jazz"),
+    ]
+
+
+def test_unchanged_genres_not_handed_over_twice(
+    mock_authentication, mock_settings_example
+):
+    # Arrange
+
+    reference_cache = ReferenceCache()
+    reference_cache.put_items(URL, [Genre(id="Rock", genre="Rock")])
+    http_client = MockHttpClient([MockQtHttpResponse(genre_page(["Rock"]))])
+    mock_success = MagicMock()
+
+    # Act
+
+    genre_service = GenreService(
+        authetication_service=mock_authentication,
+        http_client=http_client,
+        reference_cache=reference_cache,
+        settings_service=mock_settings_example,
+    )
+    genre_service.get_all(mock_success, MagicMock())
+
+    # Assert
+
+    mock_success.assert_called_once_with([Genre(id="Rock", genre="Rock")])
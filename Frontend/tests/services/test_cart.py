@@ -0,0 +1,119 @@
+from PySide6.QtCore import QUrl
+from PySide6.QtNetwork import QNetworkReply
+from services.cart import CartService
+from tests.services.qt import MockHttpClient, MockQtHttpResponse
+from unittest.mock import MagicMock
+import json
+
+import pytest
+
+CART = {
+    "id": "1",
+    "label": "L1",
+    "artist": "Artist",
+    "title": "Title",
+    "album": "",
+    "type": None,
+    "genre": {"id": "2", "genre": "Rock"},
+    "year": 1999,
+    "tags": [],
+    "sweeper": False,
+    "override_fade": False,
+    "valid_from": "2024-01-01T00:00:00",
+    "valid_to": "2099-12-31T00:00:00",
+    "isrc": "",
+    "record_label": "",
+    "score": 1.5,
+}
+
+
+@pytest.fixture
+def cart_service(mock_authentication, mock_settings_example):
+    def create(http_client: MockHttpClient) -> CartService:
+        return CartService(
+            authetication_service=mock_authentication,
+            http_client=http_client,
+            settings_service=mock_settings_example,
+        )
+
+    return create
+
+
+def test_search_page(cart_service):
+    # Arrange
+
+    http_client = MockHttpClient(
+        [
+            MockQtHttpResponse(
+                json.dumps(
+                    {
+                        "items": [CART],
+                        "page": 3,
+                        "pages": 40,
+                        "size": 100,
+                        "total": 3901,
+                    }
+                )
+            )
+        ]
+    )
+    mock_success = MagicMock()
+    mock_failure = MagicMock()
+
+    # Act
+
+    cart_service(http_client).search("rock & roll", 3, 100, mock_success, mock_failure)
+
+    # Assert
+
+    [(method, request, _)] = http_client.requests
+    assert method == "GET"
+    assert request.url() == QUrl(
+        "https://example.org/api/cart/search?q=rock+%26+roll&page=3&size=100"
+    )
+    page_of_results = mock_success.call_args[0][0]
+    assert page_of_results.total == 3901
+    assert page_of_results.items[0].genre.genre == "Rock"
+    mock_failure.assert_not_called()
+
+
+def test_empty_search_lists_library(cart_service):
+    # Arrange
+
+    http_client = MockHttpClient(
+        [
+            MockQtHttpResponse(
+                json.dumps(
+                    {"items": [], "page": 1, "pages": 0, "size": 100, "total": 0}
+                )
+            )
+        ]
+    )
+
+    # Act
+
+    cart_service(http_client).search("", 1, 100, MagicMock(), MagicMock())
+
+    # Assert
+
+    [(_, request, _)] = http_client.requests
+    assert request.url() == QUrl("https://example.org/api/cart/?page=1&size=100")
+
+
+def test_search_failure(cart_service):
+    # Arrange
+
+    http_client = MockHttpClient(
+        [MockQtHttpResponse("", QNetworkReply.NetworkError.ContentNotFoundError)]
+    )
+    mock_success = MagicMock()
+    mock_failure = MagicMock()
+
+    # Act
+
+    cart_service(http_client).search("rock", 1, 100, mock_success, mock_failure)
+
+    # Assert
+
+    mock_success.assert_not_called()
+    mock_failure.assert_called_once_with("Failed to retrieve carts from server")
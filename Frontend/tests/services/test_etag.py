@@ -0,0 +1,143 @@
+from models.dto.audio import Genre
+from PySide6.QtNetwork import QNetworkRequest
+from services.cache import ReferenceCache
+from services.etag import ETagCache
+from services.genre import GenreService
+from tests.services.qt import MockHttpClient, MockQtHttpResponse
+from unittest.mock import MagicMock
+import json
+
+URL = "https://example.org/api/genre"
+
+
+def test_etag_stored_and_sent():
+    # Arrange
+
+    etag_cache = ETagCache()
+    response = MockQtHttpResponse('{"items": []}', headers={b"ETag": b'"1-abc"'})
+
+    # Act
+
+    content = etag_cache.resolve(URL, response, '{"items": []}')
+    request = etag_cache.prepare(URL, QNetworkRequest(URL))
+
+    # Assert
+
+    assert content == '{"items": []}'
+    assert request.rawHeader("If-None-Match").data() == b'"1-abc"'
+
+
+def test_no_etag_not_sent():
+    # Arrange
+
+    etag_cache = ETagCache()
+
+    # Act
+
+    request = etag_cache.prepare(URL, QNetworkRequest(URL))
+
+    # Assert
+
+    assert not request.hasRawHeader("If-None-Match")
+
+
+def test_not_modified_reuses_cached_content():
+    # Arrange
+
+    etag_cache = ETagCache()
+    etag_cache.resolve(
+        URL,
+        MockQtHttpResponse('{"items": []}', headers={b"ETag": b'"1-abc"'}),
+        '{"items": []}',
+    )
+
+    # Act
+
+    content = etag_cache.resolve(URL, MockQtHttpResponse("", status=304), "")
+
+    # Assert
+
+    assert content == '{"items": []}'
+
+
+def test_response_without_etag_evicts_entry():
+    # Arrange
+
+    etag_cache = ETagCache()
+    etag_cache.resolve(
+        URL,
+        MockQtHttpResponse('{"items": []}', headers={b"ETag": b'"1-abc"'}),
+        '{"items": []}',
+    )
+
+    # Act
+
+    etag_cache.resolve(URL, MockQtHttpResponse('{"items": [1]}'), '{"items": [1]}')
+    request = etag_cache.prepare(URL, QNetworkRequest(URL))
+
+    # Assert
+
+    assert not request.hasRawHeader("If-None-Match")
+
+
+def test_not_modified_without_cached_content():
+    # Act
+
+    content = ETagCache().resolve(URL, MockQtHttpResponse("", status=304), "")
+
+    # Assert
+
+    assert content is None
+
+
+def test_not_modified_after_clear_fetched_again(
+    mock_authentication, mock_settings_example
+):
+    # Arrange
+
+    etag_cache = ETagCache()
+    page = json.dumps(
+        {
+            "items": [{"id": "1", "genre": "Rock"}],
+            "page": 1,
+            "pages": 1,
+            "size": 100,
+            "total": 1,
+        }
+    )
+    etag_cache.resolve(
+        f"{URL}?page=1&size=100",
+        MockQtHttpResponse(page, headers={b"ETag": b'"1-abc"'}),
+        page,
+    )
+
+    class ClearingHttpClient(MockHttpClient):
+        def get(self, request, callback):
+            # The cache is cleared, as on sign out, while the first request
+            # is in flight
+
+            if not self.requests:
+                etag_cache.clear()
+            super().get(request, callback)
+
+    http_client = ClearingHttpClient(
+        [MockQtHttpResponse("", status=304), MockQtHttpResponse(page)]
+    )
+    mock_success = MagicMock()
+
+    # Act
+
+    GenreService(
+        authetication_service=mock_authentication,
+        etag_cache=etag_cache,
+        http_client=http_client,
+        reference_cache=ReferenceCache(),
+        settings_service=mock_settings_example,
+    ).get_all(mock_success, MagicMock())
+
+    # Assert
+
+    [_, first, _], [_, second, _] = http_client.requests
+    assert first.hasRawHeader("If-None-Match")
+    assert not second.hasRawHeader("If-None-Match")
+    mock_success.assert_called_once_with([Genre(id="1", genre="Rock")])
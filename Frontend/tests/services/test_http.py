@@ -0,0 +1,125 @@
+from PySide6.QtNetwork import QNetworkRequest
+from services.http import HttpClient
+from tests.services.qt import MockSignal
+from unittest.mock import MagicMock
+
+URL = "https://example.org/api/genre"
+
+
+class MockReply:
+    finished: MockSignal
+
+    def __init__(self):
+        self.finished = MockSignal()
+
+    def finish(self):
+        for callback in self.finished.connect_callbacks:
+            callback()
+
+
+class MockNetworkAccessManager:
+    replies: list
+    requests: list
+
+    def __init__(self):
+        self.replies = []
+        self.requests = []
+
+    def __reply(self, method: str, request: QNetworkRequest):
+        reply = MockReply()
+        self.replies.append(reply)
+        self.requests.append((method, request))
+        return reply
+
+    def get(self, request: QNetworkRequest):
+        return self.__reply("GET", request)
+
+    def post(self, request: QNetworkRequest, body: bytes):
+        return self.__reply("POST", request)
+
+    def deleteResource(self, request: QNetworkRequest):
+        return self.__reply("DELETE", request)
+
+    def setAutoDeleteReplies(self, enabled: bool):
+        pass
+
+    def setTransferTimeout(self, timeout: int):
+        pass
+
+
+def test_reply_routed_to_its_own_callback():
+    # Arrange
+
+    manager = MockNetworkAccessManager()
+    http_client = HttpClient(manager=manager)
+    first_callback = MagicMock()
+    second_callback = MagicMock()
+
+    # Act
+
+    http_client.get(QNetworkRequest(URL), first_callback)
+    http_client.post(QNetworkRequest(URL), b"{}", second_callback)
+    manager.replies[1].finish()
+
+    # Assert
+
+    first_callback.assert_not_called()
+    second_callback.assert_called_once_with(manager.replies[1])
+
+
+def test_http2_allowed():
+    # Arrange
+
+    manager = MockNetworkAccessManager()
+    http_client = HttpClient(manager=manager)
+
+    # Act
+
+    http_client.delete(QNetworkRequest(URL), MagicMock())
+
+    # Assert
+
+    [(method, request)] = manager.requests
+    assert method == "DELETE"
+    assert request.attribute(QNetworkRequest.Attribute.Http2AllowedAttribute)
+
+
+def test_requests_over_limit_queued():
+    # Arrange
+
+    manager = MockNetworkAccessManager()
+    http_client = HttpClient(manager=manager, max_concurrent=2)
+    callbacks = [MagicMock() for _ in range(4)]
+
+    # Act
+
+    for callback in callbacks:
+        http_client.get(QNetworkRequest(URL), callback)
+    sent_before = len(manager.requests)
+    manager.replies[0].finish()
+
+    # Assert
+
+    assert sent_before == 2
+    assert len(manager.requests) == 3
+    callbacks[0].assert_called_once_with(manager.replies[0])
+
+
+def test_queue_drained_when_callback_fails():
+    # Arrange
+
+    manager = MockNetworkAccessManager()
+    http_client = HttpClient(manager=manager, max_concurrent=1)
+
+    # Act
+
+    http_client.get(QNetworkRequest(URL), MagicMock(side_effect=ValueError))
+    http_client.get(QNetworkRequest(URL), MagicMock())
+    try:
+        manager.replies[0].finish()
+    except ValueError:
+        pass
+
+    # Assert
+
+    assert len(manager.requests) == 2
@@ -0,0 +1,128 @@
+from models.dto.api import Pagination
+from models.dto.audio import Cart
+from tests.services.test_cart import CART
+from ui.viewmodels.library import CartTableModel, MAX_CACHED_PAGES
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class MockCartService:
+    def __init__(self):
+        self.searches = []
+
+    def search(self, query, page, size, success, failure):
+        self.searches.append((query, page, success, failure))
+
+    def reply(self, index, total, size):
+        _, page, success, _ = self.searches[index]
+        items = [
+            Cart(**{**CART, "id": str(row), "label": f"L{row}"})
+            for row in range((page - 1) * size, min(page * size, total))
+        ]
+        success(
+            Pagination[Cart](items=items, page=page, pages=0, size=size, total=total)
+        )
+
+
+@pytest.fixture
+def cart_service():
+    return MockCartService()
+
+
+def create_model(cart_service, page_size):
+    return CartTableModel(
+        cart_service=cart_service, log_service=MagicMock(), page_size=page_size
+    )
+
+
+def test_fetch_more_until_total(cart_service):
+    # Arrange
+
+    model = create_model(cart_service, 2)
+    before_reply = model.canFetchMore()
+
+    # Act
+
+    cart_service.reply(0, 5, 2)
+    rows = [model.rowCount()]
+    while model.canFetchMore():
+        model.fetchMore()
+        cart_service.reply(-1, 5, 2)
+        rows.append(model.rowCount())
+
+    # Assert
+
+    assert not before_reply
+    assert rows == [2, 4, 5]
+    assert [page for _, page, _, _ in cart_service.searches] == [1, 2, 3]
+    assert model.cart(4).label == "L4"
+
+
+def test_least_recently_viewed_page_evicted(cart_service):
+    # Arrange
+
+    model = create_model(cart_service, 1)
+    cart_service.reply(0, 100, 1)
+    for _ in range(MAX_CACHED_PAGES - 1):
+        model.fetchMore()
+        cart_service.reply(-1, 100, 1)
+
+    # Act
+
+    # Viewing page 1 makes page 2 the least recently used, so it's the one
+    # dropped when another page arrives
+
+    model.cart(0)
+    model.fetchMore()
+    cart_service.reply(-1, 100, 1)
+    first = model.cart(0)
+    second = model.cart(1)
+
+    # Assert
+
+    assert first.label == "L0"
+    assert second is None
+    assert cart_service.searches[-1][1] == 2
+    assert model.rowCount() == MAX_CACHED_PAGES + 1
+
+
+def test_stale_search_replies_dropped(cart_service):
+    # Arrange
+
+    model = create_model(cart_service, 2)
+    failures = []
+    model.searchFailed.connect(failures.append)
+    model.search("Rock")
+
+    # Act
+
+    cart_service.reply(0, 5, 2)
+    cart_service.searches[0][3]("Failed to retrieve carts from server")
+    stale_rows = model.rowCount()
+    cart_service.reply(1, 1, 2)
+
+    # Assert
+
+    assert stale_rows == 0
+    assert not failures
+    assert model.rowCount() == 1
+    assert model.total() == 1
+
+
+def test_search_failure_reported(cart_service):
+    # Arrange
+
+    model = create_model(cart_service, 2)
+    failures = []
+    model.searchFailed.connect(failures.append)
+
+    # Act
+
+    cart_service.searches[0][3]("Failed to retrieve carts from server")
+
+    # Assert
+
+    assert failures == ["Failed to retrieve carts from server"]
+    assert model.total() is None
+    assert not model.canFetchMore()
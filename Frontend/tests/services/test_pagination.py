@@ -0,0 +1,172 @@
+from models.dto.api import Pagination
+from models.dto.audio import Genre
+from services.pagination import page_url, PagedFetch
+from unittest.mock import MagicMock
+import json
+
+
+def page_content(page: int, pages: int, names: list) -> str:
+    return json.dumps(
+        {
+            "items": [{"id": name, "genre": name} for name in names],
+            "page": page,
+            "pages": pages,
+            "size": 2,
+            "total": pages * 2,
+        }
+    )
+
+
+class MockPageRequests:
+    calls: list
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, page, size, success, failure):
+        self.calls.append((page, size, success, failure))
+
+    def pages(self):
+        return [page for page, _, _, _ in self.calls]
+
+    def reply(self, page: int, content: str):
+        [success] = [call[2] for call in self.calls if call[0] == page]
+        success(content)
+
+    def fail(self, page: int, error: str):
+        [failure] = [call[3] for call in self.calls if call[0] == page]
+        failure(error)
+
+
+def test_page_url():
+    # Act
+
+    url = page_url("https://example.org/api/genre", 3, 100)
+
+    # Assert
+
+    assert url == "https://example.org/api/genre?page=3&size=100"
+
+
+def test_remaining_pages_requested_together():
+    # Arrange
+
+    requests = MockPageRequests()
+    mock_success = MagicMock()
+    mock_failure = MagicMock()
+    fetch = PagedFetch(
+        Pagination[Genre], requests, mock_success, mock_failure, max_concurrent=4
+    )
+
+    # Act
+
+    fetch.start()
+    requests.reply(1, page_content(1, 4, ["a", "b"]))
+
+    # Assert
+
+    assert requests.pages() == [1, 2, 3, 4]
+    mock_success.assert_not_called()
+
+
+def test_pages_assembled_in_order():
+    # Arrange
+
+    requests = MockPageRequests()
+    mock_success = MagicMock()
+    mock_failure = MagicMock()
+    fetch = PagedFetch(Pagination[Genre], requests, mock_success, mock_failure)
+
+    # Act
+
+    fetch.start()
+    requests.reply(1, page_content(1, 3, ["a", "b"]))
+    requests.reply(3, page_content(3, 3, ["e", "f"]))
+    requests.reply(2, page_content(2, 3, ["c", "d"]))
+
+    # Assert
+
+    mock_success.assert_called_once()
+    genres = mock_success.call_args[0][0]
+    assert [genre.genre for genre in genres] == ["a", "b", "c", "d", "e", "f"]
+    mock_failure.assert_not_called()
+
+
+def test_concurrency_capped():
+    # Arrange
+
+    requests = MockPageRequests()
+    mock_success = MagicMock()
+    fetch = PagedFetch(
+        Pagination[Genre], requests, mock_success, MagicMock(), max_concurrent=2
+    )
+
+    # Act
+
+    fetch.start()
+    requests.reply(1, page_content(1, 5, ["a", "b"]))
+    requested_before = requests.pages()
+    requests.reply(2, page_content(2, 5, ["c", "d"]))
+
+    # Assert
+
+    assert requested_before == [1, 2, 3]
+    assert requests.pages() == [1, 2, 3, 4]
+
+
+def test_single_page():
+    # Arrange
+
+    requests = MockPageRequests()
+    mock_success = MagicMock()
+    fetch = PagedFetch(Pagination[Genre], requests, mock_success, MagicMock())
+
+    # Act
+
+    fetch.start()
+    requests.reply(1, page_content(1, 0, []))
+
+    # Assert
+
+    assert requests.pages() == [1]
+    mock_success.assert_called_once_with([])
+
+
+def test_failure_reported_once():
+    # Arrange
+
+    requests = MockPageRequests()
+    mock_success = MagicMock()
+    mock_failure = MagicMock()
+    fetch = PagedFetch(Pagination[Genre], requests, mock_success, mock_failure)
+
+    # Act
+
+    fetch.start()
+    requests.reply(1, page_content(1, 3, ["a", "b"]))
+    requests.fail(2, "Failed to retrieve genres from server")
+    requests.fail(3, "Failed to retrieve genres from server")
+
+    # Assert
+
+    mock_failure.assert_called_once_with("Failed to retrieve genres from server")
+    mock_success.assert_not_called()
+
+
+def test_unreadable_page_fails():
+    # Arrange
+
+    requests = MockPageRequests()
+    mock_success = MagicMock()
+    mock_failure = MagicMock()
+    fetch = PagedFetch(Pagination[Genre], requests, mock_success, mock_failure)
+
+    # Act
+
+    fetch.start()
+    requests.reply(1, "not json")
+
+    # Assert
+
+    mock_failure.assert_called_once()
+    mock_success.assert_not_called()
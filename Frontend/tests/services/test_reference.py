@@ -0,0 +1,127 @@
+from models.dto.audio import Genre
+from PySide6.QtCore import Qt
+from ui.viewmodels.reference import ReferenceListModel
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class MockReferenceService:
+    def __init__(self, items):
+        self.items = items
+        self.added = []
+        self.deleted = []
+
+    def get_all(self, success, failure):
+        success(list(self.items))
+
+    def add(self, name, success, failure):
+        self.added.append((name, success, failure))
+
+    def delete(self, item, success, failure):
+        self.deleted.append((item, success, failure))
+
+
+@pytest.fixture
+def service():
+    return MockReferenceService(
+        [Genre(id="1", genre="Rock"), Genre(id="2", genre="Jazz")]
+    )
+
+
+@pytest.fixture
+def model(service):
+    return ReferenceListModel(
+        items=None,
+        logger=MagicMock(),
+        model=Genre,
+        name_field="genre",
+        service=service,
+    )
+
+
+def names(model):
+    return [
+        model.data(model.index(row), Qt.ItemDataRole.DisplayRole)
+        for row in range(model.rowCount(None))
+    ]
+
+
+def test_added_row_shown_before_created(model, service):
+    # Act
+
+    model.add("Pop")
+    shown = names(model)
+    [(_, created, _)] = service.added
+    created(Genre(id="3", genre="Pop"))
+    model.delete(2)
+
+    # Assert
+
+    # Deleting the row sends the server's copy rather than the pending one
+
+    assert shown == ["Rock", "Jazz", "Pop"]
+    assert [item.id for item, _, _ in service.deleted] == ["3"]
+
+
+def test_failed_add_rolled_back(model, service):
+    # Act
+
+    model.add("Pop")
+    [(_, _, failed)] = service.added
+    failed("Failed to add genre")
+
+    # Assert
+
+    assert names(model) == ["Rock", "Jazz"]
+
+
+def test_existing_name_not_added(model, service):
+    # Act
+
+    model.add("Rock")
+
+    # Assert
+
+    assert not service.added
+
+
+def test_failed_delete_rolled_back(model, service):
+    # Act
+
+    model.delete(0)
+    removed = names(model)
+    [(_, _, failed)] = service.deleted
+    failed("Failed to delete genre")
+
+    # Assert
+
+    assert removed == ["Jazz"]
+    assert names(model) == ["Rock", "Jazz"]
+
+
+def test_refresh_keeps_deleting_rows_out(model, service):
+    # Act
+
+    model.delete(0)
+    model.refresh()
+
+    # Assert
+
+    assert names(model) == ["Jazz"]
+
+
+def test_remove_rows_deletes_highest_first(model, service):
+    # Arrange
+
+    service.items.append(Genre(id="3", genre="Pop"))
+    model.refresh()
+
+    # Act
+
+    model.remove_rows([model.index(0), model.index(2), model.index(0)])
+
+    # Assert
+
+    assert [item.id for item, _, _ in service.deleted] == ["3", "1"]
+    assert names(model) == ["Jazz"]
@@ -0,0 +1,165 @@
+from collections import OrderedDict
+from models.dto.api import Pagination
+from models.dto.audio import Cart
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+from services.factory import CartService, ServiceFactory
+from services.logging import Logger, LoggingService
+from services.pagination import PAGE_SIZE
+from typing import Callable, Dict, List, Optional, Set
+
+# Only the most recently viewed pages are kept; anything scrolled out of them
+# is fetched again if it comes back into view
+
+MAX_CACHED_PAGES = 20
+
+COLUMNS: Dict[str, Callable[[Cart], str]] = {
+    "Label": lambda cart: cart.label,
+    "Artist": lambda cart: cart.artist,
+    "Title": lambda cart: cart.title,
+    "Album": lambda cart: cart.album,
+    "Year": lambda cart: str(cart.year) if cart.year else "",
+    "Genre": lambda cart: cart.genre.genre if cart.genre else "",
+    "Type": lambda cart: cart.type.cart_type if cart.type else "",
+}
+
+
+class CartTableModel(QAbstractTableModel):
+    __cart_service: CartService
+    __generation: int
+    __logger: Logger
+    __page_size: int
+    __pages: OrderedDict[int, List[Cart]]
+    __pending: Set[int]
+    __query: str
+    __rows: int
+    __total: Optional[int]
+
+    searchFailed = Signal(str)
+    totalChanged = Signal(int)
+
+    def __init__(
+        self,
+        *args,
+        cart_service: CartService = ServiceFactory().cartService(),
+        log_service: LoggingService = LoggingService(),
+        page_size: int = PAGE_SIZE,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.__cart_service = cart_service
+        self.__generation = 0
+        self.__logger = log_service.get_logger(__name__)
+        self.__page_size = page_size
+        self.__pages = OrderedDict()
+        self.__pending = set()
+        self.__query = ""
+        self.__rows = 0
+        self.__total = None
+        self.search("")
+
+    def search(self, query: str):
+        # Replies still on their way for an earlier search carry its
+        # generation and are dropped when they arrive
+
+        self.beginResetModel()
+        self.__generation += 1
+        self.__pages.clear()
+        self.__pending.clear()
+        self.__query = query
+        self.__rows = 0
+        self.__total = None
+        self.endResetModel()
+
+        self.__request_page(1)
+
+    def total(self) -> Optional[int]:
+        return self.__total
+
+    def rowCount(self, index=QModelIndex()):
+        return 0 if index.isValid() else self.__rows
+
+    def columnCount(self, index=QModelIndex()):
+        return 0 if index.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return list(COLUMNS)[section]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        cart = self.cart(index.row())
+        if not cart:
+            return None
+        return list(COLUMNS.values())[index.column()](cart)
+
+    def cart(self, row: int) -> Optional[Cart]:
+        page, offset = divmod(row, self.__page_size)
+        carts = self.__pages.get(page + 1)
+        if carts is None:
+            self.__request_page(page + 1)
+            return None
+
+        self.__pages.move_to_end(page + 1)
+        return carts[offset] if offset < len(carts) else None
+
+    def canFetchMore(self, index=QModelIndex()):
+        if index.isValid() or self.__total is None:
+            return False
+        return self.__rows < self.__total
+
+    def fetchMore(self, index=QModelIndex()):
+        if self.canFetchMore(index):
+            self.__request_page(self.__rows // self.__page_size + 1)
+
+    def __request_page(self, page: int):
+        if page in self.__pending:
+            return
+
+        self.__pending.add(page)
+        generation = self.__generation
+
+        def success(page_of_results: Pagination[Cart]):
+            if generation == self.__generation:
+                self.__page_loaded(page, page_of_results)
+
+        def failure(error: str):
+            if generation == self.__generation:
+                self.__pending.discard(page)
+                self.__logger.error(f"Failed reported back to library model: {error}")
+                self.searchFailed.emit(error)
+
+        self.__cart_service.search(
+            self.__query, page, self.__page_size, success, failure
+        )
+
+    def __page_loaded(self, page: int, page_of_results: Pagination[Cart]):
+        self.__pending.discard(page)
+        self.__pages[page] = page_of_results.items
+        self.__pages.move_to_end(page)
+        while len(self.__pages) > MAX_CACHED_PAGES:
+            self.__pages.popitem(last=False)
+
+        if page_of_results.total != self.__total:
+            self.__total = page_of_results.total
+            self.totalChanged.emit(self.__total)
+
+        # A page past the rows shown so far extends the table, while one that
+        # was evicted and fetched again only needs repainting. Each page covers
+        # a full page of rows even if carts were removed meanwhile, so later
+        # pages still line up
+
+        first = (page - 1) * self.__page_size
+        last = min(first + self.__page_size, self.__total) - 1
+        if last >= self.__rows:
+            self.beginInsertRows(QModelIndex(), self.__rows, last)
+            self.__rows = last + 1
+            self.endInsertRows()
+        elif last >= first:
+            self.dataChanged.emit(
+                self.index(first, 0), self.index(last, len(COLUMNS) - 1)
+            )
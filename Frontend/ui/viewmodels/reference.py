@@ -0,0 +1,143 @@
+from pydantic import BaseModel
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from services.genre import GenreService
+from services.logging import Logger
+from services.tag import TagService
+from services.type import CartTypeService
+from typing import Iterable, List, Optional, Set, Type, Union
+
+ReferenceService = Union[CartTypeService, GenreService, TagService]
+
+
+class ReferenceListModel(QAbstractListModel):
+    __deleting: Set[str]
+    __items: List[BaseModel]
+    __logger: Logger
+    __model: Type[BaseModel]
+    __name_field: str
+    __names: Set[str]
+    __service: ReferenceService
+
+    def __init__(
+        self,
+        *args,
+        items: Optional[List[BaseModel]],
+        logger: Logger,
+        model: Type[BaseModel],
+        name_field: str,
+        service: ReferenceService,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.__logger = logger
+        self.__model = model
+        self.__name_field = name_field
+        self.__service = service
+        self.__deleting = set()
+        self.__items = items or []
+        self.__names = {self.__name_of(item) for item in self.__items}
+        self.refresh()
+
+    def refresh(self):
+        self.__service.get_all(self.__update_items, self.__handle_failure)
+
+    def __name_of(self, item: BaseModel) -> str:
+        return getattr(item, self.__name_field)
+
+    def __update_items(self, items: List[BaseModel]):
+        # A refresh can land while a delete is still in flight, so rows being
+        # deleted are kept out rather than brought back by the reset
+
+        self.beginResetModel()
+        self.__items = [item for item in items if item.id not in self.__deleting]
+        self.__names = {self.__name_of(item) for item in self.__items}
+        self.endResetModel()
+
+    def __handle_failure(self, error: str):
+        description = self.__name_field.replace("_", " ")
+        self.__logger.error(f"Failed reported back to {description} viewmodel: {error}")
+
+    def data(self, index, role):
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.__name_of(self.__items[index.row()])
+
+    def rowCount(self, index):
+        return len(self.__items)
+
+    def __row_of(self, item: BaseModel) -> int:
+        # Rows are matched by identity as a refresh may have replaced or
+        # moved them while a request was in flight
+
+        for row, existing_item in enumerate(self.__items):
+            if existing_item is item:
+                return row
+        return -1
+
+    def __insert(self, row: int, item: BaseModel):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.__items.insert(row, item)
+        self.__names.add(self.__name_of(item))
+        self.endInsertRows()
+
+    def __remove(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        item = self.__items.pop(row)
+        self.__names.discard(self.__name_of(item))
+        self.endRemoveRows()
+
+    def add(self, name: str):
+        if not name or name in self.__names:
+            return
+
+        # The row appears straight away and is swapped for the server's copy
+        # once created, or taken out again if the request fails. A refresh in
+        # the meantime resets the rows, so the created item is added back if
+        # it went missing
+
+        pending = self.__model(id=None, **{self.__name_field: name})
+        self.__insert(len(self.__items), pending)
+
+        def created(created_item: BaseModel):
+            row = self.__row_of(pending)
+            if row >= 0:
+                self.__items[row] = created_item
+                self.dataChanged.emit(self.index(row), self.index(row))
+            elif self.__name_of(created_item) not in self.__names:
+                self.__insert(len(self.__items), created_item)
+
+        def failed(error: str):
+            row = self.__row_of(pending)
+            if row >= 0:
+                self.__remove(row)
+            self.__handle_failure(error)
+
+        self.__service.add(name, created, failed)
+
+    def delete(self, index: int):
+        if index < 0 or index >= len(self.__items):
+            return
+
+        item = self.__items[index]
+        if not item.id:
+            return
+
+        self.__deleting.add(item.id)
+        self.__remove(index)
+
+        def deleted():
+            self.__deleting.discard(item.id)
+
+        def failed(error: str):
+            self.__deleting.discard(item.id)
+            if self.__name_of(item) not in self.__names:
+                self.__insert(min(index, len(self.__items)), item)
+            self.__handle_failure(error)
+
+        self.__service.delete(item, deleted, failed)
+
+    def remove_rows(self, indexes: Iterable[QModelIndex]):
+        # Rows are removed as soon as they're deleted, so the highest go first
+        # to keep the remaining row numbers valid
+
+        for row in sorted({index.row() for index in indexes}, reverse=True):
+            self.delete(row)
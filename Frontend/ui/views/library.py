@@ -1,24 +1,41 @@
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
     QLineEdit,
     QPushButton,
+    QTableView,
     QWidget,
     QVBoxLayout,
 )
+from ui.viewmodels.library import CartTableModel
 from ui.views.cart_editor import CartEditor
 
+# Searching waits for a pause in typing rather than firing on every key
+
+SEARCH_DELAY_MS = 300
+
 
 class Library(QWidget):
+    __cart_model: CartTableModel
     __clear_button: QPushButton
     __new_cart_button: QPushButton
+    __results: QTableView
     __search_box: QLineEdit
+    __search_timer: QTimer
     __result_count: QLabel
     __search_label: QLabel
 
     def __init__(self):
         super().__init__()
 
+        self.__search_timer = QTimer(self)
+        self.__search_timer.setSingleShot(True)
+        self.__search_timer.setInterval(SEARCH_DELAY_MS)
+        self.__search_timer.timeout.connect(self.__search)
+
         layout = QVBoxLayout()
         layout.addLayout(self.__generate_search_bar())
         layout.addLayout(self.__generate_results())
@@ -33,27 +50,45 @@ class Library(QWidget):
         search_layout.addWidget(self.__search_label)
 
         self.__search_box = QLineEdit()
+        self.__search_box.textChanged.connect(lambda _: self.__search_timer.start())
+        self.__search_box.returnPressed.connect(self.__search)
         search_layout.addWidget(self.__search_box)
 
         self.__clear_button = QPushButton("Clear")
+        self.__clear_button.clicked.connect(self.__search_box.clear)
         search_layout.addWidget(self.__clear_button)
 
         search_layout.setStretch(1, 1)
 
         return search_layout
 
-    @staticmethod
-    def __generate_results():
+    def __generate_results(self):
         results_layout = QHBoxLayout()
 
-        results_layout.addWidget(QLabel("Results"))
+        self.__cart_model = CartTableModel()
+        self.__cart_model.searchFailed.connect(self.__show_search_failure)
+        self.__cart_model.totalChanged.connect(self.__update_result_count)
+
+        # Fixed row heights let the view skip measuring rows it never shows
+
+        self.__results = QTableView()
+        self.__results.setModel(self.__cart_model)
+        self.__results.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        self.__results.verticalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Fixed
+        )
+        self.__results.verticalHeader().hide()
+        self.__results.horizontalHeader().setStretchLastSection(True)
+        results_layout.addWidget(self.__results)
 
         return results_layout
 
     def __generate_footer(self):
         footer_layout = QHBoxLayout()
 
-        self.__result_count = QLabel("XXX cart(s) found")
+        self.__result_count = QLabel("Searching...")
         footer_layout.addWidget(self.__result_count)
 
         self.__new_cart_button = QPushButton("Add Cart")
@@ -64,6 +99,17 @@ class Library(QWidget):
 
         return footer_layout
 
+    def __search(self):
+        self.__search_timer.stop()
+        self.__result_count.setText("Searching...")
+        self.__cart_model.search(self.__search_box.text().strip())
+
+    def __update_result_count(self, total: int):
+        self.__result_count.setText(f"{total} cart(s) found")
+
+    def __show_search_failure(self, error: str):
+        self.__result_count.setText(error)
+
     @staticmethod
     def __show_new_cart_dialog():
         dialog = CartEditor()
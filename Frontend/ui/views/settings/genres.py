@@ -71,6 +71,4 @@ class GenreSettings(QWidget):
         self.__add_text.clear()
 
     def __delete_button_pressed(self):
-        indexes = self.__genre_list.selectedIndexes()
-        for index in indexes:
-            self.__genre_model.deleteGenre(index.row())
+        self.__genre_model.remove_rows(self.__genre_list.selectedIndexes())
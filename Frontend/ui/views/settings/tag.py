@@ -71,6 +71,4 @@ class TagSettings(QWidget):
         self.__add_text.clear()
 
     def __delete_button_pressed(self):
-        indexes = self.__tag_list.selectedIndexes()
-        for index in indexes:
-            self.__tag_model.deleteTag(index.row())
+        self.__tag_model.remove_rows(self.__tag_list.selectedIndexes())
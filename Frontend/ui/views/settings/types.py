@@ -71,6 +71,4 @@ class CartTypeSettings(QWidget):
         self.__add_text.clear()
 
     def __delete_button_pressed(self):
-        indexes = self.__cart_type_list.selectedIndexes()
-        for index in indexes:
-            self.__cart_type_model.deleteCartType(index.row())
+        self.__cart_type_model.remove_rows(self.__cart_type_list.selectedIndexes())